@@ -0,0 +1,183 @@
+# album_model.py
+# Albüm verisinin tek seferde normalleştirildiği kompakt veri modeli.
+# Spotify API yanıtı ve rip.json biçimleri burada bir kez ayrıştırılır; parça adlarının
+# görüntülenen hali (öne çıkan sanatçılar çıkarılmış) ve biçimlendirilmiş süreler de bir kez
+# hesaplanır. create_album_poster boyut aramasında ve çizimde bu hazır değerleri kullanır.
+
+import re
+import hashlib
+
+# Albüm verisi normalleştirilirken kullanılan varsayılan metinler.
+# Anahtarlar .lang dosyalarıyla aynıdır; GUI kendi dil metinlerini geçebilir.
+DEFAULT_ALBUM_TEXTS = {
+    "album_data_unknown_album": "Bilinmeyen Albüm",
+    "album_data_unknown_artist": "Bilinmeyen Sanatçı",
+    "album_data_no_copyright": "Telif Hakkı Bilgisi Yok",
+}
+
+UNKNOWN_TRACK_NAME = 'Unknown Track Name'
+
+_FEATURED_PATTERN = re.compile(r'\s*\(.*?\)\s*')
+
+def remove_featured(track_name):
+    """Parantez içindeki öne çıkan sanatçı bilgilerini parça adından kaldırır."""
+    if not isinstance(track_name, str):
+        return track_name
+    return _FEATURED_PATTERN.sub('', track_name).strip()
+
+def format_time(duration_ms):
+    """Parça süresini milisaniyeden M:SS dizesine biçimlendirir."""
+    if duration_ms is None:
+        return "N/A"
+    try:
+        duration_ms = int(duration_ms)
+        seconds = (duration_ms // 1000) % 60
+        minutes = (duration_ms // (1000 * 60)) % 60
+        return f"{minutes}:{seconds:02d}"
+    except (ValueError, TypeError):
+        return "N/A"
+
+class Track:
+    """Posterde gösterilecek tek bir parça; görüntülenen ad ve süre metni oluşturulurken hesaplanır."""
+
+    __slots__ = ("name", "duration_ms", "display_name", "duration_text")
+
+    def __init__(self, name, duration_ms=None):
+        if not isinstance(name, str):
+            name = UNKNOWN_TRACK_NAME if name is None else str(name)
+        self.name = name
+        self.duration_ms = duration_ms
+        self.display_name = remove_featured(name)
+        self.duration_text = format_time(duration_ms)
+
+    @classmethod
+    def from_item(cls, track_info):
+        """Spotify 'tracks.items' öğesinden (rip.json'daki {'track': {...}} sarmalı dahil) Track oluşturur."""
+        if isinstance(track_info, Track):
+            return track_info
+        if 'track' in track_info and isinstance(track_info['track'], dict): # For 'rip.json' structure
+            track_info = track_info['track']
+        return cls(track_info.get('name', UNKNOWN_TRACK_NAME), track_info.get('duration_ms'))
+
+    def __repr__(self):
+        return f"Track({self.name!r}, {self.duration_ms!r})"
+
+class Album:
+    """
+    Posterde gösterilecek albüm.
+
+    Attributes:
+        name (str): Albüm adı.
+        artist (str): Virgülle ayrılmış sanatçı adları.
+        copyright (str or None): Tek satırlık telif hakkı metni; bilgi yoksa None.
+        tracks (tuple): Track nesneleri.
+        artwork_url (str or None): En büyük kapak resminin URL'si.
+    """
+
+    __slots__ = ("name", "artist", "copyright", "tracks", "artwork_url")
+
+    def __init__(self, name, artist, copyright=None, tracks=(), artwork_url=None):
+        self.name = name
+        self.artist = artist
+        self.copyright = copyright
+        self.tracks = tuple(tracks)
+        self.artwork_url = artwork_url
+
+    def __repr__(self):
+        return f"Album({self.name!r}, {self.artist!r}, {len(self.tracks)} tracks)"
+
+    def __bool__(self):
+        return True
+
+    def layout_key(self):
+        """Yerleşimi etkileyen tüm alanları içeren, önbellek anahtarı olarak kullanılabilecek demeti döndürür."""
+        return (self.name, self.artist, self.copyright,
+                tuple((track.display_name, track.duration_text) for track in self.tracks))
+
+    def fingerprint(self):
+        """layout_key'in kısa ve kararlı özetini (hex) döndürür; süreçler ve oturumlar arasında aynıdır."""
+        return hashlib.blake2b(repr(self.layout_key()).encode('utf-8'), digest_size=16).hexdigest()
+
+    def as_dict(self):
+        """Albümü from_processed'in okuyabileceği, JSON'a yazılabilir normalleştirilmiş sözlük olarak döndürür."""
+        return {
+            "name": self.name,
+            "artist": self.artist,
+            "copyright": self.copyright,
+            "tracks": [{"name": track.name, "duration_ms": track.duration_ms} for track in self.tracks],
+            "artwork_url": self.artwork_url,
+        }
+
+    @classmethod
+    def from_processed(cls, album_data):
+        """Eski biçimdeki işlenmiş sözlükten ('name', 'artist', 'copyright', 'tracks') Album oluşturur."""
+        copyright_text = album_data.get("copyright")
+        if copyright_text == DEFAULT_ALBUM_TEXTS["album_data_no_copyright"]:
+            copyright_text = None
+        return cls(
+            album_data.get("name", DEFAULT_ALBUM_TEXTS["album_data_unknown_album"]),
+            album_data.get("artist", DEFAULT_ALBUM_TEXTS["album_data_unknown_artist"]),
+            copyright_text,
+            [Track.from_item(track_info) for track_info in album_data.get("tracks", [])],
+            album_data.get("artwork_url"),
+        )
+
+    @classmethod
+    def from_raw(cls, album_data_raw, texts=None, track_items=None):
+        """
+        Spotify API yanıtı veya rip.json biçimindeki ham veriden Album oluşturur.
+
+        Args:
+            album_data_raw (dict): json.load veya sp.album ile elde edilen ham veri.
+            texts (dict or None): Varsayılan metinler (DEFAULT_ALBUM_TEXTS ile aynı anahtarlar).
+            track_items (iterable or None): Parça öğeleri ayrı olarak (ör. akış halinde) okunduysa bu öğeler;
+                verilmezse album_data_raw['tracks']['items'] kullanılır.
+
+        Returns:
+            Album or None: Biçim tanınmazsa None.
+        """
+        texts = dict(DEFAULT_ALBUM_TEXTS, **(texts or {}))
+        if not isinstance(album_data_raw, dict):
+            return None
+
+        tracks = album_data_raw.get('tracks')
+        items = track_items if track_items is not None else (tracks.get('items') if isinstance(tracks, dict) else None)
+        items = list(items) if items is not None else None
+
+        if items and isinstance(items[0], dict) and 'track' in items[0]:
+            # Rip.json formatı gibi görünüyor
+            name = album_data_raw.get("name", texts["album_data_unknown_album"] + " (Rip JSON)")
+            artist = texts["album_data_unknown_artist"]
+            if album_data_raw.get('owner') and album_data_raw['owner'].get('display_name'):
+                artist = album_data_raw['owner']['display_name']
+            elif isinstance(items[0].get('track'), dict) and items[0]['track'].get('artists'):
+                first_track_artists = [a['name'] for a in items[0]['track']['artists'] if isinstance(a, dict) and 'name' in a]
+                if first_track_artists:
+                    artist = ", ".join(first_track_artists)
+            return cls(name, artist, None, [Track.from_item(item) for item in items])
+
+        if 'name' in album_data_raw and 'artists' in album_data_raw and 'tracks' in album_data_raw:
+            # Spotify API yanıt formatı gibi görünüyor
+            name = album_data_raw.get("name", texts["album_data_unknown_album"] + " (Spotify JSON)")
+            artist_names = [a['name'] for a in (album_data_raw.get('artists') or []) if isinstance(a, dict) and 'name' in a]
+            artist = ", ".join(artist_names) if artist_names else texts["album_data_unknown_artist"]
+            artwork_url = None
+            if album_data_raw.get('images'):
+                artwork_url = album_data_raw['images'][0].get('url')
+            return cls(name, artist, format_copyrights(album_data_raw.get('copyrights')),
+                       [Track.from_item(item) for item in (items or [])], artwork_url)
+
+        return None
+
+def format_copyrights(copyrights):
+    """Spotify 'copyrights' listesini posterde gösterilecek tek satırlık metne çevirir (bilgi yoksa None)."""
+    copyright_texts = [cp['text'] for cp in (copyrights or []) if isinstance(cp, dict) and 'text' in cp]
+    if not copyright_texts:
+        return None
+    return " | ".join(copyright_texts).replace("℗", "(P)").replace("©", "(C)")
+
+def as_album(album_data):
+    """Album nesnesini olduğu gibi, eski biçimdeki sözlüğü ise Album'e çevirerek döndürür."""
+    if album_data is None or isinstance(album_data, Album):
+        return album_data
+    return Album.from_processed(album_data)
@@ -0,0 +1,317 @@
+# artwork_cache.py
+# Albüm kapaklarını diskte içerik özetine (SHA-256) göre saklayan önbellek.
+# Aynı URL tekrar istendiğinde kapak diskten okunur; tazelik süresi dolmuşsa sunucuya
+# ETag / If-Modified-Since ile koşullu istek gönderilir ve 304 yanıtında indirme yapılmaz.
+# Bağlantılar tek bir requests.Session üzerinden havuzlanır; önbellek boyutu sınırlıdır
+# ve en uzun süredir kullanılmayan kapaklar (LRU) silinir.
+#
+# render_cache ile aynı düzen kullanılır: paylaşılan bir indeks yoktur. Her URL'nin doğrulama bilgisi
+# (özet, ETag, Last-Modified) ayrı bir küçük JSON dosyasıdır ve kapaklar içerik özetine göre ayrı dosyalardır.
+# Yazımlar geçici dosya + os.replace ile atomiktir, son kullanım zamanı dosyaların mtime'ıdır ve boyut sınırı
+# klasör taranarak uygulanır; böylece GUI, toplu işlem ve render servisi süreçleri aynı klasörü paylaşabilir.
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+import render_report
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan önbellek klasörü (POSTER_ARTWORK_CACHE_DIR ortam değişkeni ile değiştirilebilir)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "spotify_poster_maker", "artwork")
+
+# Varsayılan toplam önbellek boyutu sınırı (bayt)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Kaydedilmiş bir kapağın sunucuya sorulmadan kullanılabileceği süre (saniye)
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+# HTTP istek zaman aşımı (bağlantı, okuma) saniye cinsinden
+DEFAULT_TIMEOUT = (5, 20)
+
+# Diğer süreçlerin yazdıkları da hesaba katılsın diye klasör en geç bu kadar yazımda bir yeniden taranır
+RESCAN_EVERY_WRITES = 32
+
+# Bir dosyanın mtime'ı en fazla bu sıklıkta güncellenir (saniye); sık istenen kapaklarda her isabette yazılmaz
+TOUCH_INTERVAL = 60
+
+def _write_atomic(path, data):
+    """Baytları geçici dosyaya yazıp atomik olarak yerine taşır."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _touch(path):
+    """Dosyanın mtime'ını (son kullanım zamanı) TOUCH_INTERVAL'dan eskiyse günceller."""
+    try:
+        if time.time() - os.stat(path).st_mtime > TOUCH_INTERVAL:
+            os.utime(path)
+    except OSError:
+        pass # Başka bir süreç dosyayı bu arada silmiş olabilir
+
+class ArtworkStore:
+    """
+    URL ve içerik özeti ile anahtarlanan, boyutu sınırlı, süreçler arasında paylaşılabilir disk önbelleği.
+
+    Args:
+        cache_dir (str or None): Önbellek klasörü. None ise POSTER_ARTWORK_CACHE_DIR veya DEFAULT_CACHE_DIR.
+        max_bytes (int): Önbellekteki dosyaların toplam boyut sınırı.
+        max_age (float): Kapağın yeniden doğrulanmadan kullanılabileceği süre (saniye). 0 her seferinde doğrular.
+        timeout (float or tuple): requests zaman aşımı.
+        session (requests.Session or None): Kullanılacak oturum (testlerde sahte bir oturum verilebilir).
+        pool_size (int): Bağlantı havuzundaki en fazla bağlantı sayısı.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE,
+                 timeout=DEFAULT_TIMEOUT, session=None, pool_size=8):
+        self.cache_dir = cache_dir or os.environ.get("POSTER_ARTWORK_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.objects_dir = os.path.join(self.cache_dir, "objects")
+        self.entries_dir = os.path.join(self.cache_dir, "entries")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._approx_bytes = None
+        self._writes_since_scan = 0
+        self.stats_counters = {"hits": 0, "revalidated": 0, "downloads": 0, "stale_served": 0, "evictions": 0, "errors": 0}
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self.stats_counters[counter] += amount
+
+    # --- Kayıt ve kapak dosyaları ---
+
+    def _entry_path(self, url):
+        """URL'nin doğrulama kaydının yolu."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.entries_dir, key[:2], key + ".json")
+
+    def _read_entry(self, url):
+        """URL'nin kaydını (sha256, size, etag, last_modified, validated_at) okur; yoksa veya bozuksa None."""
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url or not entry.get("sha256"):
+            return None
+        return entry
+
+    def _write_entry(self, url, entry):
+        """URL'nin kaydını atomik olarak yazar; yazılamazsa kapak yine döndürülür, yalnızca kaydedilmez."""
+        try:
+            _write_atomic(self._entry_path(url), json.dumps(dict(entry, url=url)).encode("utf-8"))
+            return True
+        except OSError as e:
+            self._count("errors")
+            render_report.log_event(logger, logging.WARNING, "artwork_cache_write_error",
+                                    f"Kapak önbelleği kaydı yazılamadı: {e}", url=url, error=str(e))
+            return False
+
+    def _object_path(self, digest):
+        """İçerik özetine göre kapağın diskteki yolunu döndürür."""
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _read_object(self, digest):
+        """Özeti verilen kapak baytlarını okur; dosya yoksa None döndürür."""
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_object(self, content):
+        """Kapak baytlarını içerik özetiyle (aynı içerik bir kez) diske yazar ve özeti döndürür."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            _touch(path)
+        else:
+            _write_atomic(path, content)
+        return digest
+
+    def _files(self):
+        """(mtime, boyut, yol) listesi: tüm kayıtlar ve kapaklar; yarım kalmış geçici dosyalar sayılmaz."""
+        files = []
+        for root in (self.objects_dir, self.entries_dir):
+            try:
+                shards = list(os.scandir(root))
+            except OSError:
+                continue
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                try:
+                    for entry in os.scandir(shard.path):
+                        if entry.name.startswith("."):
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+                except OSError:
+                    continue
+        return files
+
+    def _evict(self):
+        """
+        Klasörü tarar; toplam boyut sınırı aşıldıysa en uzun süredir kullanılmayan dosyaları siler.
+        Kayıt ile kapağı birlikte kullanıldığından birlikte eskir; kaydı olmayan kapaklar da sınıra dahildir.
+        Kapağı silinmiş bir kayıt bir sonraki istekte indirme olarak ele alınır.
+        """
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    if path.startswith(self.objects_dir):
+                        evicted += 1
+                except FileNotFoundError:
+                    pass # Başka bir süreç zaten silmiş
+                except OSError:
+                    continue
+                total -= size
+        with self._lock:
+            self._approx_bytes = total
+            self._writes_since_scan = 0
+            self.stats_counters["evictions"] += evicted
+
+    def _written(self, size):
+        """Yazılan bayt sayısını hesaba katar ve gerekirse klasörü tarayıp eski dosyaları siler."""
+        with self._lock:
+            self._writes_since_scan += 1
+            if self._approx_bytes is not None:
+                self._approx_bytes += size
+            needs_scan = (self._approx_bytes is None or self._approx_bytes > self.max_bytes
+                          or self._writes_since_scan >= RESCAN_EVERY_WRITES)
+        if needs_scan:
+            self._evict()
+
+    # --- Genel API ---
+
+    def get(self, url):
+        """
+        URL'deki kapağın baytlarını döndürür; gerekirse indirir veya koşullu istekle doğrular.
+        Ağ hatasında önbellekte eski bir kopya varsa o döndürülür, yoksa requests istisnası fırlatılır.
+        """
+        entry = self._read_entry(url)
+        content = self._read_object(entry["sha256"]) if entry else None
+        if content is None:
+            entry = None
+
+        if entry and time.time() - entry.get("validated_at", 0) < self.max_age:
+            # Son kullanım zamanı yalnızca dosyaların mtime'ıdır; isabet yolunda kayıt yeniden yazılmaz
+            _touch(self._entry_path(url))
+            _touch(self._object_path(entry["sha256"]))
+            self._count("hits")
+            return content
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if entry:
+                render_report.log_event(logger, logging.WARNING, "artwork_stale_served",
+                                        f"Kapak doğrulanamadı ({e}); önbellekteki kopya kullanılıyor.", url=url, error=str(e))
+                self._count("stale_served")
+                return content
+            raise
+
+        written = 0
+        if response.status_code == 304 and entry:
+            _touch(self._object_path(entry["sha256"]))
+            self._count("revalidated")
+        else:
+            content = response.content
+            self._count("downloads")
+            try:
+                entry = {"sha256": self._write_object(content), "size": len(content)}
+            except OSError as e:
+                self._count("errors")
+                render_report.log_event(logger, logging.WARNING, "artwork_cache_write_error",
+                                        f"Kapak önbelleğe yazılamadı: {e}", url=url, error=str(e))
+                return content
+            written = len(content)
+        entry["etag"] = response.headers.get("ETag", entry.get("etag"))
+        entry["last_modified"] = response.headers.get("Last-Modified", entry.get("last_modified"))
+        entry["validated_at"] = time.time()
+        if self._write_entry(url, entry) and written:
+            self._written(written)
+        return content
+
+    def get_image(self, url):
+        """URL'deki kapağı PIL Image olarak döndürür."""
+        return Image.open(BytesIO(self.get(url)))
+
+    def total_bytes(self):
+        """Önbellekteki kapakların ve kayıtların toplam boyutunu (klasörü tarayarak) döndürür."""
+        return sum(size for _, size, _ in self._files())
+
+    def stats(self):
+        """Bu süreçteki sayaçları ve önbelleğin doluluğunu sözlük olarak döndürür."""
+        files = self._files()
+        with self._lock:
+            stats = dict(self.stats_counters)
+        stats["entries"] = sum(1 for _, _, path in files if path.startswith(self.objects_dir))
+        stats["bytes"] = sum(size for _, size, _ in files)
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+    def clear(self):
+        """Önbellekteki tüm kapakları ve kayıtları siler."""
+        for _, _, path in self._files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._approx_bytes = 0
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def get_default_store():
+    """Süreç genelinde paylaşılan ArtworkStore nesnesini döndürür."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ArtworkStore()
+        return _default_store
@@ -0,0 +1,111 @@
+# artwork_loader.py
+# Albüm kapaklarını poster için hazırlayan çözme ve boyutlandırma aşaması.
+# Yüksek çözünürlüklü taramalar (3000-5000 piksel) önce tamamen çözülüp sonra küçültülüyordu.
+# Burada JPEG'ler draft modunda hedefe en yakın 1/2, 1/4 veya 1/8 ölçekte çözülür, kalan fark
+# Image.reduce ile ucuzca kapatılır ve tek bir yüksek kaliteli yeniden örnekleme yapılır.
+# EXIF yönü uygulanır ve create_album_poster'a tam boyutlu RGB bir resim verilir.
+
+from io import BytesIO
+from PIL import Image, ImageOps
+
+# Son yeniden örneklemede kullanılan filtre
+DEFAULT_RESAMPLE = Image.Resampling.LANCZOS
+
+# resize'ın reduce ile tamsayı küçültme yapmadan önce bırakacağı pay; hedefin bu katına kadar
+# reduce ile inilir, kalanı yüksek kaliteli filtreyle örneklenir (Pillow'un reducing_gap seçeneği)
+DEFAULT_REDUCING_GAP = 3.0
+
+# 90 veya 270 derece döndürme içeren EXIF yön değerleri (genişlik ve yükseklik yer değiştirir)
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+def _open(source):
+    """Dosya yolu, bayt dizisi, dosya benzeri nesne veya PIL resmi olarak verilen kapağı açar."""
+    if isinstance(source, Image.Image):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = BytesIO(source)
+    return Image.open(source)
+
+def _orientation(img):
+    """Resmin EXIF yön değerini döndürür (yoksa 1)."""
+    try:
+        return img.getexif().get(0x0112, 1) or 1
+    except Exception:
+        return 1
+
+def decode_artwork(source, size):
+    """
+    Kapağı açar, JPEG ise size'ın altına inmeyecek draft ölçeğinde çözer, EXIF yönünü uygular ve RGB'ye çevirir.
+    Boyutlandırma yapılmaz; dönen resim en az size kadar (kaynak daha küçükse kaynak boyutunda) olur.
+    """
+    size = (int(size[0]), int(size[1]))
+    img = _open(source)
+    orientation = _orientation(img)
+
+    # JPEG'ler hedefin altına inmeyecek en küçük DCT ölçeğinde çözülür (yalnızca piksel verisi okunmadan önce etkili)
+    if img.format in ('JPEG', 'MPO') and getattr(img, 'tile', None):
+        draft_size = (size[1], size[0]) if orientation in _TRANSPOSED_ORIENTATIONS else size
+        try:
+            img.draft('RGB', draft_size)
+        except Exception:
+            pass
+
+    # Yön önce uygulanır; böylece boyutlandırma son hale göre yapılır
+    if orientation != 1:
+        img = ImageOps.exif_transpose(img)
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img
+
+def _resize(img, size, source, resample, reducing_gap):
+    """Çözülmüş kapağı tam olarak size boyutuna getirir; çağıranın nesnesi değiştirilmez."""
+    if img.size != size:
+        return img.resize(size, resample=resample, reducing_gap=reducing_gap)
+    if img is source:
+        # Çağıranın nesnesi değiştirilmeden döndürülür; önbelleklerde paylaşılabilir
+        return img.copy()
+    return img
+
+def prepare_artwork(source, size, resample=DEFAULT_RESAMPLE, reducing_gap=DEFAULT_REDUCING_GAP):
+    """
+    Kapağı çözer ve posterde kullanılacak tam boyutlu RGB resme dönüştürür.
+
+    Args:
+        source: Dosya yolu, bayt dizisi, dosya benzeri nesne veya PIL resmi.
+        size (tuple): Hedef (genişlik, yükseklik); bkz. poster_core.get_artwork_size.
+        resample: Son yeniden örneklemede kullanılan filtre.
+        reducing_gap (float or None): Image.resize'ın reducing_gap seçeneği; None ise yalnızca tek filtre uygulanır.
+
+    Returns:
+        PIL.Image.Image: size boyutunda RGB resim.
+    """
+    size = (int(size[0]), int(size[1]))
+    return _resize(decode_artwork(source, size), size, source, resample, reducing_gap)
+
+def prepare_artwork_variants(source, sizes, resample=DEFAULT_RESAMPLE, reducing_gap=DEFAULT_REDUCING_GAP):
+    """
+    Kapağı bir kez (en büyük hedefe göre) çözer ve her hedef boyut için ayrı bir resim üretir.
+    Hedefler büyükten küçüğe üretilir; her biri kendisini kapsayan en küçük ara sonuçtan küçültülür,
+    böylece küçük boyutlar büyük çözülmüş resim yerine bir önceki hedeften ucuzca elde edilir.
+
+    Args:
+        source: Dosya yolu, bayt dizisi, dosya benzeri nesne veya PIL resmi.
+        sizes (iterable): Hedef (genişlik, yükseklik) çiftleri.
+
+    Returns:
+        dict: (genişlik, yükseklik) -> size boyutunda RGB resim. Aynı boyut bir kez üretilir.
+    """
+    sizes = list(dict.fromkeys((int(w), int(h)) for w, h in sizes))
+    if not sizes:
+        return {}
+    largest = (max(w for w, _ in sizes), max(h for _, h in sizes))
+    decoded = decode_artwork(source, largest)
+    produced = {}
+    candidates = [decoded]
+    for size in sorted(sizes, key=lambda wh: wh[0] * wh[1], reverse=True):
+        base = min((img for img in candidates if img.size[0] >= size[0] and img.size[1] >= size[1]),
+                   key=lambda img: img.size[0] * img.size[1], default=decoded)
+        produced[size] = _resize(base, size, source, resample, reducing_gap)
+        candidates.append(produced[size])
+    return {size: produced[size] for size in sizes}
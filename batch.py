@@ -0,0 +1,322 @@
+# batch.py
+# Bir klasördeki (veya glob ile seçilen) Spotify/rip JSON dosyalarından toplu poster üretir.
+# Kullanım:
+#   python -m poster_core examples/ --output posters/ --size A3 --workers 4
+#   python batch.py "albums/**/*.json" --output posters/
+#   python -m poster_core albums/ --output posters/ --watch    (yalnızca değişen albümler; bkz. watch.py)
+
+import os
+import sys
+import re
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import poster_core
+import json_stream
+import artwork_loader
+import poster_layout
+import print_render
+import poster_export
+import render_cache
+
+# JSON ile aynı adı taşıyan kapak dosyası aranırken denenecek uzantılar
+ARTWORK_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+def collect_inputs(patterns, recursive=False):
+    """Klasör ve glob desenlerinden işlenecek JSON dosyalarının sıralı listesini döndürür."""
+    json_files = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            search = os.path.join(pattern, '**', '*.json') if recursive else os.path.join(pattern, '*.json')
+            matches = glob.glob(search, recursive=recursive)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for path in sorted(matches):
+            path = os.path.abspath(path)
+            if path.lower().endswith('.json') and os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                json_files.append(path)
+    return json_files
+
+def find_artwork(json_path, artwork_dir=None):
+    """JSON dosyasıyla aynı adı taşıyan kapak resmini (önce artwork_dir, sonra JSON'un klasörü) arar."""
+    stem = os.path.splitext(os.path.basename(json_path))[0]
+    search_dirs = [d for d in (artwork_dir, os.path.dirname(json_path)) if d]
+    for directory in search_dirs:
+        for ext in ARTWORK_EXTENSIONS:
+            for candidate in (stem + ext, stem + ext.upper()):
+                path = os.path.join(directory, candidate)
+                if os.path.isfile(path):
+                    return path
+    return None
+
+def output_path_for(json_path, output_dir, used_names):
+    """JSON dosyası için çakışmayan bir çıktı PNG yolu üretir."""
+    stem = re.sub(r'[^\w\-_\. ]', '', os.path.splitext(os.path.basename(json_path))[0]).replace(' ', '_') or 'album'
+    name = f"{stem}_poster.png"
+    counter = 2
+    while name in used_names:
+        name = f"{stem}_{counter}_poster.png"
+        counter += 1
+    used_names.add(name)
+    return os.path.join(output_dir, name)
+
+def page_path(output_path, number):
+    """Çok sayfalı posterde sayfa numarasını dosya adına ekler (album_poster.png -> album_poster_p2.png)."""
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}_p{number}{ext}"
+
+def _init_worker():
+    """İşçi süreç başlangıcında fontları belleğe alır; süreç ömrü boyunca önbellekte kalırlar."""
+    poster_core.get_font_manager().warm()
+
+def render_job(job):
+    """
+    Tek bir JSON dosyasından poster üretir ve PNG olarak kaydeder (işçi süreçte çalışır).
+
+    Args:
+        job (dict): 'json_path', 'artwork_path', 'output_path', 'options' ve isteğe bağlı 'dpi' ve 'exports'
+            anahtarlarını içerir. 'exports' poster_export.EncodeSettings listesidir; birden çok biçim eşzamanlı
+            kodlanıp output_path'in uzantısı değiştirilerek yazılır. 'dpi' verilmişse ve yalnızca PNG isteniyorsa
+            poster baskı çözünürlüğünde bantlar halinde çizilip PNG'ye akış halinde yazılır. Seçeneklerde
+            'tracklist_overflow' 'pages' ise her sayfa '_p2' gibi sonekli ayrı bir dosyaya yazılır.
+            'render_cache' (klasör, bayt sınırı) verilmişse kodlanmış posterler render_cache'ten okunur; tüm biçimler
+            önbellekteyse kapak çözülmez, poster çizilmez ve kodlanmaz.
+
+    Returns:
+        dict: 'json_path', 'output_path', 'outputs', 'ok', 'message' ve 'seconds' anahtarları.
+    """
+    started = time.perf_counter()
+    result = {"json_path": job["json_path"], "output_path": job["output_path"], "outputs": [], "ok": False, "message": ""}
+    try:
+        with open(job["json_path"], 'rb') as f:
+            album_data_raw, track_items = json_stream.read_album_json(f)
+        album_data, _ = poster_core.normalize_album_data(album_data_raw, track_items=track_items)
+        if not album_data:
+            result["message"] = "JSON biçimi tanınmadı"
+            return result
+
+        artwork_path = job.get("artwork_path")
+        artwork_image = [] # Kapak yalnızca bir çizim gerektiğinde ve bir kez çözülür
+
+        def albumart_image():
+            if not artwork_image:
+                artwork_image.append(artwork_loader.prepare_artwork(
+                    artwork_path, poster_core.get_artwork_size(job["options"].get('poster_size', 'A4'))) if artwork_path else None)
+            return artwork_image[0]
+
+        cache = render_cache.get_cache(*job["render_cache"]) if job.get("render_cache") else None
+        artwork_digest = render_cache.artwork_digest(artwork_path) if cache is not None and artwork_path else None
+
+        os.makedirs(os.path.dirname(job["output_path"]) or ".", exist_ok=True)
+        exports = job.get("exports") or [poster_export.make_settings("PNG", dpi=job.get("dpi"))]
+        pages = poster_core.paginate(album_data, job["options"])
+        cached_pages = 0
+        for number, (page_album, page_options) in enumerate(pages, 1):
+            target = job["output_path"] if len(pages) == 1 else page_path(job["output_path"], number)
+            if job.get("dpi") and [s.format for s in exports] == ["PNG"]:
+                # Baskı boyutunda tüm tuval bellekte tutulmaz; akış halinde yazıldığı için önbelleğe alınmaz
+                output_path = os.path.splitext(target)[0] + ".png"
+                print_render.render_poster_to_file(page_album, albumart_image(), page_options, output_path, dpi=job["dpi"])
+                result["outputs"].append(output_path)
+                continue
+
+            keys, hits = {}, {}
+            if cache is not None:
+                for settings in exports:
+                    keys[settings] = render_cache.render_key(page_album, artwork_digest, page_options, settings)
+                    encoded = cache.get(keys[settings], settings)
+                    if encoded is not None:
+                        hits[settings] = encoded
+            missing = [settings for settings in exports if settings not in hits]
+            written = {}
+            if missing:
+                poster = poster_core.create_album_poster(page_album, albumart_image(), page_options)
+                if poster is None:
+                    result["message"] = "poster oluşturulamadı"
+                    return result
+                for settings, (path, encoded) in zip(missing, poster_export.save_formats(poster, target, missing)):
+                    written[settings] = path
+                    if cache is not None:
+                        cache.put(keys[settings], encoded)
+            else:
+                cached_pages += 1
+            for settings, encoded in hits.items():
+                written[settings] = poster_export.write_encoded(target, encoded)
+            result["outputs"].extend(written[settings] for settings in exports)
+        result["output_path"] = result["outputs"][0]
+        result["ok"] = True
+        notes = []
+        if not artwork_path or (artwork_image and artwork_image[0] is None):
+            notes.append("kapaksız")
+        if cached_pages:
+            notes.append("önbellekten" if cached_pages == len(pages) else f"{cached_pages}/{len(pages)} sayfa önbellekten")
+        result["message"] = ", ".join(notes)
+    except Exception as e:
+        result["message"] = f"{type(e).__name__}: {e}"
+    finally:
+        result["seconds"] = time.perf_counter() - started
+    return result
+
+def build_jobs(json_files, output_dir, options, artwork_dir=None, dpi=None, exports=None, cache=None):
+    """
+    JSON dosyaları için işçi süreçlere gönderilecek iş sözlüklerini oluşturur.
+    cache, render_cache.get_cache'e verilecek (klasör, bayt sınırı) demetidir; None ise önbellek kullanılmaz.
+    """
+    used_names = set()
+    return [{
+        "json_path": json_path,
+        "artwork_path": find_artwork(json_path, artwork_dir),
+        "output_path": output_path_for(json_path, output_dir, used_names),
+        "options": options,
+        "dpi": dpi,
+        "exports": exports,
+        "render_cache": cache,
+    } for json_path in json_files]
+
+def run_batch(jobs, workers=None, on_result=None):
+    """
+    İşleri bir ProcessPoolExecutor üzerinde paralel çalıştırır.
+
+    Args:
+        jobs (list): build_jobs ile oluşturulan işler.
+        workers (int or None): İşçi süreç sayısı (None ise CPU sayısı).
+        on_result (callable or None): Her iş bittiğinde sonuç sözlüğüyle çağrılır.
+
+    Returns:
+        list: İşlerle aynı sırada sonuç sözlükleri.
+    """
+    results = [None] * len(jobs)
+    if not jobs:
+        return results
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(render_job, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # İşçi süreç çöktüyse (ör. bellek yetersizliği) iş başarısız sayılır
+                result = {"json_path": jobs[index]["json_path"], "output_path": jobs[index]["output_path"],
+                          "ok": False, "message": f"{type(e).__name__}: {e}", "seconds": 0.0}
+            results[index] = result
+            if on_result:
+                on_result(result)
+    return results
+
+def options_from_args(args):
+    """Komut satırı argümanlarından create_album_poster seçeneklerini oluşturur."""
+    return {
+        'poster_size': poster_layout.print_size_key(args.size, args.dpi) if args.dpi else args.size,
+        'tracks_per_column': args.tracks_per_column,
+        'tracklist_font_size_search_range': (args.font_min, args.font_max),
+        'include_copyright': not args.no_copyright,
+        'copyright_bottom_padding_px': args.copyright_padding,
+        'tracklist_horizontal_offset': args.offset,
+        'tracklist_overflow': args.overflow,
+        'min_tracklist_font_size': args.min_font,
+    }
+
+def exports_from_args(args):
+    """Komut satırı argümanlarından istenen her biçim için poster_export.EncodeSettings listesini oluşturur."""
+    return [poster_export.make_settings(fmt, compress_level=args.png_compression,
+                                        png_colors=args.png_colors, quality=args.quality, dpi=args.dpi)
+            for fmt in dict.fromkeys(poster_export.normalize_format(f) for f in args.format)]
+
+def build_arg_parser():
+    """Toplu işlem komut satırı ayrıştırıcısını oluşturur."""
+    parser = argparse.ArgumentParser(
+        prog="python -m poster_core",
+        description="Render album posters for a folder or glob of Spotify/rip JSON files.",
+    )
+    parser.add_argument("inputs", nargs="+", help="JSON files, folders or glob patterns (e.g. 'albums/**/*.json').")
+    parser.add_argument("-o", "--output", default="posters", help="Output folder for the PNG files (default: posters).")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search folders recursively.")
+    parser.add_argument("--artwork-dir", default=None, help="Folder with cover images named like the JSON files (default: next to each JSON).")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--size", choices=sorted(poster_core.SIZE_PRESETS), default="A4", help="Poster size (default: A4).")
+    parser.add_argument("--dpi", type=float, default=None,
+                        help="Render at print resolution for the paper size (e.g. --size A2 --dpi 300 gives 4961x7016), streamed to disk in bands.")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "jpeg", "jpg", "webp"],
+                        help="Output format(s); several formats are encoded concurrently (default: png).")
+    parser.add_argument("--png-compression", type=int, default=poster_export.DEFAULT_SETTINGS.compress_level, choices=range(10),
+                        metavar="0-9", help="PNG compression level; lower is faster, higher is smaller (default: 6).")
+    parser.add_argument("--png-colors", type=int, default=None, help="Reduce PNG output to this many colours (2-256).")
+    parser.add_argument("--quality", type=int, default=poster_export.DEFAULT_SETTINGS.quality, help="JPEG/WebP quality (default: 95).")
+    parser.add_argument("--tracks-per-column", type=int, default=6)
+    parser.add_argument("--font-min", type=int, default=10, help="Minimum tracklist font size.")
+    parser.add_argument("--font-max", type=int, default=20, help="Maximum tracklist font size.")
+    parser.add_argument("--overflow", choices=poster_layout.OVERFLOW_MODES, default="clip",
+                        help="Tracklists that do not fit: 'clip' drops columns past the edge, 'dense' shrinks the type and "
+                             "adds rows to fit one poster, 'pages' writes one poster per page (_p2, _p3, ...) (default: clip).")
+    parser.add_argument("--min-font", type=int, default=poster_layout.DEFAULT_MIN_TRACKLIST_SIZE,
+                        help=f"Smallest tracklist font size for --overflow dense/pages (default: {poster_layout.DEFAULT_MIN_TRACKLIST_SIZE}).")
+    parser.add_argument("--no-copyright", action="store_true", help="Do not draw copyright information.")
+    parser.add_argument("--copyright-padding", type=int, default=20, help="Copyright bottom padding in pixels.")
+    parser.add_argument("--offset", type=int, default=0, help="Tracklist horizontal offset in pixels.")
+    parser.add_argument("--no-render-cache", action="store_true",
+                        help="Always render; do not read or write the render cache.")
+    parser.add_argument("--render-cache-dir", default=None,
+                        help="Render cache folder shared with the GUI and render service (default: $POSTER_RENDER_CACHE_DIR "
+                             "or ~/.cache/spotify_poster_maker/renders).")
+    parser.add_argument("--render-cache-mb", type=float, default=render_cache.DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Render cache size limit in MB; least recently used posters are removed (default: %(default)g).")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-render only albums whose JSON, cover or options changed.")
+    parser.add_argument("--once", action="store_true",
+                        help="With --watch: render what changed since the last run, then exit.")
+    parser.add_argument("--interval", type=float, default=2.0, help="With --watch: seconds between folder scans (default: 2).")
+    parser.add_argument("--debounce", type=float, default=3.0,
+                        help="With --watch: wait until files have been quiet this many seconds before rendering (default: 3).")
+    return parser
+
+def print_result(result):
+    """Bir işin sonucunu tek satır olarak yazar."""
+    status = "OK  " if result["ok"] else "HATA"
+    detail = f" ({result['message']})" if result["message"] else ""
+    target = ", ".join(result.get("outputs") or [result["output_path"]]) if result["ok"] else result["json_path"]
+    print(f"[{status}] {target} {result['seconds']:.2f}s{detail}")
+
+def watch_main(args):
+    """--watch: klasörü izler ve yalnızca değişen albümleri çizer (bkz. watch.py)."""
+    import watch
+    cache = None if args.no_render_cache else (args.render_cache_dir, int(args.render_cache_mb * 1024 * 1024))
+    watcher = watch.Watcher(args.inputs, args.output, options_from_args(args), exports_from_args(args), args.dpi,
+                            args.artwork_dir, args.recursive, cache, args.workers, args.debounce, args.interval,
+                            on_result=print_result)
+    if args.once:
+        results = watcher.run_once()
+        watcher.close()
+        failed = [r for r in results if not r["ok"]]
+        print(f"Tamamlandı: {len(results) - len(failed)} yeniden çizildi, {len(failed)} başarısız")
+        return 1 if failed else 0
+    print(f"{os.path.abspath(args.output)} için izleniyor: {', '.join(args.inputs)} (durdurmak için Ctrl+C)")
+    watcher.run()
+    return 0
+
+def main(argv=None):
+    """Toplu işlem giriş noktası; başarısız dosya varsa 1 döndürür."""
+    args = build_arg_parser().parse_args(argv)
+    if args.watch:
+        return watch_main(args)
+    json_files = collect_inputs(args.inputs, recursive=args.recursive)
+    if not json_files:
+        print("İşlenecek JSON dosyası bulunamadı.")
+        return 1
+
+    cache = None if args.no_render_cache else (args.render_cache_dir, int(args.render_cache_mb * 1024 * 1024))
+    jobs = build_jobs(json_files, os.path.abspath(args.output), options_from_args(args), args.artwork_dir, args.dpi,
+                      exports_from_args(args), cache)
+    print(f"{len(jobs)} albüm işleniyor...")
+
+    started = time.perf_counter()
+    results = run_batch(jobs, workers=args.workers, on_result=print_result)
+    failed = [r for r in results if not r["ok"]]
+    print(f"Tamamlandı: {len(results) - len(failed)} başarılı, {len(failed)} başarısız, {time.perf_counter() - started:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+# benchmark.py
+# Poster üretiminin performans ölçüm takımı.
+# Sentetik albümler (1-5000 parça; kısa, karışık, uzun ve Unicode adlar) üretilir ve her albüm
+# A4/A3/A2 ile baskı boyutlarında çizilirken her aşamanın süresi ve en yüksek bellek kullanımı ölçülür:
+#   normalize - ham Spotify verisinden Album oluşturma
+#   fonts     - font yüzlerinin soğuk olarak belleğe alınması
+#   layout    - font boyutu aramaları dahil yerleşim planı (önbelleksiz)
+#   palette   - kapak özeti ve baskın renkler (önbelleksiz)
+#   draw      - planın boyanması (katman önbellekleri boş)
+#   encode    - varsayılan PNG kodlaması
+# Sonuçlar JSON olarak yazılır; --compare ile kaydedilmiş bir taban çizgisine göre gerilemeler işaretlenir.
+#
+#   python benchmark.py --output baseline.json
+#   python benchmark.py --compare baseline.json --output current.json
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import contextlib
+from io import StringIO
+from PIL import Image
+
+import poster_core
+import poster_layout
+import poster_export
+import print_render
+import palette
+import font_manager
+from album_model import Album
+
+# Varsayılan ölçüm matrisi
+DEFAULT_TRACK_COUNTS = (1, 12, 100, 1000, 5000)
+DEFAULT_STYLES = ("varied", "long", "unicode")
+DEFAULT_SIZES = ("A4", "A3", "A2", "A4@300dpi")
+
+# --quick için küçük matris
+QUICK_TRACK_COUNTS = (1, 12, 100)
+QUICK_STYLES = ("varied", "unicode")
+QUICK_SIZES = ("A4", "A2")
+
+# Ölçülen aşamalar (sırasıyla)
+PHASES = ("normalize", "fonts", "layout", "palette", "draw", "encode")
+
+# Karşılaştırmada gerileme sayılacak oran ve gürültü sayılacak en küçük mutlak farklar
+DEFAULT_TIME_THRESHOLD = 1.15
+MIN_TIME_DIFF_MS = 2.0
+DEFAULT_MEMORY_THRESHOLD = 1.10
+MIN_MEMORY_DIFF_MB = 5.0
+
+RESULT_FORMAT_VERSION = 1
+
+_WORDS = ("night", "light", "dream", "love", "fire", "river", "city", "song", "heart", "blue", "electric",
+          "midnight", "summer", "echo", "golden", "runaway", "shadow", "paper", "silver", "ocean", "wild")
+_UNICODE_TITLES = ("Çığ Öğünü Şarkısı", "Ağır Roman (İstanbul'dan)", "Über den Dächern", "Ωδή στη Θάλασσα",
+                   "Песня о тревожной молодости", "夜に駆ける", "Café Niño Ñandú", "Ærø Søndag Åben",
+                   "Zażółć gęślą jaźń", "Dança do Coração 🎵", "Ἀρχὴ ἥμισυ παντός", "Đêm Trăng Hà Nội")
+
+def _title(rng, style, index):
+    """Stile göre bir parça adı üretir."""
+    if style == "short":
+        return rng.choice(_WORDS).title()
+    if style == "long":
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(10, 18))]
+        return " ".join(words).title() + f" (Extended Live Version {1990 + index % 30})"
+    if style == "unicode":
+        title = rng.choice(_UNICODE_TITLES)
+        return title if rng.random() < 0.7 else f"{title} - {rng.choice(_WORDS).title()}"
+    # varied: 1-8 kelime, ara sıra konuk sanatçı ve remaster ekleri
+    title = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 8))).title()
+    roll = rng.random()
+    if roll < 0.15:
+        title += f" (feat. {rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()})"
+    elif roll < 0.25:
+        title += f" - Remastered {1970 + index % 50}"
+    return title
+
+def synthetic_album_raw(track_count, style="varied", seed=0):
+    """
+    Spotify API yanıtı biçiminde sentetik bir albüm üretir (aynı argümanlarla her zaman aynı sonuç).
+
+    Args:
+        track_count (int): Parça sayısı.
+        style (str): 'short', 'varied', 'long' veya 'unicode'.
+        seed (int): Rastgele üreteç tohumu.
+
+    Returns:
+        dict: sp.album yanıtıyla aynı yapıda ham veri.
+    """
+    rng = random.Random(f"{seed}:{style}:{track_count}")
+    if style == "long":
+        album_name = "The Complete Recordings of the " + " ".join(rng.choice(_WORDS) for _ in range(8)).title()
+    elif style == "unicode":
+        album_name = rng.choice(_UNICODE_TITLES)
+    else:
+        album_name = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 3))).title()
+    artists = [{"name": rng.choice(_WORDS).title() + " " + rng.choice(_WORDS).title()}]
+    items = [{
+        "name": _title(rng, style, index),
+        "duration_ms": rng.randint(45_000, 720_000),
+        "artists": artists,
+        "track_number": index + 1,
+    } for index in range(track_count)]
+    return {
+        "name": album_name,
+        "artists": artists,
+        "copyrights": [{"text": f"© {2000 + seed % 25} {artists[0]['name']} Records", "type": "C"},
+                       {"text": f"℗ {2000 + seed % 25} {artists[0]['name']} Records", "type": "P"}],
+        "images": [],
+        "tracks": {"items": items, "total": track_count},
+    }
+
+def synthetic_artwork(size, seed=0):
+    """Belirli bir boyutta gürültülü, renkli sentetik bir kapak üretir."""
+    width, height = int(size[0]), int(size[1])
+    base = max(64, min(width, height) // 8)
+    red = Image.linear_gradient("L").resize((base, base))
+    green = Image.effect_noise((base, base), 64).point(lambda v: (v + seed * 37) % 256)
+    blue = red.rotate(90)
+    return Image.merge("RGB", (red, green, blue)).resize((width, height), Image.Resampling.BICUBIC)
+
+def _read_hwm_kb():
+    """Linux'ta sürecin en yüksek RSS değerini (VmHWM, kB) okur; okunamazsa None."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def _reset_hwm():
+    """En yüksek RSS sayacını şu anki değere indirir (Linux); başarılıysa True."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+class PhaseTimer:
+    """Aşama sürelerini (ms) ve her aşamanın en yüksek RSS değerini (MB) toplar."""
+
+    def __init__(self):
+        self.times = {}
+        self.peaks = {}
+        self.per_phase_memory = _reset_hwm()
+
+    def run(self, phase, fn, *args, **kwargs):
+        """fn'i çalıştırıp süresini ve en yüksek belleği phase adıyla kaydeder; fn'in sonucunu döndürür."""
+        if self.per_phase_memory:
+            _reset_hwm()
+        # Çizim modüllerinin bilgi mesajları (ör. font boyutu bulunamadı) ölçüm çıktısına karışmaz
+        with contextlib.redirect_stdout(StringIO()):
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            self.times[phase] = (time.perf_counter() - started) * 1000
+        hwm = _read_hwm_kb()
+        if hwm is None:
+            # /proc yoksa süreç başından beri en yüksek değer kullanılır
+            peak = print_render.peak_rss_mb()
+        else:
+            peak = hwm / 1024
+        if peak is not None:
+            self.peaks[phase] = peak
+        return result
+
+def run_case(raw, size, repeat=1, palette_method="adaptive", tracks_per_column=6):
+    """
+    Tek bir (albüm, boyut) durumunu repeat kez ölçer.
+
+    Returns:
+        dict: 'phases' (aşama -> medyan ms), 'total_ms', 'peak_rss_mb' ve 'phase_peak_rss_mb'.
+    """
+    fonts_dir = poster_core.resource_path("fonts")
+    paths = poster_core.font_paths()
+    options = {
+        'poster_size': size,
+        'tracks_per_column': tracks_per_column,
+        'tracklist_font_size_search_range': (10, 20),
+        'include_copyright': True,
+        'palette_method': palette_method,
+    }
+    artwork_master = synthetic_artwork(poster_layout.get_artwork_size(size))
+    shared_fonts = poster_core.get_font_manager()
+
+    samples = []
+    peaks = []
+    for _ in range(max(1, repeat)):
+        # Her tekrar soğuk önbelleklerle başlar
+        poster_layout.clear_cache()
+        poster_core.clear_layer_cache()
+        palette.clear_cache()
+        artwork = artwork_master.copy()
+
+        timer = PhaseTimer()
+        album = timer.run("normalize", Album.from_raw, raw)
+        fonts = font_manager.FontManager(fonts_dir)
+        timer.run("fonts", fonts.warm)
+        plan = timer.run("layout", poster_layout.get_layout, album, options, fonts, paths)
+        # Çizim paylaşılan font yöneticisini kullanır; planın fontları ölçüm dışında yüklenir
+        for spec in {run.font for run in (plan.album_name, plan.artist, plan.copyright) + plan.tracks if run is not None}:
+            poster_layout.load_font(shared_fonts, spec)
+
+        def extract():
+            return palette.extract_palette(artwork, count=len(plan.swatches), method=palette_method,
+                                           cache_key=palette.object_fingerprint(artwork))
+
+        timer.run("palette", extract)
+        poster = timer.run("draw", poster_core.render_layout, plan, artwork, options)
+        timer.run("encode", poster_export.encode_image, poster)
+        samples.append(timer.times)
+        peaks.append(timer.peaks)
+        del poster, artwork
+
+    phases = {phase: statistics.median(sample[phase] for sample in samples) for phase in PHASES}
+    phase_peaks = {phase: max(p.get(phase, 0.0) for p in peaks) for phase in PHASES}
+    return {
+        "phases": {phase: round(ms, 3) for phase, ms in phases.items()},
+        "total_ms": round(sum(phases.values()), 3),
+        "peak_rss_mb": round(max(phase_peaks.values()), 1),
+        "phase_peak_rss_mb": {phase: round(mb, 1) for phase, mb in phase_peaks.items()},
+    }
+
+def case_id(track_count, style, size):
+    """Durumların karşılaştırmada eşleştirildiği kimlik."""
+    return f"{size}/{style}/{track_count}"
+
+def run_benchmark(track_counts=DEFAULT_TRACK_COUNTS, styles=DEFAULT_STYLES, sizes=DEFAULT_SIZES, repeat=3,
+                  seed=0, on_result=None):
+    """Ölçüm matrisini çalıştırır ve JSON'a yazılabilir sonuç sözlüğünü döndürür."""
+    shared_fonts = poster_core.get_font_manager()
+    shared_fonts.warm()
+    results = []
+    for style in styles:
+        for track_count in track_counts:
+            raw = synthetic_album_raw(track_count, style, seed)
+            for size in sizes:
+                result = dict(id=case_id(track_count, style, size), tracks=track_count, style=style, size=size,
+                              pixels=list(poster_layout.resolve_poster_size(size)),
+                              **run_case(raw, size, repeat=repeat))
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    return {
+        "version": RESULT_FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pillow": Image.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "seed": seed,
+        "phases": list(PHASES),
+        "results": results,
+    }
+
+def compare_results(baseline, current, time_threshold=DEFAULT_TIME_THRESHOLD, memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    """
+    İki sonuç dosyasını karşılaştırır.
+
+    Returns:
+        list: Gerilemeler; her biri (durum kimliği, ölçü adı, taban, şimdiki, oran) demeti.
+    """
+    base_cases = {case["id"]: case for case in baseline.get("results", [])}
+    regressions = []
+    for case in current.get("results", []):
+        base = base_cases.get(case["id"])
+        if base is None:
+            continue
+        metrics = [(f"{phase}_ms", base["phases"].get(phase), case["phases"].get(phase)) for phase in PHASES]
+        metrics.append(("total_ms", base.get("total_ms"), case.get("total_ms")))
+        for name, old, new in metrics:
+            if old is None or new is None:
+                continue
+            if new - old > MIN_TIME_DIFF_MS and new > old * time_threshold:
+                regressions.append((case["id"], name, old, new, new / old if old else float("inf")))
+        old, new = base.get("peak_rss_mb"), case.get("peak_rss_mb")
+        if old and new and new - old > MIN_MEMORY_DIFF_MB and new > old * memory_threshold:
+            regressions.append((case["id"], "peak_rss_mb", old, new, new / old))
+    return regressions
+
+def _print_result(result):
+    phases = " ".join(f"{phase} {result['phases'][phase]:.1f}" for phase in PHASES)
+    print(f"{result['id']:<28} {result['total_ms']:>9.1f} ms  {result['peak_rss_mb']:>7.1f} MB  | {phases}")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="python benchmark.py",
+        description="Benchmark poster rendering phases on synthetic albums and compare against a saved baseline.")
+    parser.add_argument("-o", "--output", help="Write results to this JSON file.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with a saved result file; exit 1 on regressions.")
+    parser.add_argument("--results", metavar="CURRENT", help="With --compare: compare this saved file instead of running.")
+    parser.add_argument("--quick", action="store_true", help="Small matrix for a fast check.")
+    parser.add_argument("--tracks", type=int, nargs="+", help=f"Track counts (default: {' '.join(map(str, DEFAULT_TRACK_COUNTS))}).")
+    parser.add_argument("--styles", nargs="+", choices=("short", "varied", "long", "unicode"), help="Track name styles.")
+    parser.add_argument("--sizes", nargs="+", help="Poster sizes: A4, A3, A2 or print sizes like A2@300dpi.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median is reported (default: 3).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help=f"Slowdown ratio counted as a regression (default: {DEFAULT_TIME_THRESHOLD}).")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help=f"Peak memory ratio counted as a regression (default: {DEFAULT_MEMORY_THRESHOLD}).")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if args.results:
+        if not args.compare:
+            print("--results yalnızca --compare ile kullanılabilir.")
+            return 2
+        with open(args.results, encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        track_counts = args.tracks or (QUICK_TRACK_COUNTS if args.quick else DEFAULT_TRACK_COUNTS)
+        styles = args.styles or (QUICK_STYLES if args.quick else DEFAULT_STYLES)
+        sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+        print(f"{'case':<28} {'total':>12}  {'peak RSS':>10}  | phase ms")
+        current = run_benchmark(track_counts, styles, sizes, repeat=args.repeat, seed=args.seed, on_result=_print_result)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2, ensure_ascii=False)
+            print(f"Sonuçlar yazıldı: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, current, args.time_threshold, args.memory_threshold)
+        matched = len({c["id"] for c in current["results"]} & {c["id"] for c in baseline.get("results", [])})
+        print(f"{matched} durum karşılaştırıldı, {len(regressions)} gerileme.")
+        for case, metric, old, new, ratio in regressions:
+            print(f"[GERİLEME] {case} {metric}: {old:.1f} -> {new:.1f} (x{ratio:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,540 @@
+# flac_scan.py
+# Bir müzik kütüphanesini tarayıp her albüm için create_album_poster'ın okuduğu rip.json dosyasını üreten tarayıcı.
+# FLAC dosyalarından yalnızca meta veri blokları (STREAMINFO ve VORBIS_COMMENT) okunur; ses çerçevelerine
+# dokunulmaz ve mutagen gerekmez. Dosyalar bir iş parçacığı havuzunda okunur, albüm etiketine göre gruplanır
+# ve disk/parça numarasına göre sıralanır. Yol, boyut ve mtime bir SQLite indeksinde tutulur; değişmemiş
+# dosyalar yeniden taramada açılmaz.
+#
+# Kullanım:
+#   python flac_scan.py ~/Music --output rips/ --workers 16
+#   python flac_scan.py /mnt/library/A /mnt/library/B -o rips/ --covers
+
+import os
+import re
+import sys
+import json
+import time
+import struct
+import sqlite3
+import logging
+import argparse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import render_report
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan indeks dosyası (POSTER_FLAC_INDEX_PATH ortam değişkeni ile değiştirilebilir)
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "spotify_poster_maker", "flac_index.sqlite")
+
+# Varsayılan iş parçacığı sayısı; okuma disk beklemesi olduğu için CPU sayısından fazladır
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# İndeks bu kadar dosyada bir diske yazılır
+INDEX_BATCH_SIZE = 500
+
+# İndekste saklanan Vorbis etiketleri (küçük harfle); diğerleri okunmaz
+TAG_FIELDS = ("title", "artist", "album", "albumartist", "album artist", "date", "tracknumber", "tracktotal",
+              "totaltracks", "discnumber", "disctotal", "totaldiscs")
+
+# Albüm klasöründe kapak olarak aranan dosyalar (--covers)
+FOLDER_COVER_NAMES = ("cover", "folder", "front", "album")
+FOLDER_COVER_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# Çok diskli albümlerde disk klasörlerinin adları (CD1, Disc 2, ...); albüm klasörü bunların bir üstüdür
+_DISC_FOLDER_PATTERN = re.compile(r"^(cd|disc|disk)\s*\d+$", re.IGNORECASE)
+
+# Parçalarda farklı sanatçılar varken ALBUMARTIST etiketi yoksa kullanılan albüm sanatçısı
+VARIOUS_ARTISTS = "Various Artists"
+
+# FLAC meta veri blok türleri
+BLOCK_STREAMINFO = 0
+BLOCK_VORBIS_COMMENT = 4
+BLOCK_PICTURE = 6
+
+# PICTURE bloğunda ön kapak türü
+PICTURE_FRONT_COVER = 3
+
+# Tek bir FLAC dosyasının meta verisi. tags: küçük harfli etiket adı -> değer listesi.
+FlacInfo = namedtuple("FlacInfo", "path size mtime_ns sample_rate channels bits_per_sample total_samples duration_ms tags")
+
+# Tarama sonucu
+ScanResult = namedtuple("ScanResult", "files parsed indexed errors albums written unchanged seconds")
+
+class FlacError(ValueError):
+    """Dosya geçerli bir FLAC değilse veya meta verisi bozuksa fırlatılır."""
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise FlacError("dosya meta veri bloğunun ortasında bitiyor")
+    return data
+
+def _skip_id3(f):
+    """Dosya başındaki ID3v2 etiketini (bazı araçlar FLAC'a da ekler) atlar ve 'fLaC' imzasını okur."""
+    header = _read_exact(f, 4)
+    if header[:3] == b"ID3":
+        rest = _read_exact(f, 6)
+        flags = rest[1]
+        size = (rest[2] & 0x7F) << 21 | (rest[3] & 0x7F) << 14 | (rest[4] & 0x7F) << 7 | (rest[5] & 0x7F)
+        f.seek(size + (10 if flags & 0x10 else 0), os.SEEK_CUR)
+        header = _read_exact(f, 4)
+    if header != b"fLaC":
+        raise FlacError("FLAC imzası bulunamadı")
+
+def _parse_streaminfo(data):
+    """STREAMINFO bloğundan (örnekleme hızı, kanal, bit derinliği, toplam örnek) döndürür."""
+    if len(data) < 18:
+        raise FlacError("STREAMINFO bloğu çok kısa")
+    packed = int.from_bytes(data[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    bits_per_sample = ((packed >> 36) & 0x1F) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    return sample_rate, channels, bits_per_sample, total_samples
+
+def _parse_vorbis_comment(data):
+    """VORBIS_COMMENT bloğundaki TAG_FIELDS etiketlerini {ad: [değerler]} olarak döndürür."""
+    tags = {}
+    try:
+        vendor_length = struct.unpack_from("<I", data, 0)[0]
+        offset = 4 + vendor_length
+        count = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        for _ in range(count):
+            length = struct.unpack_from("<I", data, offset)[0]
+            offset += 4
+            comment = data[offset:offset + length].decode("utf-8", errors="replace")
+            offset += length
+            key, separator, value = comment.partition("=")
+            key = key.lower()
+            if separator and key in TAG_FIELDS:
+                tags.setdefault(key, []).append(value)
+    except struct.error:
+        raise FlacError("VORBIS_COMMENT bloğu bozuk")
+    return tags
+
+def _parse_picture(data):
+    """PICTURE bloğundan (resim türü, MIME türü, baytlar) döndürür."""
+    try:
+        picture_type, mime_length = struct.unpack_from(">II", data, 0)
+        offset = 8
+        mime = data[offset:offset + mime_length].decode("ascii", errors="replace")
+        offset += mime_length
+        description_length = struct.unpack_from(">I", data, offset)[0]
+        offset += 4 + description_length + 16 # açıklama, genişlik, yükseklik, derinlik, renk sayısı
+        data_length = struct.unpack_from(">I", data, offset)[0]
+        offset += 4
+    except struct.error:
+        raise FlacError("PICTURE bloğu bozuk")
+    return picture_type, mime, data[offset:offset + data_length]
+
+def read_flac(path, stat=None):
+    """
+    FLAC dosyasının meta veri bloklarını okur; ses çerçevelerine kadar okuma yapılmaz.
+
+    Args:
+        path (str): Dosya yolu.
+        stat (os.stat_result or None): Önceden alınmış stat (yoksa alınır).
+
+    Returns:
+        FlacInfo
+
+    Raises:
+        FlacError: Dosya geçerli bir FLAC değilse.
+        OSError: Dosya okunamazsa.
+    """
+    stat = stat or os.stat(path)
+    streaminfo = None
+    tags = {}
+    with open(path, "rb") as f:
+        _skip_id3(f)
+        last = False
+        while not last:
+            header = _read_exact(f, 4)
+            last = bool(header[0] & 0x80)
+            block_type = header[0] & 0x7F
+            length = int.from_bytes(header[1:4], "big")
+            if block_type == BLOCK_STREAMINFO:
+                streaminfo = _parse_streaminfo(_read_exact(f, length))
+            elif block_type == BLOCK_VORBIS_COMMENT:
+                tags = _parse_vorbis_comment(_read_exact(f, length))
+            elif block_type == 127:
+                raise FlacError("geçersiz meta veri bloğu")
+            else:
+                # SEEKTABLE, PADDING, PICTURE ve diğer bloklar okunmadan atlanır
+                f.seek(length, os.SEEK_CUR)
+    if streaminfo is None:
+        raise FlacError("STREAMINFO bloğu yok")
+    sample_rate, channels, bits_per_sample, total_samples = streaminfo
+    duration_ms = total_samples * 1000 // sample_rate if sample_rate and total_samples else None
+    return FlacInfo(path, stat.st_size, stat.st_mtime_ns, sample_rate, channels, bits_per_sample,
+                    total_samples, duration_ms, tags)
+
+def read_front_cover(path):
+    """FLAC dosyasına gömülü ön kapağı (yoksa ilk resmi) (MIME türü, baytlar) olarak döndürür; resim yoksa None."""
+    found = None
+    with open(path, "rb") as f:
+        _skip_id3(f)
+        last = False
+        while not last:
+            header = _read_exact(f, 4)
+            last = bool(header[0] & 0x80)
+            length = int.from_bytes(header[1:4], "big")
+            if header[0] & 0x7F == BLOCK_PICTURE:
+                picture_type, mime, data = _parse_picture(_read_exact(f, length))
+                if picture_type == PICTURE_FRONT_COVER:
+                    return mime, data
+                found = found or (mime, data)
+            else:
+                f.seek(length, os.SEEK_CUR)
+    return found
+
+# --- Kütüphane taraması ---
+
+def walk_flac_files(roots):
+    """Kök klasörlerdeki .flac dosyalarını (yol, stat) olarak döndürür; gizli klasörler atlanır."""
+    stack = [os.path.abspath(root) for root in roots]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            render_report.log_event(logger, logging.WARNING, "flac_dir_unreadable",
+                                    f"Klasör okunamadı: {directory} ({e})", path=directory, error=str(e))
+            continue
+        for entry in sorted(entries, key=lambda e: e.name, reverse=True):
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".flac") and entry.is_file():
+                    yield entry.path, entry.stat()
+            except OSError:
+                continue
+
+class ScanIndex:
+    """
+    Dosya yolu -> (boyut, mtime, meta veri) SQLite indeksi. Boyutu ve mtime'ı değişmemiş dosya yeniden okunmaz.
+
+    Args:
+        db_path (str or None): SQLite dosyası. None ise POSTER_FLAC_INDEX_PATH veya DEFAULT_INDEX_PATH;
+            ":memory:" kalıcı olmayan bir indeks kullanır.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.environ.get("POSTER_FLAC_INDEX_PATH") or DEFAULT_INDEX_PATH
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, info TEXT)")
+        self._db.commit()
+
+    def lookup(self, path, stat):
+        """Dosya değişmediyse indeksteki FlacInfo'yu, değiştiyse veya yoksa None döndürür."""
+        row = self._db.execute("SELECT size, mtime_ns, info FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        return FlacInfo(path, row[0], row[1], *json.loads(row[2]))
+
+    def store(self, infos):
+        """FlacInfo listesini tek bir işlemde yazar."""
+        self._db.executemany("INSERT OR REPLACE INTO files (path, size, mtime_ns, info) VALUES (?, ?, ?, ?)",
+                             [(info.path, info.size, info.mtime_ns, json.dumps(list(info[3:]), ensure_ascii=False))
+                              for info in infos])
+        self._db.commit()
+
+    def prune(self, roots, seen):
+        """Kök klasörler altında olup bu taramada bulunmayan (silinmiş) dosyaları indeksten çıkarır."""
+        prefixes = tuple(os.path.join(os.path.abspath(root), "") for root in roots)
+        stale = [(path,) for (path,) in self._db.execute("SELECT path FROM files")
+                 if path.startswith(prefixes) and path not in seen]
+        self._db.executemany("DELETE FROM files WHERE path = ?", stale)
+        self._db.commit()
+        return len(stale)
+
+    def close(self):
+        self._db.close()
+
+# --- Albümler ve rip.json ---
+
+def _first(tags, *keys, default=None):
+    for key in keys:
+        values = tags.get(key)
+        if values and values[0].strip():
+            return values[0].strip()
+    return default
+
+def _number(value):
+    """'3' veya '3/12' biçimindeki parça/disk numarasını tamsayıya çevirir; okunamazsa None."""
+    match = re.match(r"\s*(\d+)", value or "")
+    return int(match.group(1)) if match else None
+
+def album_folder(path):
+    """Dosyanın albüm klasörü; CD1/Disc 2 gibi disk klasörlerinde bir üst klasör."""
+    folder = os.path.dirname(path)
+    if _DISC_FOLDER_PATTERN.match(os.path.basename(folder)):
+        folder = os.path.dirname(folder)
+    return folder
+
+def album_key(info):
+    """
+    Dosyanın albüm anahtarı. ALBUMARTIST varsa (albüm sanatçısı, albüm adı); yoksa parça sanatçıları farklı
+    olabileceğinden (derleme, konuk sanatçı) (albüm adı, albüm klasörü). Albüm etiketi yoksa yalnızca klasör.
+    """
+    album = _first(info.tags, "album")
+    if album is None:
+        return ("", "", album_folder(info.path))
+    album_artist = _first(info.tags, "albumartist", "album artist")
+    if album_artist is not None:
+        return (album_artist.casefold(), album.casefold(), "")
+    return ("", album.casefold(), album_folder(info.path))
+
+def track_sort_key(info):
+    """Parçaları disk numarası, parça numarası ve dosya adına göre sıralayan anahtar."""
+    disc = _number(_first(info.tags, "discnumber")) or 1
+    track = _number(_first(info.tags, "tracknumber"))
+    return (disc, track is None, track or 0, os.path.basename(info.path).casefold())
+
+def group_albums(infos):
+    """FlacInfo'ları albümlere gruplar; her albümün parçaları sıralıdır. Albümler sanatçı ve ada göre sıralanır."""
+    albums = {}
+    for info in infos:
+        albums.setdefault(album_key(info), []).append(info)
+    return [sorted(albums[key], key=track_sort_key) for key in sorted(albums)]
+
+def album_to_rip_json(tracks):
+    """Sıralı parçalardan create_album_poster'ın okuduğu rip.json (çalma listesi) sözlüğünü oluşturur."""
+    first = tracks[0].tags
+    album_name = _first(first, "album", default=os.path.basename(album_folder(tracks[0].path)))
+    album_artist = _first(first, "albumartist", "album artist")
+    if album_artist is None:
+        track_artists = {_first(info.tags, "artist") for info in tracks} - {None}
+        album_artist = track_artists.pop() if len(track_artists) == 1 else (VARIOUS_ARTISTS if track_artists else "Unknown Artist")
+    release_date = _first(first, "date", default="Unknown Year")
+    items = []
+    for index, info in enumerate(tracks, 1):
+        title = _first(info.tags, "title", default=os.path.splitext(os.path.basename(info.path))[0])
+        artists = [name for name in info.tags.get("artist", []) if name.strip()] or [album_artist]
+        track = {
+            "name": title,
+            "artists": [{"name": name} for name in artists],
+            "album": {
+                "name": album_name,
+                "release_date": release_date
+            },
+            "duration_ms": info.duration_ms,
+            "uri": f"local:{title}",
+            "is_local": True,
+            "track_number": _number(_first(info.tags, "tracknumber")) or index,
+            "disc_number": _number(_first(info.tags, "discnumber")) or 1,
+            "external_urls": {},
+            "type": "track"
+        }
+        if info.duration_ms is None:
+            # STREAMINFO toplam örnek sayısını bilmiyor (0); süre yazılmaz, posterde 'N/A' görünür
+            render_report.log_event(logger, logging.WARNING, "flac_duration_unknown",
+                                    f"Parça süresi bilinmiyor: {info.path}", path=info.path)
+            del track["duration_ms"]
+        items.append({"track": track})
+    return {
+        "name": album_name,
+        "description": f"Playlist created from local folder: {album_name}",
+        "owner": {
+            "display_name": album_artist
+        },
+        "tracks": {
+            "total": len(items),
+            "items": items
+        },
+        "public": False,
+        "collaborative": False,
+        "followers": {
+            "total": 0
+        },
+        "id": None,
+        "uri": f"local:playlist:{album_name}",
+        "external_urls": {},
+        "href": None,
+        "images": [],
+        "type": "playlist"
+    }
+
+def rip_file_name(rip, used_names):
+    """Albüm için çakışmayan bir dosya adı ('Sanatçı - Albüm.json') üretir."""
+    stem = re.sub(r'[^\w\-_\. ]', '', f"{rip['owner']['display_name']} - {rip['name']}").strip() or "album"
+    name = f"{stem}.json"
+    counter = 2
+    while name.casefold() in used_names:
+        name = f"{stem} ({counter}).json"
+        counter += 1
+    used_names.add(name.casefold())
+    return name
+
+def _write_if_changed(path, data):
+    """İçerik farklıysa dosyayı atomik olarak yazar; yazıldıysa True döndürür (mtime gereksiz yere değişmez)."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+def find_album_cover(tracks):
+    """Albümün kapağını (uzantı, baytlar) olarak bulur: önce gömülü resim, sonra klasördeki cover/folder dosyası."""
+    for info in tracks[:1]:
+        try:
+            picture = read_front_cover(info.path)
+        except (OSError, FlacError):
+            picture = None
+        if picture:
+            mime, data = picture
+            return (".png" if mime == "image/png" else ".webp" if mime == "image/webp" else ".jpg"), data
+    directory = os.path.dirname(tracks[0].path)
+    for name in FOLDER_COVER_NAMES:
+        for extension in FOLDER_COVER_EXTENSIONS:
+            for candidate in (name + extension, name.capitalize() + extension, name.upper() + extension.upper()):
+                path = os.path.join(directory, candidate)
+                if os.path.isfile(path):
+                    with open(path, "rb") as f:
+                        return (".jpg" if extension == ".jpeg" else extension), f.read()
+    return None
+
+def write_rip_files(albums, output_dir, covers=False):
+    """
+    Her albüm için output_dir'e rip.json biçiminde bir dosya yazar; içeriği değişmemiş dosyalara dokunulmaz.
+    covers True ise kapak JSON ile aynı adla yazılır (toplu işlem ve izleme modu bu adla arar).
+
+    Returns:
+        tuple: (yazılan yollar, değişmeyen yollar)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    used_names = set()
+    written, unchanged = [], []
+    for tracks in albums:
+        rip = album_to_rip_json(tracks)
+        path = os.path.join(output_dir, rip_file_name(rip, used_names))
+        data = json.dumps(rip, ensure_ascii=False, indent=4).encode("utf-8")
+        changed = _write_if_changed(path, data)
+        stem = os.path.splitext(path)[0]
+        if covers and (changed or not any(os.path.isfile(stem + ext) for ext in FOLDER_COVER_EXTENSIONS)):
+            # Kapak yalnızca albüm değiştiğinde veya henüz yazılmadıysa aranır
+            cover = find_album_cover(tracks)
+            if cover:
+                changed = _write_if_changed(stem + cover[0], cover[1]) or changed
+        (written if changed else unchanged).append(path)
+    return written, unchanged
+
+def scan_library(roots, index=None, workers=DEFAULT_WORKERS, rescan=False, on_error=None):
+    """
+    Kütüphaneyi tarar ve tüm FLAC dosyalarının meta verisini döndürür.
+
+    Args:
+        roots (list): Kök klasörler.
+        index (ScanIndex or None): Değişmemiş dosyaların okunmadığı indeks; None ise her dosya okunur.
+        workers (int): Okuma iş parçacığı sayısı.
+        rescan (bool): True ise indeksteki kayıtlar kullanılmaz (indeks yine güncellenir).
+        on_error (callable or None): Okunamayan her dosya için (yol, hata) ile çağrılır.
+
+    Returns:
+        tuple: (FlacInfo listesi, yeniden okunan dosya sayısı, indeksten gelen dosya sayısı, hata sayısı)
+    """
+    infos, to_read, seen = [], [], set()
+    for path, stat in walk_flac_files(roots):
+        seen.add(path)
+        info = index.lookup(path, stat) if index is not None and not rescan else None
+        if info is not None:
+            infos.append(info)
+        else:
+            to_read.append((path, stat))
+    indexed = len(infos)
+
+    def read(item):
+        try:
+            return read_flac(*item), None
+        except (OSError, FlacError) as e:
+            return None, e
+
+    errors = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # Dosyalar parça parça gönderilir; ilk taramada bile bekleyen iş sayısı sınırlı kalır
+        for start in range(0, len(to_read), INDEX_BATCH_SIZE):
+            batch = to_read[start:start + INDEX_BATCH_SIZE]
+            read_infos = []
+            for (path, _), (info, error) in zip(batch, executor.map(read, batch)):
+                if error is not None:
+                    errors += 1
+                    if on_error:
+                        on_error(path, error)
+                    continue
+                read_infos.append(info)
+            infos.extend(read_infos)
+            if index is not None:
+                index.store(read_infos)
+    if index is not None:
+        index.prune(roots, seen)
+    return infos, len(to_read) - errors, indexed, errors
+
+def scan(roots, output_dir, index_path=None, workers=DEFAULT_WORKERS, rescan=False, covers=False, on_error=None):
+    """Kütüphaneyi tarar, albümleri gruplar ve rip.json dosyalarını yazar; ScanResult döndürür."""
+    started = time.perf_counter()
+    index = ScanIndex(index_path)
+    try:
+        infos, parsed, indexed, errors = scan_library(roots, index, workers, rescan, on_error)
+    finally:
+        index.close()
+    albums = group_albums(infos)
+    written, unchanged = write_rip_files(albums, output_dir, covers)
+    return ScanResult(len(infos) + errors, parsed, indexed, errors, len(albums), written, unchanged,
+                      time.perf_counter() - started)
+
+# --- Komut satırı ---
+
+def build_arg_parser():
+    """Tarayıcı komut satırı ayrıştırıcısını oluşturur."""
+    parser = argparse.ArgumentParser(
+        prog="python flac_scan.py",
+        description="Scan a FLAC library and write one rip.json per album for the poster maker.",
+    )
+    parser.add_argument("roots", nargs="+", help="Library folders to scan (searched recursively).")
+    parser.add_argument("-o", "--output", default="rips", help="Folder for the album JSON files (default: rips).")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Threads reading FLAC metadata (default: {DEFAULT_WORKERS}).")
+    parser.add_argument("--index", default=None,
+                        help="SQLite index of scanned files (default: $POSTER_FLAC_INDEX_PATH or "
+                             "~/.cache/spotify_poster_maker/flac_index.sqlite).")
+    parser.add_argument("--rescan", action="store_true", help="Read every file again, ignoring the index.")
+    parser.add_argument("--covers", action="store_true",
+                        help="Also write each album's cover (embedded picture or cover/folder image) next to its JSON.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every written JSON file.")
+    return parser
+
+def main(argv=None):
+    """Tarayıcı giriş noktası; okunamayan dosya varsa 1 döndürür."""
+    args = build_arg_parser().parse_args(argv)
+    missing = [root for root in args.roots if not os.path.isdir(root)]
+    if missing:
+        print(f"Klasör bulunamadı: {', '.join(missing)}")
+        return 1
+
+    def report_error(path, error):
+        print(f"[HATA] {path} ({error})")
+
+    result = scan(args.roots, args.output, args.index, args.workers, args.rescan, args.covers, report_error)
+    if args.verbose:
+        for path in result.written:
+            print(f"[OK  ] {path}")
+    print(f"{result.files} FLAC dosyası ({result.parsed} okundu, {result.indexed} indeksten, {result.errors} hata), "
+          f"{result.albums} albüm: {len(result.written)} yazıldı, {len(result.unchanged)} değişmedi, {result.seconds:.2f}s")
+    return 1 if result.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+# font_manager.py
+# Poster çiziminde kullanılan fontları süreç genelinde önbelleğe alan modül.
+# fonts/ klasöründeki her yüzün ham baytları bir kez okunur ve bellekte tutulur;
+# (yüz, piksel boyutu, layout motoru) anahtarlı FreeTypeFont nesneleri ise
+# sınırlı boyutlu bir LRU önbelleğinde saklanır.
+
+import os
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from io import BytesIO
+from PIL import ImageFont
+
+logger = logging.getLogger(__name__)
+
+# Önbellekte aynı anda tutulacak varsayılan FreeTypeFont sayısı
+DEFAULT_MAX_FONTS = 128
+
+# fonts/ klasöründe font olarak kabul edilen uzantılar
+FONT_EXTENSIONS = ('.otf', '.ttf')
+
+# Glif ilerleme tablolarının ölçüldüğü referans piksel boyutu
+ADVANCE_REFERENCE_SIZE = 1024
+
+# Tablonun doğrudan dizi ile indekslediği kod noktası aralığı (Latin, Latin-1 ve Latin Genişletilmiş-A/B)
+ADVANCE_DIRECT_RANGE = 0x250
+
+# Hinting nedeniyle her glifin gerçek genişliğinin doğrusal tahminden sapabileceği en fazla piksel
+ADVANCE_TOLERANCE_PX = 1.0
+
+def face_name(path_or_name):
+    """Bir font yolundan veya adından önbellekte kullanılan yüz adını üretir ('fonts/SemiBold.otf' -> 'semibold')."""
+    base = os.path.basename(str(path_or_name))
+    name, ext = os.path.splitext(base)
+    if ext.lower() not in FONT_EXTENSIONS:
+        name = base
+    return name.lower().replace(" ", "")
+
+class GlyphAdvanceTable:
+    """
+    Bir yüzün glif ilerleme genişliklerini piksel boyutundan bağımsız (boyut başına) birimlerle tutar.
+    Genişlikler referans boyutta bir kez ölçülür; herhangi bir boyuttaki metin genişliği
+    birim genişlik * piksel boyutu ile tahmin edilir. Hinting nedeniyle tahmin glif başına
+    en fazla ADVANCE_TOLERANCE_PX kadar sapabilir; kesin değer için getlength kullanılmalıdır.
+
+    Args:
+        font (PIL.ImageFont.FreeTypeFont): Referans boyutta yüklenmiş font.
+        reference_size (int): Fontun piksel boyutu.
+        kerning (bool): Karakter çiftleri arasındaki kerning düzeltmelerinin de hesaba katılıp katılmayacağı.
+    """
+
+    def __init__(self, font, reference_size, kerning=False):
+        self._font = font
+        self.reference_size = reference_size
+        self.kerning = kerning
+        self._lock = threading.Lock()
+        # Kod noktası ile indekslenen kompakt dizi; -1 henüz ölçülmemiş anlamına gelir
+        self._advances = array('d', [-1.0]) * ADVANCE_DIRECT_RANGE
+        self._extra_advances = {} # Doğrudan aralığın dışındaki kod noktaları
+        self._kerning_pairs = {} # (önceki, sonraki) -> birim kerning düzeltmesi
+
+    def _measure(self, text):
+        """Metni referans boyutta ölçer ve boyut başına birim genişliğe çevirir."""
+        return self._font.getlength(text) / self.reference_size
+
+    def advance(self, codepoint):
+        """Bir kod noktasının boyut başına ilerleme genişliğini döndürür (gerekirse ölçüp tabloya ekler)."""
+        if codepoint < ADVANCE_DIRECT_RANGE:
+            value = self._advances[codepoint]
+            if value < 0:
+                with self._lock:
+                    value = self._measure(chr(codepoint))
+                    self._advances[codepoint] = value
+            return value
+        value = self._extra_advances.get(codepoint)
+        if value is None:
+            with self._lock:
+                value = self._measure(chr(codepoint))
+                self._extra_advances[codepoint] = value
+        return value
+
+    def kerning_adjustment(self, first, second):
+        """İki karakter arasındaki boyut başına kerning düzeltmesini döndürür."""
+        key = (first, second)
+        value = self._kerning_pairs.get(key)
+        if value is None:
+            single_advances = self.advance(ord(first)) + self.advance(ord(second))
+            with self._lock:
+                value = self._measure(first + second) - single_advances
+                self._kerning_pairs[key] = value
+        return value
+
+    def unit_width(self, text):
+        """Metnin boyut başına birim genişliğini döndürür (piksel genişliği için boyutla çarpılır)."""
+        if not text:
+            return 0.0
+        advance = self.advance
+        total = sum(advance(codepoint) for codepoint in map(ord, text))
+        if self.kerning and len(text) > 1:
+            kerning_adjustment = self.kerning_adjustment
+            total += sum(kerning_adjustment(a, b) for a, b in zip(text, text[1:]))
+        return total
+
+    def unit_widths(self, texts):
+        """Birden çok metnin birim genişliklerini kompakt bir dizi olarak döndürür."""
+        return array('d', (self.unit_width(text) for text in texts))
+
+    def estimate(self, text, size):
+        """Metnin verilen piksel boyutundaki tahmini genişliğini döndürür."""
+        return self.unit_width(text) * size
+
+    @staticmethod
+    def tolerance(text_length):
+        """Belirtilen uzunluktaki bir metin için tahminin kesin genişlikten en fazla ne kadar sapabileceğini döndürür."""
+        return ADVANCE_TOLERANCE_PX * text_length + 1.0
+
+class FontManager:
+    """
+    Bir font klasöründeki yüzleri bellekte tutar ve FreeTypeFont nesnelerini LRU ile önbelleğe alır.
+
+    Args:
+        fonts_dir (str): Font dosyalarının bulunduğu klasör.
+        max_fonts (int): Önbellekte tutulacak en fazla FreeTypeFont sayısı.
+    """
+
+    def __init__(self, fonts_dir, max_fonts=DEFAULT_MAX_FONTS):
+        self.fonts_dir = fonts_dir
+        self.max_fonts = max(1, int(max_fonts))
+        self._lock = threading.RLock()
+        self._face_bytes = None # yüz adı -> ham font baytları
+        self._face_paths = {} # yüz adı -> dosya yolu
+        self._fonts = OrderedDict() # (yüz, boyut, layout motoru) -> FreeTypeFont
+        self._advance_tables = {} # (yüz, layout motoru, kerning) -> GlyphAdvanceTable
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load_faces(self):
+        """fonts/ klasöründeki tüm yüzlerin ham baytlarını okur (yalnızca ilk çağrıda)."""
+        if self._face_bytes is not None:
+            return self._face_bytes
+        faces = {}
+        if os.path.isdir(self.fonts_dir):
+            for file_name in sorted(os.listdir(self.fonts_dir)):
+                if not file_name.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                file_path = os.path.join(self.fonts_dir, file_name)
+                try:
+                    with open(file_path, 'rb') as f:
+                        faces[face_name(file_name)] = f.read()
+                    self._face_paths[face_name(file_name)] = file_path
+                except OSError as e:
+                    logger.warning(f"Font dosyası '{file_path}' okunurken hata: {e}", extra={"event": "font_read_error", "fields": {"path": file_path}})
+        self._face_bytes = faces
+        return faces
+
+    def warm(self, sizes=()):
+        """Tüm yüzleri belleğe alır ve isteğe bağlı olarak verilen boyutlardaki fontları önceden oluşturur."""
+        with self._lock:
+            faces = self._load_faces()
+        for face in list(faces):
+            for size in sizes:
+                try:
+                    self.get_font(face, size)
+                except Exception as e:
+                    logger.warning(f"'{face}' fontu {size} boyutunda önceden yüklenemedi: {e}", extra={"event": "font_warm_error", "fields": {"face": face, "size": size}})
+        return list(faces)
+
+    def faces(self):
+        """Bellekteki yüz adlarının listesini döndürür."""
+        with self._lock:
+            return list(self._load_faces())
+
+    def has_face(self, path_or_name):
+        """Verilen yüzün font klasöründe bulunup bulunmadığını döndürür."""
+        with self._lock:
+            return face_name(path_or_name) in self._load_faces()
+
+    def face_path(self, path_or_name):
+        """Verilen yüzün diskteki dosya yolunu döndürür (yoksa None)."""
+        with self._lock:
+            self._load_faces()
+            return self._face_paths.get(face_name(path_or_name))
+
+    def face_bytes(self, path_or_name):
+        """Verilen yüzün ham font baytlarını döndürür (yoksa None)."""
+        with self._lock:
+            return self._load_faces().get(face_name(path_or_name))
+
+    def get_font(self, path_or_name, size, layout_engine=None):
+        """
+        (yüz, boyut, layout motoru) için önbellekteki FreeTypeFont nesnesini döndürür.
+        Önbellekte yoksa bellekteki baytlardan oluşturur; yüz bulunamazsa OSError fırlatır.
+        """
+        face = face_name(path_or_name)
+        key = (face, int(size), layout_engine)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+
+            data = self._load_faces().get(face)
+            if data is None:
+                raise OSError(f"Font yüzü '{face}' '{self.fonts_dir}' içinde bulunamadı.")
+            self.misses += 1
+            font = ImageFont.truetype(BytesIO(data), int(size), layout_engine=layout_engine)
+            self._fonts[key] = font
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+                self.evictions += 1
+            return font
+
+    # ImageFont.truetype ile aynı imza; mevcut çağrıların kolayca değiştirilebilmesi için
+    truetype = get_font
+
+    def advance_table(self, path_or_name, layout_engine=None, kerning=False):
+        """Verilen yüz için (bir kez oluşturulan) glif ilerleme tablosunu döndürür."""
+        key = (face_name(path_or_name), layout_engine, bool(kerning))
+        with self._lock:
+            table = self._advance_tables.get(key)
+            if table is None:
+                # Referans font LRU önbelleğinden bağımsız tutulur; tablo ile birlikte yaşar
+                data = self._load_faces().get(key[0])
+                if data is None:
+                    raise OSError(f"Font yüzü '{key[0]}' '{self.fonts_dir}' içinde bulunamadı.")
+                reference_font = ImageFont.truetype(BytesIO(data), ADVANCE_REFERENCE_SIZE, layout_engine=layout_engine)
+                table = GlyphAdvanceTable(reference_font, ADVANCE_REFERENCE_SIZE, kerning=kerning)
+                self._advance_tables[key] = table
+            return table
+
+    def stats(self):
+        """Önbellek isabet/ıska sayaçlarını ve doluluğunu sözlük olarak döndürür."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "cached_fonts": len(self._fonts),
+                "max_fonts": self.max_fonts,
+                "faces": len(self._face_bytes or {}),
+            }
+
+    def reset_stats(self):
+        """İsabet/ıska sayaçlarını sıfırlar."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def clear(self):
+        """Önbellekteki FreeTypeFont nesnelerini ve bellekteki yüzleri boşaltır."""
+        with self._lock:
+            self._fonts.clear()
+            self._advance_tables.clear()
+            self._face_bytes = None
+            self._face_paths = {}
+
+# Süreç genelinde paylaşılan yöneticiler (font klasörü başına bir tane)
+_managers = {}
+_managers_lock = threading.Lock()
+
+def get_font_manager(fonts_dir, max_fonts=DEFAULT_MAX_FONTS):
+    """Verilen font klasörü için süreç genelinde paylaşılan FontManager nesnesini döndürür."""
+    key = os.path.abspath(fonts_dir)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = FontManager(key, max_fonts=max_fonts)
+            _managers[key] = manager
+        return manager
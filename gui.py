@@ -3,16 +3,27 @@ import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 import os
 import requests
-import json
 from io import BytesIO
 import re # Dosya adını temizlemek için
+import time
 from dotenv import load_dotenv # Ortam değişkenlerini yüklemek için
-from PIL import Image # Image sınıfını doğrudan import et
 
 # poster_core modülünü import et
 import poster_core
 # languages modülünü import et
 import languages
+# Kapak disk önbelleği
+import artwork_cache
+import artwork_loader
+# Spotify meta veri önbelleği ve eksiksiz albüm çekme
+import spotify_cache
+import spotify_fetch
+import palette
+import poster_layout
+# Posterin PNG/JPEG/WebP olarak arka planda kodlanması
+import poster_export
+# Kodlanmış posterlerin toplu işlem ve render servisiyle paylaşılan disk önbelleği
+import render_cache
 
 # .env dosyasından ortam değişkenlerini yükle
 load_dotenv()
@@ -30,11 +41,116 @@ if 'selected_language' not in st.session_state:
 # Bu çağrı languages.py içindeki get_strings fonksiyonunu çalıştırır ve metinleri yükler.
 strings = languages.get_strings(st.session_state['selected_language'])
 
+@st.cache_resource
+def get_spotify_client():
+    """Önbellekli Spotify istemcisini bir kez oluşturur; tüm yeniden çalıştırmalar ve oturumlar paylaşır."""
+    return spotify_cache.CachedSpotify(spotipy.Spotify(auth_manager=SpotifyClientCredentials()))
+
+# --- Yeniden çalıştırmalar ve oturumlar arasında paylaşılan önbellekler ---
+# Anahtarlar içerik özetleri ve seçeneklerdir; aynı etkileşim tekrarlandığında hiçbir adım yeniden hesaplanmaz.
+# Alt çizgiyle başlayan parametreler Streamlit tarafından özetlenmez (anahtara girmez).
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_local_album(json_bytes, texts_items):
+    """Yüklenen JSON'un baytlarından (Album, kapak URL'si, albüm özeti) üretir; okunamazsa None döndürür."""
+    local_json = poster_core.read_local_json_stream(BytesIO(json_bytes))
+    if not local_json:
+        return None
+    album_data_raw, track_items = local_json
+    album, artwork_url = poster_core.normalize_album_data(album_data_raw, dict(texts_items), track_items)
+    return album, artwork_url, (album.fingerprint() if album else None)
+
+@st.cache_data(max_entries=64, ttl=60 * 60, show_spinner=False)
+def load_spotify_album(album_id, texts_items, _sp):
+    """Spotify albümünü tüm parçalarıyla çekip (Album, kapak URL'si, albüm özeti) olarak döndürür."""
+    album_data_raw = spotify_fetch.fetch_album_raw(_sp, album_id)
+    if not album_data_raw:
+        return None, None, None
+    album, artwork_url = poster_core.normalize_album_data(album_data_raw, dict(texts_items))
+    return album, artwork_url, (album.fingerprint() if album else None)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def decode_uploaded_artwork(image_bytes, artwork_size):
+    """Yüklenen kapağı çözer ve poster boyutuna getirir; aynı nesne tüm yeniden çalıştırmalarda paylaşılır."""
+    # Büyük taramalar JPEG draft ve reduce ile hedefe yakın çözülür; EXIF yönü uygulanır, sonuç RGB'dir
+    return artwork_loader.prepare_artwork(image_bytes, artwork_size)
+
+@st.cache_resource(max_entries=32, ttl=60 * 60, show_spinner=False)
+def fetch_url_artwork(url, artwork_size):
+    """URL'deki kapağı (disk önbelleği üzerinden) alır ve poster boyutuna getirir."""
+    # Kapak disk önbelleğinden okunur; gerekirse indirilir veya ETag ile doğrulanır
+    return artwork_loader.prepare_artwork(artwork_cache.get_default_store().get(url), artwork_size)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def render_poster(album_digest, artwork_digest, options_items, _album, _artwork):
+    """
+    Posteri oluşturur. Anahtar (albüm özeti, kapak özeti, seçenekler) olduğundan _album ve _artwork
+    yalnızca önbellekte bulunmadığında kullanılır. Kodlama burada yapılmaz: 'exports' her biçim için
+    ilk istendiğinde arka planda kodlar ve sonucu saklar.
+    """
+    started = time.perf_counter()
+    report = poster_core.RenderReport()
+    # 'pages' modunda her sayfa ayrı bir poster olarak çizilir; diğer modlarda liste tek elemanlıdır
+    posters = poster_core.create_album_posters(_album, _artwork, dict(options_items), report=report)
+    if not posters or any(poster is None for poster in posters):
+        return None
+    poster = posters[0]
+    return {
+        "image": poster,
+        "report": report,
+        "exports": poster_export.LazyExports(poster),
+        "extra_pages": [(page, poster_export.LazyExports(page)) for page in posters[1:]],
+        "size": poster.size,
+        "render_ms": (time.perf_counter() - started) * 1000,
+        "rendered_at": time.time(),
+    }
+
+def show_cache_status(render_result, encoded, from_cache, elapsed_ms):
+    """Son çizimin ve kodlamanın süresini ve poster önbelleklerinin durumunu kenar çubuğunda gösterir."""
+    with st.sidebar.expander(strings["cache_status_header"], expanded=False):
+        if render_result is None and encoded is not None:
+            # Poster disk önbelleğinden geldi; çizim raporu yoktur
+            st.caption(strings["render_cache_hit_info"].format(elapsed_ms=f"{elapsed_ms:.0f}"))
+        if render_result:
+            state = strings["cache_state_hit"] if from_cache else strings["cache_state_miss"]
+            st.caption(strings["render_timing_info"].format(
+                render_ms=f"{render_result['render_ms']:.0f}",
+                format=encoded.settings.format if encoded else "-",
+                encode_ms=f"{encoded.encode_ms:.0f}" if encoded else "-",
+                elapsed_ms=f"{elapsed_ms:.0f}", state=state))
+            # Font boyutu aramasının seçtiği boyutlar ve varsayılana dönülen durumlar
+            report = render_result["report"]
+            st.caption(strings["render_report_sizes"].format(
+                album_name_px=report.sizes.get("album_name_px"), artist_px=report.sizes.get("artist_px"),
+                tracklist=report.sizes.get("tracklist"), tracklist_px=report.sizes.get("tracklist_px"),
+                columns=report.sizes.get("columns"), sizing_checks=sum(report.sizing.values())))
+            for event in report.fallbacks:
+                st.caption(strings["render_report_event"].format(event=event["event"], message=event["message"]))
+        layer_stats = poster_core.layer_cache_stats()
+        layout_stats = poster_layout.cache_stats()
+        palette_stats = palette.cache_stats()
+        st.caption(strings["cache_status_layers"].format(
+            layout_hits=layout_stats["hits"], layout_misses=layout_stats["misses"],
+            header_hits=layer_stats["header_hits"], header_misses=layer_stats["header_misses"],
+            band_hits=layer_stats["band_hits"], band_misses=layer_stats["band_misses"],
+            palette_hits=palette_stats["hits"], palette_misses=palette_stats["misses"]))
+        if sp is not None:
+            spotify_totals = sp.stats()["total"]
+            st.caption(strings["cache_status_spotify"].format(
+                hit_rate=f"{spotify_totals['hit_rate'] * 100:.0f}", api_calls=spotify_totals["api_calls"]))
+        artwork_stats = artwork_cache.get_default_store().stats()
+        st.caption(strings["cache_status_artwork"].format(
+            entries=artwork_stats["entries"], megabytes=f"{artwork_stats['bytes'] / (1024 * 1024):.1f}"))
+        render_stats = render_cache.get_cache().stats()
+        st.caption(strings["cache_status_renders"].format(
+            entries=render_stats["entries"], megabytes=f"{render_stats['bytes'] / (1024 * 1024):.1f}"))
+
 # Spotify API Bağlantısı (Dil metinleri yüklendikten sonra uyarıları kullanabiliriz)
 sp = None
 try:
     if os.environ.get("SPOTIPY_CLIENT_ID") and os.environ.get("SPOTIPY_CLIENT_SECRET"):
-         sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials())
+         # Arama ve albüm yanıtları bellek + SQLite önbelleğinden gelir; aynı etkileşim API çağrısı yapmaz
+         sp = get_spotify_client()
     else:
          # API anahtarları ayarlanmamışsa uyarı göster (dil dosyasından al)
          # Burada strings sözlüğünün artık yüklü olduğunu varsayıyoruz.
@@ -77,9 +193,9 @@ data_source = st.radio(
     (strings["data_source_spotify"], strings["data_source_local_json"])
 )
 
-album_data_raw = None # Spotify veya JSON'dan gelen ham veri
-album_data_processed = {} # Poster core'a gönderilecek işlenmiş veri
+album_data_processed = None # Poster core'a gönderilecek normalleştirilmiş Album nesnesi
 album_artwork_url = None # Spotify'dan gelen kapak URL'si
+album_digest = None # Albümün içerik özeti (çizim önbelleğinin anahtarı)
 
 if data_source == strings["data_source_spotify"]: # Karşılaştırmayı metinle yap
     if sp is None:
@@ -110,29 +226,10 @@ if data_source == strings["data_source_spotify"]: # Karşılaştırmayı metinle
                         selected_album_id = albums[selected_album_index]['id']
 
                         with st.spinner(strings["fetching_album_info"]):
-                            album_data_raw = sp.album(selected_album_id)
-
-                        # Poster core'a göndermek için veriyi işle
-                        if album_data_raw:
-                            album_data_processed["name"] = album_data_raw.get("name", strings["album_data_unknown_album"]) # Varsayılan metni dil dosyasından al
-                            if album_data_raw.get('artists'):
-                                artist_names = [artist['name'] for artist in album_data_raw['artists'] if isinstance(artist, dict) and 'name' in artist]
-                                album_data_processed["artist"] = ", ".join(artist_names) if artist_names else strings["album_data_unknown_artist"] # Varsayılan metni dil dosyasından al
-                            else:
-                                album_data_processed["artist"] = strings["album_data_unknown_artist"] # Varsayılan metni dil dosyasından al
-
-                            if album_data_raw.get('copyrights'):
-                                copyright_texts = [cp['text'] for cp in album_data_raw['copyrights'] if isinstance(cp, dict) and 'text' in cp]
-                                album_data_processed["copyright"] = " | ".join(copyright_texts) if copyright_texts else strings["album_data_no_copyright"] # Varsayılan metni dil dosyasından al
-                                album_data_processed["copyright"] = album_data_processed["copyright"].replace("℗", "(P)").replace("©", "(C)")
-                            else:
-                                album_data_processed["copyright"] = strings["album_data_no_copyright"] # Varsayılan metni dil dosyasından al
-
-                            if album_data_raw.get('images'):
-                                 if album_data_raw['images']:
-                                     largest_image = album_data_raw['images'][0]
-                                     album_artwork_url = largest_image.get('url') # Kapak URL'sini sakla
-                            album_data_processed["tracks"] = album_data_raw.get('tracks', {}).get('items', []) # Parça listesini sakla
+                            # İlk sayfadan sonraki parça sayfaları da çekilir; uzun albümler kesilmez.
+                            # Normalleştirilmiş albüm, aynı albüm için yeniden çalıştırmalar arasında önbellekte kalır.
+                            album_data_processed, album_artwork_url, album_digest = load_spotify_album(
+                                selected_album_id, tuple(sorted(strings.items())), sp)
 
             except Exception as e:
                 st.error(strings["search_or_select_error"].format(error_message=e)) # Hata mesajını dil dosyasından al
@@ -141,56 +238,17 @@ elif data_source == strings["data_source_local_json"]: # Karşılaştırmayı me
     # accept_multiple_files=False ekledik (varsayılan olsa da açıkça belirtildi)
     uploaded_json_file = st.file_uploader(strings["upload_json_label"], type=['json'], accept_multiple_files=False)
     if uploaded_json_file is not None:
-        # poster_core.read_local_json fonksiyonunu kullan
-        album_data_raw = poster_core.read_local_json(uploaded_json_file)
+        # Dosya akış halinde okunur; parçalardan yalnızca ad ve süre saklanır (büyük dışa aktarımlar için).
+        # Sonuç dosya içeriğinin özetiyle önbelleğe alınır; yeniden çalıştırmalarda tekrar ayrıştırılmaz.
+        local_album = load_local_album(uploaded_json_file.getvalue(), tuple(sorted(strings.items())))
 
-        if album_data_raw:
+        if local_album:
             st.success(strings["json_loaded_success"])
 
-            # JSON yapısına göre verileri işle
-            if 'tracks' in album_data_raw and 'items' in album_data_raw['tracks'] and album_data_raw['tracks']['items'] and 'track' in album_data_raw['tracks']['items'][0]:
-                # Rip.json formatı gibi görünüyor
-                album_data_processed["name"] = album_data_raw.get("name", strings["album_data_unknown_album"] + " (Rip JSON)") # Varsayılan metni dil dosyasından al
-                if album_data_raw.get('owner') and album_data_raw['owner'].get('display_name'):
-                     album_data_processed["artist"] = album_data_raw['owner']['display_name']
-                else:
-                    if album_data_raw.get('tracks') and album_data_raw['tracks'].get('items'):
-                        if album_data_raw['tracks']['items'] and album_data_raw['tracks']['items'][0].get('track') and album_data_raw['tracks']['items'][0]['track'].get('artists'):
-                             first_track_artists = [artist['name'] for artist in album_data_raw['tracks']['items'][0]['track']['artists'] if isinstance(artist, dict) and 'name' in artist]
-                             album_data_processed["artist"] = ", ".join(first_track_artists) if first_track_artists else strings["album_data_unknown_artist"] # Varsayılan metni dil dosyasından al
-                    else:
-                         album_data_processed["artist"] = strings["album_data_unknown_artist"] # Varsayılan metni dil dosyasından al
-
-                album_data_processed["copyright"] = strings["album_data_no_copyright"] # Varsayılan metni dil dosyasından al
-                album_artwork_url = None
-                album_data_processed["tracks"] = album_data_raw['tracks']['items']
-
-            elif 'name' in album_data_raw and 'artists' in album_data_raw and 'tracks' in album_data_raw:
-                 # Spotify API yanıt formatı gibi görünüyor
-                 album_data_processed["name"] = album_data_raw.get("name", strings["album_data_unknown_album"] + " (Spotify JSON)") # Varsayılan metni dil dosyasından al
-                 if album_data_raw.get('artists'):
-                     artist_names = [artist['name'] for artist in album_data_raw['artists'] if isinstance(artist, dict) and 'name' in artist]
-                     album_data_processed["artist"] = ", ".join(artist_names) if artist_names else strings["album_data_unknown_artist"] # Varsayılan metni dil dosyasından al
-                 else:
-                     album_data_processed["artist"] = strings["album_data_unknown_artist"] # Varsayılan metni dil dosyasından al
-
-                 if album_data_raw.get('copyrights'):
-                     copyright_texts = [cp['text'] for cp in album_data_raw['copyrights'] if isinstance(cp, dict) and 'text' in cp]
-                     album_data_processed["copyright"] = " | ".join(copyright_texts) if copyright_texts else strings["album_data_no_copyright"] # Varsayılan metni dil dosyasından al
-                     album_data_processed["copyright"] = album_data_processed["copyright"].replace("℗", "(P)").replace("©", "(C)")
-                 else:
-                     album_data_processed["copyright"] = strings["album_data_no_copyright"] # Varsayılan metni dil dosyasından al
-
-                 if album_data_raw.get('images'):
-                      if album_data_raw['images']:
-                          largest_image = album_data_raw['images'][0]
-                          album_artwork_url = largest_image.get('url')
-                 album_data_processed["tracks"] = album_data_raw.get('tracks', {}).get('items', [])
-
-            else:
+            # JSON yapısına göre (rip.json veya Spotify API yanıtı) veriler tek seferde normalleştirildi
+            album_data_processed, album_artwork_url, album_digest = local_album
+            if album_data_processed is None:
                 st.error(strings["json_format_unrecognized"]) # Hata mesajını dil dosyasından al
-                album_data_raw = None
-                album_data_processed = {}
 
         else:
             st.error(strings["json_load_error"]) # Hata mesajını dil dosyasından al
@@ -214,6 +272,16 @@ tracklist_font_size_min = st.sidebar.slider(strings["tracklist_font_size_min_lab
 tracklist_font_size_max = st.sidebar.slider(strings["tracklist_font_size_max_label"], 10, 40, 20)
 tracklist_font_size_search_range = (tracklist_font_size_min, tracklist_font_size_max)
 
+# Tuvale sığmayan uzun tracklist'ler: kenarı aşan kolonlar kesilir, tek postere sığdırılır veya sayfalara bölünür
+tracklist_overflow = st.sidebar.selectbox(
+    strings["tracklist_overflow_label"],
+    poster_layout.OVERFLOW_MODES,
+    format_func=lambda mode: strings[f"tracklist_overflow_{mode}"]
+)
+min_tracklist_font_size = poster_layout.DEFAULT_MIN_TRACKLIST_SIZE
+if tracklist_overflow != "clip":
+    min_tracklist_font_size = st.sidebar.slider(strings["min_tracklist_font_size_label"], 4, 12, poster_layout.DEFAULT_MIN_TRACKLIST_SIZE)
+
 # Tracklist yatay konum kaydırıcısı
 max_horizontal_offset = int(current_poster_width / 2)
 min_horizontal_offset = -int(current_poster_width / 2)
@@ -227,6 +295,17 @@ tracklist_horizontal_offset = st.sidebar.slider(
 
 include_copyright = st.sidebar.checkbox(strings["include_copyright_label"], value=True)
 copyright_bottom_padding_px = st.sidebar.slider(strings["copyright_bottom_padding_label"], 0, 100, 20)
+palette_colors = st.sidebar.slider(strings["palette_colors_label"], 1, 10, 5)
+
+# İndirme biçimi ve kodlama ayarları (kodlama arka planda yapılır; poster yeniden çizilmez)
+export_format = st.sidebar.selectbox(strings["export_format_label"], tuple(poster_export.FORMATS))
+if export_format == "PNG":
+    png_compress_level = st.sidebar.slider(strings["png_compress_level_label"], 0, 9, poster_export.DEFAULT_SETTINGS.compress_level)
+    png_palette = st.sidebar.checkbox(strings["png_palette_label"], value=False)
+    export_settings = poster_export.make_settings("PNG", compress_level=png_compress_level, png_colors=256 if png_palette else None)
+else:
+    export_quality = st.sidebar.slider(strings["export_quality_label"], 50, 100, poster_export.DEFAULT_SETTINGS.quality)
+    export_settings = poster_export.make_settings(export_format, quality=export_quality)
 
 
 # Albüm kapağı kaynağı seçimi
@@ -236,26 +315,14 @@ image_source = st.radio(
 )
 uploaded_image_file = None
 albumart_image_for_core = None # Poster core'a gönderilecek PIL Image nesnesi
+artwork_bytes = None # Kapağın çözülmemiş baytları; poster önbelleği anahtarı bunların özetiyle oluşturulur
 
 if image_source == strings["image_source_local_file"]: # Karşılaştırmayı metinle yap
     # accept_multiple_files=False ekledik (varsayılan olsa da açıkça belirtildi)
     uploaded_image_file = st.file_uploader(strings["upload_image_label"], type=['png', 'jpg', 'jpeg'], accept_multiple_files=False)
     if uploaded_image_file is not None:
-        # PIL.Image.open kullanıyoruz
-        try:
-            albumart_image_for_core = Image.open(uploaded_image_file)
-            if albumart_image_for_core:
-                 # Poster core'a göndermeden önce boyutu ayarla
-                 try:
-                     albumart_image_for_core = albumart_image_for_core.resize((int(600 * scale_factor_for_options), int(600 * scale_factor_for_options)))
-                 except Exception as e:
-                     st.error(strings["local_image_resize_error"].format(error_message=e)) # Hata mesajını dil dosyasından al
-                     albumart_image_for_core = None
-            else:
-                st.error(strings["local_image_load_error"]) # Hata mesajını dil dosyasından al
-        except Exception as e:
-             st.error(strings["local_image_load_error"].format(error_message=e)) # Hata mesajını dil dosyasından al
-             albumart_image_for_core = None
+        # Kapak yalnızca poster önbellekte yoksa çözülür (bkz. aşağıdaki buton)
+        artwork_bytes = uploaded_image_file.getvalue()
 
 
 # Poster Oluştur butonu
@@ -264,23 +331,22 @@ if st.button(strings["create_poster_button"]):
         st.warning(strings["no_album_data_warning"]) # Uyarı mesajını dil dosyasından al
     else:
         with st.spinner(strings["creating_poster_spinner"]): # Spinner metnini dil dosyasından al
+            requested_at = time.time()
+            started = time.perf_counter()
+            artwork_from_url = False
             # Eğer yerel resim yüklenmediyse ve URL varsa, URL'den indir
-            if albumart_image_for_core is None and album_artwork_url:
+            if artwork_bytes is None and album_artwork_url:
                 try:
-                    response = requests.get(album_artwork_url)
-                    response.raise_for_status()
-                    # PIL.Image.open kullanıyoruz
-                    img = Image.open(BytesIO(response.content))
-                    # Poster core'a göndermeden önce boyutu ayarla
-                    img_resized = img.resize((int(600 * scale_factor_for_options), int(600 * scale_factor_for_options)))
-                    albumart_image_for_core = img_resized
+                    # Kapak baytları disk önbelleğinden okunur; gerekirse indirilir veya ETag ile doğrulanır
+                    artwork_bytes = artwork_cache.get_default_store().get(album_artwork_url)
+                    artwork_from_url = True
                     st.success(strings["downloading_album_cover"]) # Başarı mesajını dil dosyasından al
                 except requests.exceptions.RequestException as e:
                      st.warning(strings["album_cover_download_error"].format(error_message=e)) # Uyarı mesajını dil dosyasından al
                 except Exception as e:
                      st.warning(strings["album_cover_process_error"].format(error_message=e)) # Uyarı mesajını dil dosyasından al
 
-            if albumart_image_for_core is None:
+            if artwork_bytes is None:
                 st.warning(strings["album_cover_not_found_warning"]) # Uyarı mesajını dil dosyasından al
 
 
@@ -291,37 +357,106 @@ if st.button(strings["create_poster_button"]):
                 'tracklist_font_size_search_range': tracklist_font_size_search_range,
                 'include_copyright': include_copyright,
                 'copyright_bottom_padding_px': copyright_bottom_padding_px,
-                'tracklist_horizontal_offset': tracklist_horizontal_offset # Yeni eklenen seçenek
+                'tracklist_horizontal_offset': tracklist_horizontal_offset, # Yeni eklenen seçenek
+                'palette_colors': palette_colors,
+                'tracklist_overflow': tracklist_overflow,
+                'min_tracklist_font_size': min_tracklist_font_size
             }
 
-            # poster_core'daki fonksiyonu çağır
-            created_poster_image = poster_core.create_album_poster(
-                album_data_processed,
-                albumart_image_for_core,
-                poster_options
-            )
+            # Kodlanmış poster (albüm, kapak baytları, seçenekler, fontlar ve kodlama ayarları) özetiyle disk
+            # önbelleğinde aranır; bulunursa kapak çözülmez, poster çizilmez ve kodlanmaz.
+            # Sayfalara bölünmüş posterler her zaman çizilir.
+            artwork_digest = render_cache.artwork_digest(artwork_bytes)
+            disk_cache = render_cache.get_cache()
+            cache_key = None
+            if tracklist_overflow != "pages":
+                cache_key = render_cache.render_key(album_data_processed, artwork_digest, poster_options, export_settings)
+            cached = disk_cache.get(cache_key, export_settings) if cache_key else None
+
+            render_result = None
+            if cached is None and artwork_bytes is not None:
+                # Çözülmüş ve boyutlandırılmış kapak, içerik özeti (veya URL) ve poster boyutuyla önbelleğe alınır
+                artwork_size = (int(600 * scale_factor_for_options), int(600 * scale_factor_for_options))
+                try:
+                    if artwork_from_url:
+                        albumart_image_for_core = fetch_url_artwork(album_artwork_url, artwork_size)
+                    else:
+                        albumart_image_for_core = decode_uploaded_artwork(artwork_bytes, artwork_size)
+                except Exception as e:
+                    error_key = "album_cover_process_error" if artwork_from_url else "local_image_load_error"
+                    st.error(strings[error_key].format(error_message=e)) # Hata mesajını dil dosyasından al
+                    albumart_image_for_core = None
+                if albumart_image_for_core is None:
+                    # Kapaksız çizilen poster bu kapağın anahtarıyla saklanmaz
+                    artwork_digest = None
+                    cache_key = None
+            if cached is None:
+                # Poster (albüm özeti, kapak özeti, seçenekler) anahtarıyla bellekte de önbelleğe alınır;
+                # aynı albüm ve ayarlar başka bir oturumda istense bile yeniden çizilmez
+                render_result = render_poster(
+                    album_digest,
+                    artwork_digest,
+                    tuple(sorted(poster_options.items())),
+                    album_data_processed,
+                    albumart_image_for_core
+                )
+
+            # Dosya adını albüm adına göre temizle
+            safe_album_name = re.sub(r'[^\w\-_\. ]', '', album_data_processed.name or 'album_poster').replace(' ', '_')
+            if cached is not None:
+                st.image(cached.data, caption=f"{album_data_processed.name or strings['album_data_unknown_album']} Posteri", use_container_width=True)
+                show_cache_status(None, cached, True, (time.perf_counter() - started) * 1000)
+                st.download_button(
+                    label=strings["download_poster_button"],
+                    data=cached.data,
+                    file_name=f"{safe_album_name}_poster{cached.extension}",
+                    mime=cached.mime
+                )
+                st.caption(strings["export_info"].format(
+                    format=cached.settings.format, size_kb=f"{len(cached.data) / 1024:.0f}", encode_ms="0"))
+                st.success(strings["poster_created_success"])
+            elif render_result:
+                # İndirme dosyası arka planda kodlanırken önizleme gönderilir
+                export_future = render_result["exports"].submit(export_settings)
 
-            if created_poster_image:
                 # use_column_width yerine use_container_width kullan
-                st.image(created_poster_image, caption=f"{album_data_processed.get('name', strings['album_data_unknown_album'])} Posteri", use_container_width=True) # Albüm adını ve varsayılanı dil dosyasından al
-
-                # Posteri indirme butonu
-                buf = BytesIO()
-                created_poster_image.save(buf, format="PNG")
-                byte_im = buf.getvalue()
-                # Dosya adını albüm adına göre temizle
-                safe_album_name = re.sub(r'[^\w\-_\. ]', '', album_data_processed.get('name', 'album_poster')).replace(' ', '_')
+                st.image(render_result["image"], caption=f"{album_data_processed.name or strings['album_data_unknown_album']} Posteri", use_container_width=True, output_format="JPEG") # Albüm adını ve varsayılanı dil dosyasından al
+
+                encoded = export_future.result()
+                if cache_key:
+                    disk_cache.put(cache_key, encoded)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                # Poster bu istekten önce çizildiyse önbellekten gelmiştir
+                show_cache_status(render_result, encoded, render_result["rendered_at"] < requested_at, elapsed_ms)
+
+                # Posteri indirme butonu (kodlanmış baytlar aynı poster ve ayarlar için saklanır)
                 st.download_button(
                     label=strings["download_poster_button"], # Buton metnini dil dosyasından al
-                    data=byte_im,
-                    file_name=f"{safe_album_name}_poster.png",
-                    mime="image/png"
+                    data=encoded.data,
+                    file_name=f"{safe_album_name}_poster{encoded.extension}",
+                    mime=encoded.mime
                 )
+                st.caption(strings["export_info"].format(
+                    format=encoded.settings.format, size_kb=f"{len(encoded.data) / 1024:.0f}", encode_ms=f"{encoded.encode_ms:.0f}"))
+
+                # Sayfalara bölünmüş posterin diğer sayfaları
+                page_count = len(render_result["extra_pages"]) + 1
+                for page_number, (page_image, page_exports) in enumerate(render_result["extra_pages"], 2):
+                    page_future = page_exports.submit(export_settings)
+                    st.image(page_image, caption=strings["poster_page_caption"].format(
+                        name=album_data_processed.name or strings['album_data_unknown_album'], page=page_number, pages=page_count),
+                        use_container_width=True, output_format="JPEG")
+                    page_encoded = page_future.result()
+                    st.download_button(
+                        label=strings["download_page_button"].format(page=page_number),
+                        data=page_encoded.data,
+                        file_name=f"{safe_album_name}_poster_p{page_number}{page_encoded.extension}",
+                        mime=page_encoded.mime
+                    )
 
                 st.success(strings["poster_created_success"]) # Başarı mesajını dil dosyasından al
-                # İsteğe bağlı olarak font boyutu bilgisini göster
-                # Best size bilgisi poster_core içinde hesaplanıyor, bunu döndürmek veya ayrı loglamak gerekebilir
-                # Şimdilik bu bilgiyi GUI'de göstermiyoruz.
+                # Seçilen font boyutları ve varsayılana dönme olayları kenar çubuğundaki önbellek durumunda gösterilir
             else:
+                show_cache_status(None, None, False, (time.perf_counter() - started) * 1000)
                 st.error(strings["poster_creation_error"]) # Hata mesajını dil dosyasından al
 
@@ -0,0 +1,185 @@
+# json_stream.py
+# Büyük albüm/çalma listesi JSON dosyaları için artımlı (akış halinde) okuyucu.
+# json.load tüm belgeyi belleğe alır; on binlerce parçalık ve her parçada ağır meta veri
+# bulunan dışa aktarımlarda bu gereksiz yere yüksek bellek kullanımı demektir. Burada dosya
+# parça parça okunur, 'tracks.items' dizisinin öğeleri birer birer ayrıştırılır ve her öğeden
+# yalnızca posterin kullandığı alanlar (name, duration_ms) saklanır. Yalnızca standart
+# kütüphane kullanılır.
+
+import json
+import codecs
+
+# Dosyadan tek seferde okunan karakter sayısı
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+class _Scanner:
+    """Dosyayı parça parça okuyup JSON değerlerini tek tek çözen yardımcı."""
+
+    def __init__(self, fp, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self._bytes_decoder = None
+
+    def _fill(self, min_size=0):
+        """Tamponun tüketilmiş kısmını atar ve dosyadan en az min_size karakter daha okur."""
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        chunk = self.fp.read(max(self.chunk_size, min_size))
+        if isinstance(chunk, bytes):
+            # İkili dosyalar (ör. Streamlit UploadedFile) artımlı olarak UTF-8 çözülür
+            if self._bytes_decoder is None:
+                self._bytes_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            text = self._bytes_decoder.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+        if not chunk:
+            self.eof = True
+        self.buffer += text
+        return bool(text) or not self.eof
+
+    def peek(self):
+        """Boşlukları atlayıp sıradaki karakteri döndürür (dosya sonunda '')."""
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        """Sıradaki karakterin char olduğunu doğrular ve tüketir."""
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def read_value(self):
+        """Sıradaki tam JSON değerini çözer ve döndürür."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Değer tamponda yarım kalmış olabilir; tampon büyüdükçe okuma da büyür (doğrusal maliyet)
+                if self.eof:
+                    raise
+                self._fill(len(self.buffer) - self.pos)
+                continue
+            # Tamponun sonunda biten bir sayı ('12' -> '1234') devam ediyor olabilir
+            if end == len(self.buffer) and not self.eof:
+                self._fill(len(self.buffer) - self.pos)
+                continue
+            self.pos = end
+            return value
+
+    def iter_container(self, open_char, close_char):
+        """Nesne veya dizinin açılışını tüketir ve her öğe için bir kez None üretir."""
+        self.expect(open_char)
+        if self.peek() == close_char:
+            self.pos += 1
+            return
+        while True:
+            yield None
+            separator = self.peek()
+            self.pos += 1
+            if separator == close_char:
+                return
+            if separator != ",":
+                raise json.JSONDecodeError(f"Expecting ',' or '{close_char}'", self.buffer, self.pos - 1)
+
+    def iter_object(self):
+        """Nesnenin anahtarlarını sırayla üretir; çağıran her anahtardan sonra değeri tüketmelidir."""
+        for _ in self.iter_container("{", "}"):
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", self.buffer, self.pos)
+            self.expect(":")
+            yield key
+
+def iter_album_json(fp, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Albüm JSON dosyasını akış halinde okur ve (yol, değer) çiftleri üretir.
+
+    Üst düzey alanlar ('name',) gibi, 'tracks' nesnesinin alanları ('tracks', 'total') gibi
+    üretilir. 'tracks' nesnesi ve 'tracks.items' dizisi önce boş birer yer tutucu ({} ve [])
+    olarak, ardından dizinin her öğesi ('tracks', 'items', sıra) yoluyla ayrı ayrı üretilir;
+    böylece bellekte aynı anda yalnızca bir parça öğesi bulunur. Belge bir nesne değilse
+    tamamı () yoluyla tek değer olarak üretilir.
+
+    Raises:
+        json.JSONDecodeError: Dosya geçerli bir JSON değilse.
+    """
+    scanner = _Scanner(fp, chunk_size)
+    if scanner.peek() != "{":
+        yield (), scanner.read_value()
+    else:
+        for key in scanner.iter_object():
+            if key != "tracks" or scanner.peek() != "{":
+                yield (key,), scanner.read_value()
+                continue
+            yield ("tracks",), {}
+            for tracks_key in scanner.iter_object():
+                if tracks_key != "items" or scanner.peek() != "[":
+                    yield ("tracks", tracks_key), scanner.read_value()
+                    continue
+                yield ("tracks", "items"), []
+                for index, _ in enumerate(scanner.iter_container("[", "]")):
+                    yield ("tracks", "items", index), scanner.read_value()
+    if scanner.peek() != "":
+        raise json.JSONDecodeError("Extra data", scanner.buffer, scanner.pos)
+
+def compact_track_item(item, keep_artists=False):
+    """
+    Parça öğesinden posterin kullandığı alanları (name, duration_ms) içeren küçük bir kopya döndürür.
+    rip.json'daki {'track': {...}} sarmalı korunur. keep_artists True ise sanatçı adları da saklanır
+    (rip.json biçiminde albüm sanatçısı ilk parçadan alınır).
+    """
+    if not isinstance(item, dict):
+        return item
+    wrapped = 'track' in item
+    track = item['track'] if wrapped else item
+    if not isinstance(track, dict):
+        return {'track': track} if wrapped else track
+    compact = {key: track[key] for key in ('name', 'duration_ms') if key in track}
+    if keep_artists and isinstance(track.get('artists'), list):
+        compact['artists'] = [{'name': a['name']} for a in track['artists'] if isinstance(a, dict) and 'name' in a]
+    return {'track': compact} if wrapped else compact
+
+def read_album_json(fp, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Albüm JSON dosyasını akış halinde okur.
+
+    Returns:
+        tuple: (album_data_raw, track_items). album_data_raw, 'tracks.items' dışındaki tüm alanları
+        içeren ham veridir; track_items ise compact_track_item ile küçültülmüş parça öğelerinin
+        listesidir ('tracks.items' yoksa None). İkisi birlikte album_model.Album.from_raw'a verilebilir.
+
+    Raises:
+        json.JSONDecodeError: Dosya geçerli bir JSON değilse.
+    """
+    album_data_raw = {}
+    track_items = None
+    for path, value in iter_album_json(fp, chunk_size):
+        if not path:
+            album_data_raw = value
+        elif len(path) == 1:
+            album_data_raw[path[0]] = value
+        elif path == ("tracks", "items") and isinstance(value, list):
+            track_items = value
+        elif len(path) == 2:
+            album_data_raw["tracks"][path[1]] = value
+        else:
+            track_items.append(compact_track_item(value, keep_artists=not track_items))
+    return album_data_raw, track_items
@@ -0,0 +1,186 @@
+# palette.py
+# Albüm kapağından baskın renkleri çıkaran modül.
+# Renkler tam boyutlu kapak yerine küçük bir önizleme (thumbnail) üzerinde hesaplanır ve
+# sonuçlar kapak piksellerinin özetine (hash) göre önbelleğe alınır; yalnızca bir kaydırıcı
+# değiştiğinde aynı kapak için palet yeniden hesaplanmaz.
+
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from PIL import Image
+import render_report
+
+try:
+    import numpy as np # İsteğe bağlı: yalnızca 'kmeans' yöntemi için gerekli
+except ImportError:
+    np = None
+
+# Paletin hesaplandığı önizlemenin en uzun kenarı (piksel)
+DEFAULT_THUMBNAIL_SIZE = 128
+
+# Varsayılan olarak döndürülen renk sayısı
+DEFAULT_COLOR_COUNT = 5
+
+# Desteklenen yöntemler:
+#   'adaptive'   - Pillow'un uyarlanabilir paleti (önceki davranış)
+#   'median_cut' - Pillow'un medyan kesme nicemlemesi
+#   'kmeans'     - NumPy ile vektörleştirilmiş k-ortalamalar (numpy yoksa 'adaptive' kullanılır)
+PALETTE_METHODS = ('adaptive', 'median_cut', 'kmeans')
+
+# Kapak özeti hesaplanırken tek seferde kopyalanan en fazla piksel baytı
+FINGERPRINT_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Önbellekte tutulacak en fazla palet sayısı
+MAX_CACHED_PALETTES = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+logger = logging.getLogger(__name__)
+
+def image_fingerprint(img):
+    """Bir PIL resminin mod, boyut ve piksel baytlarından kararlı bir özet (hex) üretir."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{img.mode}:{img.size[0]}x{img.size[1]}:".encode('ascii'))
+    # Baskı çözünürlüğündeki kapaklar için tüm piksellerin tek seferde kopyalanmaması adına satır gruplarıyla özetlenir
+    # (satırlar bitişik olduğundan özet, tüm baytların tek seferde özetlenmesiyle aynıdır)
+    width, height = img.size
+    rows_per_chunk = max(1, FINGERPRINT_CHUNK_BYTES // max(1, width * len(img.getbands())))
+    if rows_per_chunk >= height:
+        digest.update(img.tobytes())
+    else:
+        for top in range(0, height, rows_per_chunk):
+            digest.update(img.crop((0, top, width, min(height, top + rows_per_chunk))).tobytes())
+    return digest.hexdigest()
+
+# Nesne ömrü boyunca özet: id(resim) -> (zayıf referans, özet)
+_object_fingerprints = {}
+
+def object_fingerprint(img):
+    """
+    image_fingerprint'i aynı resim nesnesi için bir kez hesaplar ve nesne yaşadığı sürece saklar.
+    Poster çiziminde kapaklar yüklendikten sonra değiştirilmediği için her çizimde pikseller yeniden özetlenmez.
+    """
+    key = id(img)
+    with _cache_lock:
+        entry = _object_fingerprints.get(key)
+        if entry is not None and entry[0]() is img:
+            return entry[1]
+    digest = image_fingerprint(img)
+    try:
+        ref = weakref.ref(img, lambda _, key=key: _object_fingerprints.pop(key, None))
+    except TypeError:
+        return digest
+    with _cache_lock:
+        _object_fingerprints[key] = (ref, digest)
+    return digest
+
+def make_thumbnail(img, max_size=DEFAULT_THUMBNAIL_SIZE):
+    """Resmi en uzun kenarı max_size olacak şekilde hızlıca küçültür ve RGB'ye çevirir."""
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    width, height = img.size
+    scale = max_size / max(width, height)
+    if scale >= 1:
+        return img
+    target = (max(1, round(width * scale)), max(1, round(height * scale)))
+    # BOX filtresi kaynak piksellerin ortalamasını alır; küçültmede hem hızlı hem de renk açısından doğrudur
+    return img.resize(target, Image.Resampling.BOX)
+
+def _quantized_colors(thumbnail, palette_size, method):
+    """Pillow nicemlemesi ile (piksel sayısı, renk) çiftlerini büyükten küçüğe döndürür."""
+    if method == 'median_cut':
+        paletted = thumbnail.quantize(colors=palette_size, method=Image.Quantize.MEDIANCUT)
+    else:
+        paletted = thumbnail.convert('P', palette=Image.ADAPTIVE, colors=palette_size)
+    palette = paletted.getpalette()
+    color_counts = sorted(paletted.getcolors(), reverse=True)
+    return [(count, tuple(palette[index * 3:index * 3 + 3])) for count, index in color_counts]
+
+def _kmeans_colors(thumbnail, palette_size, iterations=12):
+    """NumPy ile k-ortalamalar kümelemesi yapar; (piksel sayısı, renk) çiftlerini büyükten küçüğe döndürür."""
+    pixels = np.asarray(thumbnail, dtype=np.float32).reshape(-1, 3)
+    # Kararlı sonuç için başlangıç merkezleri medyan kesme paletinden alınır
+    initial = [color for _, color in _quantized_colors(thumbnail, palette_size, 'median_cut')]
+    centers = np.asarray(initial, dtype=np.float32)
+    k = len(centers)
+    labels = np.zeros(len(pixels), dtype=np.int64)
+    for iteration in range(iterations):
+        # (piksel, merkez) uzaklık matrisi: |p|^2 - 2 p.c + |c|^2
+        distances = (pixels * pixels).sum(1)[:, None] - 2.0 * pixels @ centers.T + (centers * centers).sum(1)[None, :]
+        new_labels = distances.argmin(1)
+        if iteration > 0 and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, pixels)
+        nonempty = counts > 0
+        centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+    counts = np.bincount(labels, minlength=k)
+    result = [(int(counts[i]), tuple(int(round(float(c))) for c in centers[i])) for i in range(k) if counts[i] > 0]
+    return sorted(result, reverse=True)
+
+def extract_palette(img, count=DEFAULT_COLOR_COUNT, method='adaptive', thumbnail_size=DEFAULT_THUMBNAIL_SIZE, cache_key=None):
+    """
+    Bir resmin baskın renklerini, en çok kullanılandan başlayarak döndürür.
+
+    Args:
+        img (PIL.Image.Image): Albüm kapağı.
+        count (int): Döndürülecek renk sayısı.
+        method (str): PALETTE_METHODS içinden bir yöntem.
+        thumbnail_size (int): Paletin hesaplandığı önizlemenin en uzun kenarı.
+        cache_key (str or None): Resmin önceden hesaplanmış özeti; verilmezse piksellerden hesaplanır.
+
+    Returns:
+        list: (R, G, B) demetleri.
+    """
+    count = max(1, int(count))
+    if method not in PALETTE_METHODS:
+        render_report.log_event(logger, logging.WARNING, "palette_method_fallback", f"Bilinmeyen palet yöntemi '{method}'. 'adaptive' kullanılıyor.", method=method)
+        method = 'adaptive'
+    if method == 'kmeans' and np is None:
+        render_report.log_event(logger, logging.WARNING, "palette_method_fallback", "'kmeans' palet yöntemi için numpy gerekli. 'adaptive' kullanılıyor.", method=method)
+        method = 'adaptive'
+
+    key = (cache_key or image_fingerprint(img), count, method, thumbnail_size)
+    with _cache_lock:
+        colors = _cache.get(key)
+        if colors is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+        else:
+            _stats["misses"] += 1
+    render_report.count("palette_cache_hits" if colors is not None else "palette_cache_misses")
+    if colors is not None:
+        return list(colors)
+
+    thumbnail = make_thumbnail(img, thumbnail_size)
+    # Önceki davranışla uyumlu olarak palet, istenen renk sayısının iki katı (en az 10) renkle hesaplanır
+    palette_size = max(10, count * 2)
+    if method == 'kmeans':
+        color_counts = _kmeans_colors(thumbnail, palette_size)
+    else:
+        color_counts = _quantized_colors(thumbnail, palette_size, method)
+    colors = tuple(color for _, color in color_counts[:count])
+
+    with _cache_lock:
+        _cache[key] = colors
+        while len(_cache) > MAX_CACHED_PALETTES:
+            _cache.popitem(last=False)
+    return list(colors)
+
+def cache_stats():
+    """Palet önbelleğinin isabet/ıska sayaçlarını ve doluluğunu döndürür."""
+    with _cache_lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "cached_palettes": len(_cache)}
+
+def clear_cache():
+    """Palet önbelleğini ve sayaçlarını sıfırlar."""
+    with _cache_lock:
+        _cache.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
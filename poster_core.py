@@ -4,30 +4,58 @@
 
 import os
 import sys
-import re
 import math
+import logging
 import warnings
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import json # JSON işlemleri için gerekli
-from PIL import Image, ImageDraw, ImageFont
-from io import BytesIO # Gerekirse BytesIO için
+from PIL import Image, ImageDraw
+import font_manager
+import palette
+import json_stream
+import poster_layout
+import artwork_loader
+import render_report
+from render_report import RenderReport
+from poster_layout import get_artwork_size
+from album_model import Album, as_album
 
 # Fonksiyonların dışarıdan erişilebilir olması için gerekli importlar (PIL, vs.)
 # Ancak Streamlit tarafında da Pillow yüklü olmalı.
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+logger = logging.getLogger(__name__)
+
+# Poster boyutu önayarları; batch ve render_service bunları poster_core üzerinden kullanır
+SIZE_PRESETS = poster_layout.SIZE_PRESETS
+
+# Aynı girdilerden farklı pikseller üreten her çizim değişikliğinde artırılır; render_cache anahtarlarının parçasıdır
+RENDERER_VERSION = 3
+
 def resource_path(relative_path):
     """Kaynak dosyalarının mutlak yolunu alır."""
     try:
         base_path = sys._MEIPASS
     except Exception:
         base_path = os.path.abspath(".")
+        # Betik başka bir klasörden çalıştırıldıysa (ör. toplu işlem CLI'ı) modülün klasörüne bak
+        if not os.path.exists(os.path.join(base_path, relative_path)):
+            module_dir = os.path.dirname(os.path.abspath(__file__))
+            if os.path.exists(os.path.join(module_dir, relative_path)):
+                base_path = module_dir
 
     # Font klasörünün resource_path içinde olduğundan emin olun
     # Örneğin, 'fonts' klasörünüz betikle aynı dizindeyse, bu doğru olacaktır.
     # Eğer farklı bir yerdeyse, bu fonksiyonu veya font yollarını ayarlamanız gerekebilir.
     return os.path.join(base_path, relative_path)
 
+def get_font_manager():
+    """fonts/ klasörü için süreç genelinde paylaşılan font yöneticisini döndürür."""
+    return font_manager.get_font_manager(resource_path('fonts'))
+
 def read_local_json(uploaded_file):
     """Yüklenen bir Streamlit dosyasını okur ve JSON olarak ayrıştırır."""
     try:
@@ -35,48 +63,53 @@ def read_local_json(uploaded_file):
         data = json.load(uploaded_file)
         return data
     except json.JSONDecodeError:
-        print("Hata: Yüklenen dosya geçerli bir JSON dosyası değil.") # Loglama için print
+        logger.error("Hata: Yüklenen dosya geçerli bir JSON dosyası değil.", extra={"event": "invalid_json", "fields": {}})
         return None
     except Exception as e:
-        print(f"Yüklenen dosya okunurken bir hata oluştu: {e}") # Loglama için print
+        logger.error(f"Yüklenen dosya okunurken bir hata oluştu: {e}", extra={"event": "json_read_error", "fields": {"error": str(e)}})
         return None
 
-def get_colors(img):
-    """Bir resimden baskın renkleri alır."""
+def read_local_json_stream(uploaded_file):
+    """
+    Yüklenen dosyayı json_stream ile akış halinde okur; parçalardan yalnızca posterin kullandığı alanlar saklanır.
+
+    Returns:
+        tuple or None: (album_data_raw, track_items) veya okuma hatasında None.
+    """
     try:
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-
-        paletted = img.convert('P', palette=Image.ADAPTIVE, colors=10)
-        palette = paletted.getpalette()
-        color_counts = sorted(paletted.getcolors(), reverse=True)
-        colors = list()
-        for i in range(min(len(color_counts), 5)):
-            palette_index = color_counts[i][1]
-            dominant_color = palette[palette_index * 3:palette_index * 3 + 3]
-            colors.append(tuple(dominant_color))
+        return json_stream.read_album_json(uploaded_file)
+    except json.JSONDecodeError:
+        logger.error("Hata: Yüklenen dosya geçerli bir JSON dosyası değil.", extra={"event": "invalid_json", "fields": {}})
+        return None
     except Exception as e:
-        print(f"Baskın renkler alınırken hata: {e}") # Loglama için print kullanılabilir
-        colors = [(0, 0, 0)]
-    return colors
+        logger.error(f"Yüklenen dosya okunurken bir hata oluştu: {e}", extra={"event": "json_read_error", "fields": {"error": str(e)}})
+        return None
+
+def normalize_album_data(album_data_raw, texts=None, track_items=None):
+    """
+    Spotify API yanıtı veya rip.json biçimindeki ham albüm verisini create_album_poster'ın kullandığı Album nesnesine çevirir.
 
-def remove_featured(track_name):
-    """Parantez içindeki öne çıkan sanatçı bilgilerini parça adından kaldırır."""
-    if not isinstance(track_name, str):
-        return track_name
-    return re.sub(r'\s*\(.*?\)\s*', '', track_name).strip()
+    Args:
+        album_data_raw (dict): json.load veya sp.album ile elde edilen ham veri.
+        texts (dict or None): Varsayılan metinler (album_model.DEFAULT_ALBUM_TEXTS ile aynı anahtarlar).
+        track_items (list or None): read_local_json_stream ile ayrı okunan parça öğeleri.
 
-def format_time(duration_ms):
-    """Parça süresini milisaniyeden M:SS dizesine biçimlendirir."""
-    if duration_ms is None:
-        return "N/A"
+    Returns:
+        tuple: (album_model.Album, album_artwork_url). Biçim tanınmazsa (None, None).
+    """
+    album = Album.from_raw(album_data_raw, texts, track_items=track_items)
+    if album is None:
+        return None, None
+    return album, album.artwork_url
+
+def get_colors(img, count=5, method='adaptive', cache_key=None):
+    """Bir resimden baskın renkleri alır (küçük bir önizleme üzerinde hesaplanır ve önbelleğe alınır)."""
     try:
-        duration_ms = int(duration_ms)
-        seconds = (duration_ms // 1000) % 60
-        minutes = (duration_ms // (1000 * 60)) % 60
-        return f"{minutes}:{seconds:02d}"
-    except (ValueError, TypeError):
-        return "N/A"
+        colors = palette.extract_palette(img, count=count, method=method, cache_key=cache_key)
+    except Exception as e:
+        render_report.log_event(logger, logging.ERROR, "palette_error", f"Baskın renkler alınırken hata: {e}", error=str(e))
+        colors = [(0, 0, 0)]
+    return colors
 
 # Font Seçenekleri (Çizim mantığına ait olduğu için burada kalabilir)
 fonts = {
@@ -89,12 +122,13 @@ fonts = {
 # Ana poster oluşturma fonksiyonu
 # Bu fonksiyon, albüm verilerini, albüm kapağı resmini (PIL Image nesnesi olarak)
 # ve GUI'den gelen seçenekleri alacak.
-def create_album_poster(album_data, albumart_image, options):
+def create_album_poster(album_data, albumart_image, options, report=None):
     """
     Creates an album poster image based on provided data and options.
 
     Args:
-        album_data (dict): Dictionary containing album information (name, artist, tracks, etc.).
+        album_data (album_model.Album or dict): Normalized album (see normalize_album_data), or a legacy
+            dictionary with 'name', 'artist', 'copyright' and 'tracks' keys.
         albumart_image (PIL.Image.Image or None): The album artwork image object, or None.
         options (dict): Dictionary containing poster creation options:
             - 'poster_size' (str): "A4", "A3", or "A2".
@@ -103,377 +137,364 @@ def create_album_poster(album_data, albumart_image, options):
             - 'include_copyright' (bool): Whether to include copyright info.
             - 'copyright_bottom_padding_px' (int): Padding from the bottom for copyright.
             - 'tracklist_horizontal_offset' (int): Horizontal offset for the tracklist start position.
+            - 'palette_colors' (int): Number of dominant colour swatches to draw (default 5).
+            - 'palette_method' (str): 'adaptive', 'median_cut' or 'kmeans' (needs numpy).
+            - 'tracklist_overflow' (str): 'clip' (default; columns past the right edge are dropped),
+              'dense' (rows per column and font size are chosen so every track fits on one poster) or
+              'pages' (only the first page is drawn here; use create_album_posters for all pages).
+            - 'min_tracklist_font_size' (int): Smallest tracklist size 'dense' and 'pages' may use (default 6).
+        report (render_report.RenderReport or None): If given, phase timings, cache hits, sizing
+            iterations, the chosen font sizes and fallback events are recorded into it. A report is
+            also collected when a metrics hook is registered (render_report.add_hook).
 
     Returns:
         PIL.Image.Image or None: The created poster image object, or None if creation fails.
     """
+    if report is None and render_report.hooks_enabled():
+        report = RenderReport()
+    if report is None:
+        return _create_album_poster(album_data, albumart_image, options)
+
+    fonts_cache = get_font_manager()
+    font_stats = fonts_cache.stats()
+    with render_report.activate(report):
+        poster = _create_album_poster(album_data, albumart_image, options)
+    after = fonts_cache.stats()
+    report.count("font_cache_hits", after["hits"] - font_stats["hits"])
+    report.count("font_cache_misses", after["misses"] - font_stats["misses"])
+    report.finish()
+    render_report.publish(report)
+    return poster
+
+def _create_album_poster(album_data, albumart_image, options):
+    """create_album_poster'ın ölçümden bağımsız gövdesi."""
     if not album_data:
-        print("Poster oluşturmak için albüm verisi sağlanmadı.")
+        render_report.log_event(logger, logging.ERROR, "no_album_data", "Poster oluşturmak için albüm verisi sağlanmadı.")
         return None
 
-    # Seçenekleri al
-    poster_size_key = options.get('poster_size', 'A4')
-    tracks_per_column = options.get('tracks_per_column', 6)
-    tracklist_font_size_search_range = options.get('tracklist_font_size_search_range', (10, 20))
-    include_copyright = options.get('include_copyright', True)
-    copyright_bottom_padding_px = options.get('copyright_bottom_padding_px', 20)
-    tracklist_horizontal_offset = options.get('tracklist_horizontal_offset', 0) # Yeni seçenek, varsayılan 0
-
-    size_presets = {
-        "A4": (720, 960),
-        "A3": (1024, 1365),
-        "A2": (1440, 1920),
-    }
-
-    poster_width, poster_height = size_presets.get(poster_size_key, size_presets["A4"])
-    scale_factor = poster_width / 720 # 720 A4'e göre ölçeklendirme
+    # Albüm verilerini çıkar (sözlük verildiyse bir kez Album'e normalleştirilir)
+    album = as_album(album_data)
+    if options.get('tracklist_overflow') == 'pages' and 'tracklist_page' not in options:
+        album, options = paginate(album, options)[0]
+
+    # Ölçümler ve konumlar yerleşim aşamasında hesaplanır; yalnızca kaydırma seçenekleri
+    # değiştiyse önbellekteki plan yeniden ölçülmeden taşınır
+    with render_report.phase("layout"):
+        plan = get_layout(album, options)
+    report = render_report.current()
+    if report is not None:
+        report.sizes.update(plan_sizes(plan))
+    with render_report.phase("render"):
+        return render_layout(plan, albumart_image, options)
+
+def paginate(album_data, options):
+    """
+    Albümü 'pages' modunda her biri tek postere sığan sayfalara böler (bkz. poster_layout.paginate_tracks).
 
-    # Ölçeklendirilmiş boşluk değerleri
-    scaled_column_spacing = int(40 * scale_factor)
-    scaled_name_time_spacing = int(25 * scale_factor)
-    scaled_copyright_bottom_padding = int(copyright_bottom_padding_px * scale_factor)
-    scaled_copyright_right_padding = int(60 * scale_factor)
+    Returns:
+        list: (sayfa albümü, sayfa seçenekleri) çiftleri. Sayfa albümü aynı Track nesnelerinin bir dilimini taşır;
+        sayfa seçeneklerinde kolon başına satır sayısı sayfalamanın seçtiği değerdir ve 'tracklist_page'
+        (sayfa numarası, sayfa sayısı) eklenir.
+        'pages' modu dışında tek çift (albüm, seçenekler) döndürülür.
+    """
+    album = as_album(album_data)
+    if options.get('tracklist_overflow') != 'pages':
+        return [(album, options)]
+    pagination = poster_layout.paginate_tracks(album, options, get_font_manager(), font_paths())
+    page_count = len(pagination.pages)
+    if page_count > 1:
+        render_report.log_event(logger, logging.INFO, "tracklist_paginated", f"Tracklist {len(pagination.pages)} sayfaya bölündü.",
+                                pages=len(pagination.pages), tracks_per_column=pagination.tracks_per_column)
+    return [(Album(album.name, album.artist, album.copyright, album.tracks[first:last], album.artwork_url),
+             dict(options, tracks_per_column=pagination.tracks_per_column, tracklist_page=(number, page_count)))
+            for number, (first, last) in enumerate(pagination.pages, 1)]
+
+def create_album_posters(album_data, albumart_image, options, report=None):
+    """
+    Creates one poster per page. With 'tracklist_overflow': 'pages' the tracklist is split into pages that
+    each fit on a poster (see paginate); in every other mode the list has a single poster. Pages share the
+    artwork, header and palette, so the header layer is drawn once and reused from the layer cache.
 
-    # Albüm verilerini çıkar
-    album_name = album_data.get("name", "Bilinmeyen Albüm")
-    album_artist = album_data.get("artist", "Bilinmeyen Sanatçı") # GUI'den formatlanmış gelecek
-    album_copyright = album_data.get("copyright", "Telif Hakkı Bilgisi Yok") # GUI'den formatlanmış gelecek
-    tracks_list = album_data.get("tracks", []) # GUI'den formatlanmış gelecek
+    Returns:
+        list: PIL.Image.Image pages (None for pages that could not be created).
+    """
+    if not album_data:
+        return [create_album_poster(album_data, albumart_image, options, report=report)]
+    return [create_album_poster(page, albumart_image, page_options, report=report)
+            for page, page_options in paginate(album_data, options)]
+
+def plan_sizes(plan):
+    """Planda seçilen poster ve font boyutlarını (piksel) sözlük olarak döndürür."""
+    return {
+        "poster": list(plan.size),
+        "album_name_px": plan.album_name.font.size,
+        "artist_px": plan.artist.font.size,
+        "tracklist": plan.tracklist_size,
+        "tracklist_px": plan.tracks[0].font.size if plan.tracks else None,
+        "copyright_px": plan.copyright.font.size if plan.copyright is not None else None,
+        "columns": len(plan.columns),
+        "hidden_tracks": plan.hidden_tracks,
+    }
 
+def font_paths():
+    """Her metin rolü ('albumname', 'albumartist', 'tracklist', 'copyright') için font dosyasının yolunu döndürür."""
+    return {role: resource_path('fonts/' + name.lower().replace(" ", "") + '.otf') for role, name in fonts.items()}
 
-    poster = Image.new("RGB", (poster_width, poster_height), color=(255, 255, 255))
-    posterdraw = ImageDraw.Draw(poster)
+def get_layout(album_data, options):
+    """Albüm ve seçenekler için poster_layout.LayoutPlan'ı (önbellekten veya hesaplayarak) döndürür; çizim yapmaz."""
+    return poster_layout.get_layout(as_album(album_data), options, get_font_manager(), font_paths())
 
-    # Albüm kapağını yapıştır
-    if albumart_image:
-        try:
-            # Gelen resmin doğru boyutta olduğundan emin ol (GUI'de boyutlandırıldı)
-            # Eğer GUI'de boyutlandırılmadıysa burada boyutlandırılabilir:
-            # albumart_image_resized = albumart_image.resize((int(600 * scale_factor), int(600 * scale_factor)))
-            poster.paste(albumart_image, (int(60 * scale_factor), int(60 * scale_factor)))
-        except Exception as e:
-            print(f"Albüm kapağı yapıştırılırken hata: {e}")
+def variant_poster_size(size, dpi=None):
+    """render_variants'a verilen boyutu poster_size değerine çevirir; dpi verilmişse kâğıt adları baskı boyutuna dönüşür."""
+    if dpi and isinstance(size, str) and size in poster_layout.PAPER_SIZES_MM:
+        return poster_layout.print_size_key(size, dpi)
+    return size
 
+def render_variants(album_data, artwork_source, sizes=("A4", "A3", "A2"), options=None, dpi=None, workers=None):
+    """
+    Aynı albümün posterini birden çok boyutta tek çağrıda oluşturur.
 
-    # Çizgi ayırıcıyı çiz
-    posterdraw.rectangle([int(60 * scale_factor), int(740 * scale_factor), int(660 * scale_factor), int(745 * scale_factor)], fill=(0, 0, 0))
-
-    # Fontları yükle
-    font_name_path = resource_path('fonts/' + fonts["albumname"].lower() + '.otf')
-    font_artist_path = resource_path('fonts/' + fonts["albumartist"].lower() + '.otf')
-    tracklist_font_path_base = fonts["tracklist"].lower().replace(" ", "")
-    tracklist_font_path = resource_path(f'fonts/{tracklist_font_path_base}.otf')
-    font_copyright_path = resource_path('fonts/' + fonts["copyright"].lower() + '.otf')
-
-    # Albüm adı fontu
-    cursize_name = int(55 * scale_factor)
-    font_name = None
-    if os.path.exists(font_name_path):
-        try:
-            font_name = ImageFont.truetype(font_name_path, cursize_name)
-            # Albüm adı uzunsa boyutu ayarla
-            uzunluk_siniri = 14
-            if len(album_name) > uzunluk_siniri:
-                 try:
-                     length_name_piksel = font_name.getlength(album_name)
-                     while length_name_piksel > int(400 * scale_factor):
-                         cursize_name -= 1
-                         if cursize_name <= int(10 * scale_factor):
-                             break
-                         font_name = ImageFont.truetype(font_name_path, cursize_name)
-                         length_name_piksel = font_name.getlength(album_name)
-                 except Exception as e:
-                     print(f"Albüm adı font boyutu ayarlanırken hata: {e}. Varsayılan boyut kullanılıyor.")
-                     cursize_name = int(30 * scale_factor)
-                     try:
-                          font_name = ImageFont.truetype(font_name_path, cursize_name)
-                     except:
-                          print(f"'{font_name_path}' fontu varsayılan boyutla yüklenemedi. Varsayılana dönülüyor.")
-                          font_name = ImageFont.load_default()
-
-        except Exception as e:
-            print(f"Albüm adı fontu '{font_name_path}' yüklenirken hata: {e}. Varsayılana dönülüyor.")
-            font_name = ImageFont.load_default()
-    else:
-        print(f"Albüm adı fontu '{font_name_path}' bulunamadı. Varsayılana dönülüyor.")
-        font_name = ImageFont.load_default()
+    Boyuttan bağımsız işler bir kez yapılır: albüm bir kez normalleştirilir, kapak bir kez çözülüp
+    her hedef boyuta ayrı ayrı küçültülür ve baskın renkler bir kez (en küçük kapaktan) çıkarılıp
+    tüm boyutlarda kullanılır. Böylece tüm boyutlarda aynı renk kutuları çizilir.
 
+    Args:
+        album_data (album_model.Album or dict): Normalleştirilmiş albüm veya eski sözlük biçimi.
+        artwork_source: Kapak (dosya yolu, bayt dizisi, dosya benzeri nesne veya PIL resmi) ya da None.
+        sizes (iterable): Boyutlar; "A4" gibi ön ayar, "A2@300dpi" gibi baskı boyutu veya (genişlik, yükseklik).
+        options (dict or None): create_album_poster seçenekleri ('poster_size' yok sayılır).
+        dpi (float or None): Verilirse kâğıt adları bu çözünürlükteki baskı boyutuna çevrilir.
+        workers (int or None): 1'den büyükse boyutlar bu kadar iş parçacığında paralel çizilir.
 
-    # Sanatçı fontu
-    font_artist = None
-    if os.path.exists(font_artist_path):
+    Returns:
+        dict: sizes'taki her öğe (verilen sırayla) -> PIL.Image.Image. Albüm verisi yoksa boş sözlük.
+    """
+    if not album_data:
+        render_report.log_event(logger, logging.ERROR, "no_album_data", "Poster oluşturmak için albüm verisi sağlanmadı.")
+        return {}
+    album = as_album(album_data)
+    options = dict(options or {})
+    sizes = list(dict.fromkeys(sizes))
+    poster_sizes = {size: variant_poster_size(size, dpi) for size in sizes}
+
+    # Yerleşim planları (font yöneticisi ve font yolları tüm boyutlarda paylaşılır)
+    fonts_cache = get_font_manager()
+    paths = font_paths()
+    plans = {size: poster_layout.get_layout(album, dict(options, poster_size=poster_size), fonts_cache, paths)
+             for size, poster_size in poster_sizes.items()}
+
+    # Kapak bir kez çözülür ve her hedef boyuta bir kez küçültülür
+    artworks = {}
+    colors = None
+    if artwork_source is not None:
         try:
-             font_artist = ImageFont.truetype(font_artist_path, int(25 * scale_factor))
+            resized = artwork_loader.prepare_artwork_variants(
+                artwork_source, [get_artwork_size(poster_size) for poster_size in poster_sizes.values()])
         except Exception as e:
-            print(f"Sanatçı fontu '{font_artist_path}' yüklenirken hata: {e}. Varsayılana dönülüyor.")
-            font_artist = ImageFont.load_default()
+            render_report.log_event(logger, logging.WARNING, "artwork_decode_error", f"Albüm kapağı açılamadı: {e}", error=str(e))
+            resized = {}
+        artworks = {size: resized.get(tuple(get_artwork_size(poster_size))) for size, poster_size in poster_sizes.items()}
+        if resized:
+            smallest = min(resized.values(), key=lambda img: img.size[0] * img.size[1])
+            swatch_count = len(next(iter(plans.values())).swatches)
+            colors = get_colors(smallest, count=swatch_count, method=options.get('palette_method', 'adaptive'),
+                                cache_key=palette.object_fingerprint(smallest))
+
+    def render(size):
+        return render_layout(plans[size], artworks.get(size), options, colors)
+
+    if workers and workers > 1 and len(sizes) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(sizes))) as executor:
+            posters = list(executor.map(render, sizes))
     else:
-         print(f"Sanatçı fontu '{font_artist_path}' bulunamadı. Varsayılana dönülüyor.")
-         font_artist = ImageFont.load_default()
-
-    # Telif hakkı fontu
-    font_copyright = None
-    if os.path.exists(font_copyright_path):
+        posters = [render(size) for size in sizes]
+    return dict(zip(sizes, posters))
+
+# Katman önbellekleri: üst katman (kapak, ayırıcı, renkler, albüm adı, sanatçı) albüm ve poster boyutuna,
+# alt bant (tracklist ve telif hakkı) ise yalnızca kendi metinlerine bağlıdır. Tracklist ayarları
+# değiştiğinde üst katman yeniden çizilmez; yalnızca alt bant çizilip birleştirilir.
+MAX_CACHED_HEADER_LAYERS = 8
+MAX_CACHED_BAND_LAYERS = 16
+
+_header_layers = OrderedDict() # anahtar -> (bant sınırı, üst katman resmi)
+_band_layers = OrderedDict() # anahtar -> alt bant resmi
+_layers_lock = threading.Lock()
+_layer_stats = {"header_hits": 0, "header_misses": 0, "band_hits": 0, "band_misses": 0, "full_renders": 0}
+
+def _lru_get(cache, key, hit_counter, miss_counter):
+    """Katman önbelleğinden değeri alır ve sayaçları günceller."""
+    with _layers_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            _layer_stats[hit_counter] += 1
+        else:
+            _layer_stats[miss_counter] += 1
+    render_report.count(hit_counter if value is not None else miss_counter)
+    return value
+
+def _lru_put(cache, key, value, max_items):
+    """Katmanı önbelleğe ekler; kapasite aşıldıysa en eskisini çıkarır."""
+    with _layers_lock:
+        cache[key] = value
+        while len(cache) > max_items:
+            cache.popitem(last=False)
+
+def _run_bbox(fonts_cache, run):
+    """Metin parçasının çizildiğinde kaplayacağı (sol, üst, sağ, alt) kutuyu döndürür."""
+    font = poster_layout.load_font(fonts_cache, run.font)
+    kwargs = {"anchor": run.anchor} if run.anchor else {}
+    left, top, right, bottom = font.getbbox(run.text, **kwargs)
+    return (run.x + left, run.y + top, run.x + right, run.y + bottom)
+
+def _draw_run(draw, fonts_cache, run, offset_y=0):
+    """Tek bir metin parçasını plandaki fontla çizer."""
+    kwargs = {"anchor": run.anchor} if run.anchor else {}
+    draw.text((run.x, run.y - offset_y), run.text, font=poster_layout.load_font(fonts_cache, run.font), fill=(0, 0, 0), **kwargs)
+
+def _draw_header(draw, poster, plan, albumart_image, palette_method, artwork_key, fonts_cache, colors=None):
+    """Kapağı, ayırıcıyı, albüm adını, renk kutularını ve sanatçıyı çizer; colors verilmişse renkler yeniden hesaplanmaz."""
+    # Albüm kapağını yapıştır
+    if albumart_image:
         try:
-            font_copyright = ImageFont.truetype(font_copyright_path, int(10 * scale_factor))
+            # Gelen resmin doğru boyutta olduğundan emin ol (GUI'de boyutlandırıldı)
+            poster.paste(albumart_image, (plan.artwork_box.x0, plan.artwork_box.y0))
         except Exception as e:
-             print(f"Telif hakkı fontu '{font_copyright_path}' yüklenirken hata: {e}. Varsayılana dönülüyor.")
-             font_copyright = ImageFont.load_default()
-    else:
-         print(f"Telif hakkı fontu '{font_copyright_path}' bulunamadı. Varsayılana dönülüyor.")
-         font_copyright = ImageFont.load_default()
-
-
-    # Tracklist font boyutu hesaplama ve font yükleme
-    total_tracks_count = len(tracks_list)
-    bestsize = 0
-    font_tracks = None
-    font_times = None
-
-    if total_tracks_count == 0:
-         print("Tracklist'te görüntülenecek parça yok.")
-         # Parça yoksa varsayılan veya yedek font/boyut ayarla
-         if os.path.exists(tracklist_font_path):
-             try:
-                 bestsize = max(1, tracklist_font_size_search_range[0])
-                 font_tracks = ImageFont.truetype(tracklist_font_path, int(bestsize * scale_factor))
-                 font_times = ImageFont.truetype(tracklist_font_path, int(bestsize * scale_factor))
-             except Exception as e:
-                 print(f"Boş tracklist için tracklist fontu yüklenirken hata (min boyut): {e}. Varsayılana dönülüyor.")
-                 font_tracks = ImageFont.load_default()
-                 font_times = ImageFont.load_default()
-                 bestsize = 10
-         else:
-             print(f"Tracklist fontu '{tracklist_font_path}' bulunamadı. Boş tracklist için varsayılana dönülüyor.")
-             font_tracks = ImageFont.load_default()
-             font_times = ImageFont.load_default()
-             bestsize = 10
-    else:
-        # Dinamik font boyutlandırma
-        available_vertical_space = int(920 * scale_factor) - int(775 * scale_factor)
-        min_size_to_try = max(1, tracklist_font_size_search_range[0])
-        max_size_to_try = tracklist_font_size_search_range[1]
-
-        bestsize = 0
-
-        if not os.path.exists(tracklist_font_path):
-             print(f"Tracklist fontu '{tracklist_font_path}' bulunamadı. Boyutlandırma için varsayılana dönülüyor.")
-             font_tracks_test = ImageFont.load_default()
-             bestsize = 10
-             try:
-                  _, top, _, bottom = font_tracks_test.getbbox("AgjypQ")
-                  line_height_estimate = bottom - top + int(bestsize * scale_factor) * 0.8
-             except:
-                  line_height_estimate = int(bestsize * scale_factor) * 1.8
-        else:
-            for cursize_tracks in range(max_size_to_try, min_size_to_try -1, -1):
-                 try:
-                     font_tracks_test = ImageFont.truetype(tracklist_font_path, int(cursize_tracks * scale_factor))
-                     _, top, _, bottom = font_tracks_test.getbbox("AgjypQ")
-                     temp_line_height = bottom - top + int(cursize_tracks * scale_factor) * 0.8
-                     vertical_space_this_size = tracks_per_column * temp_line_height
-
-                     if vertical_space_this_size <= available_vertical_space * 1.05:
-                         font_times_test_current_size = ImageFont.truetype(tracklist_font_path, int(cursize_tracks * scale_factor))
-                         max_name_width_overall_for_size = 0
-                         for track_info in tracks_list:
-                             # Adapt based on expected keys from different JSON structures
-                             if 'track' in track_info and isinstance(track_info['track'], dict): # For 'rip.json' structure
-                                 track_name = track_info['track'].get('name', 'Unknown Track Name')
-                             else: # For 'spotify.json' structure (or direct track list)
-                                 track_name = track_info.get('name', 'Unknown Track Name')
-                             display_track_name = remove_featured(track_name)
-                             try:
-                                 max_name_width_overall_for_size = max(max_name_width_overall_for_size, font_tracks_test.getlength(display_track_name))
-                             except:
-                                 max_name_width_overall_for_size = max(max_name_width_overall_for_size, len(display_track_name) * int(cursize_tracks * scale_factor) * 0.6)
-
-                         max_time_width_for_spacing = 0
-                         try:
-                             max_time_width_for_spacing = font_times_test_current_size.getlength("00:00")
-                         except:
-                             max_time_width_for_spacing = int(cursize_tracks * scale_factor) * 3
-
-                         estimated_columns = math.ceil(total_tracks_count / (tracks_per_column if tracks_per_column > 0 else 1))
-                         if total_tracks_count > 0 and estimated_columns <= 0:
-                             estimated_columns = 1
-
-                         estimated_total_horizontal_width = (max_name_width_overall_for_size + scaled_name_time_spacing + max_time_width_for_spacing) * estimated_columns + scaled_column_spacing * max(0, estimated_columns - 1)
-                         available_horizontal_space = int(720 * scale_factor) - int(60 * scale_factor) - int(60 * scale_factor)
-
-                         if estimated_total_horizontal_width <= available_horizontal_space * 1.05:
-                             bestsize = cursize_tracks
-                             break
-                 except Exception as e:
-                     # print(f"Boyutlandırma sırasında font veya metrik hesaplama hatası (boyut {cursize_tracks}): {e}. Aramaya devam ediliyor.")
-                     continue
-
-            if bestsize == 0:
-                 print("Belirtilen aralıkta istenen kolon başına parça sayısına dikey ve yatay olarak uyan uygun bir font boyutu bulunamadı. Varsayılan boyut kullanılıyor.")
-                 bestsize = 10
-
-        # Nihai tracklist fontlarını yükle
-        if os.path.exists(tracklist_font_path):
-            try:
-                font_tracks = ImageFont.truetype(tracklist_font_path, int(bestsize * scale_factor))
-                font_times = ImageFont.truetype(tracklist_font_path, int(bestsize * scale_factor))
-            except Exception as e:
-                print(f"Nihai tracklist fontu '{tracklist_font_path}' yüklenirken hata: {e}. Varsayılana dönülüyor.")
-                font_tracks = ImageFont.load_default()
-                font_times = ImageFont.load_default()
-        else:
-            print(f"Tracklist fontu '{tracklist_font_path}' bulunamadı. Varsayılana dönülüyor.")
-            font_tracks = ImageFont.load_default()
-            font_times = ImageFont.load_default()
+            render_report.log_event(logger, logging.WARNING, "artwork_paste_error", f"Albüm kapağı yapıştırılırken hata: {e}", error=str(e))
 
-    # Nihai fontlarla satır yüksekliği ve maksimum zaman genişliğini yeniden hesapla
-    line_height_estimate = 0
-    max_time_width = 0
-
-    try:
-        if font_tracks and hasattr(font_tracks, 'getbbox'):
-            _, top, _, bottom = font_tracks.getbbox("AgjypQ")
-            vertical_line_spacing = int(bestsize * scale_factor) * 0.8
-            line_height_estimate = bottom - top + vertical_line_spacing
-        else:
-             line_height_estimate = int(bestsize * scale_factor) * 1.8
-    except Exception as e:
-        print(f"Çizim için satır yüksekliği tahmini yeniden hesaplanırken hata: {e}. Önceki tahmin kullanılıyor.")
-
-    try:
-        if font_times and hasattr(font_times, 'getlength'):
-             max_time_width = font_times.getlength("00:00")
-        else:
-             max_time_width = int(bestsize * scale_factor) * 3
-    except Exception as e:
-        print(f"Çizim için maksimum zaman genişliği tahmini yeniden hesaplanırken hata: {e}. Önceki tahmin kullanılıyor.")
-
-
-    # --- DİNAMİK KOLONLU TRACKLİST ÇİZİMİ ---
-    # Başlangıç X koordinatına yatay ofseti ekle
-    start_x = int(60 * scale_factor) + tracklist_horizontal_offset
-    start_y = int(775 * scale_factor)
-
-    cur_x = start_x
-    tracks_to_process = list(tracks_list)
-    current_column = 0
-
-    if not tracks_list:
-        print("Çizilecek parça yok.")
-    else:
-        linesoftracks_for_drawing = tracks_per_column
-        if linesoftracks_for_drawing <= 0:
-             linesoftracks_for_drawing = 1
-             print("Kolon başına parça sayısı 0 veya daha az olarak ayarlanmıştı. 1 parça/kolon kullanılıyor.")
-
-        while tracks_to_process:
-            column_tracks_data = []
-            max_name_width_in_current_column = 0
-            tracks_for_this_column = tracks_to_process[:min(linesoftracks_for_drawing, len(tracks_to_process))]
-
-            if not tracks_for_this_column:
-                break
-
-            # --- 1. Geçiş: Mevcut kolon için verileri topla ve maksimum isim genişliğini bul ---
-            for track_info in tracks_for_this_column:
-                # Adapt based on expected keys from different JSON structures
-                if 'track' in track_info and isinstance(track_info['track'], dict): # For 'rip.json' structure
-                    track_name = track_info['track'].get('name', 'Unknown Track Name')
-                    duration_ms = track_info['track'].get('duration_ms')
-                else: # For 'spotify.json' structure (or direct track list)
-                    track_name = track_info.get('name', 'Unknown Track Name')
-                    duration_ms = track_info.get('duration_ms')
-
-                display_track_name = remove_featured(track_name)
-                formatted_duration = format_time(duration_ms)
-
-                try:
-                    if font_tracks and hasattr(font_tracks, 'getlength'):
-                         current_name_width = font_tracks.getlength(display_track_name)
-                    else:
-                         current_name_width = len(display_track_name) * int(bestsize * scale_factor) * 0.6
-                except Exception as e:
-                    print(f"Çizim geçişi sırasında parça adı '{display_track_name}' için genişlik alınırken hata: {e}. Tahmin ediliyor.")
-                    current_name_width = len(display_track_name) * int(bestsize * scale_factor) * 0.6
-
-                max_name_width_in_current_column = max(max_name_width_in_current_column, current_name_width)
-
-                column_tracks_data.append({
-                    "name": display_track_name,
-                    "time": formatted_duration
-                })
-
-            # --- 2. Geçiş: Hesaplanan max_name_width kullanarak kolonu çiz ---
-            for i, track_data in enumerate(column_tracks_data):
-                text_y = start_y + i * line_height_estimate
-                name_x = cur_x
-                if font_tracks:
-                     posterdraw.text((name_x, text_y), track_data["name"], font=font_tracks, fill=(0, 0, 0))
-
-                time_x = cur_x + max_name_width_in_current_column + scaled_name_time_spacing
-                if font_times:
-                     posterdraw.text((time_x, text_y), track_data["time"], font=font_times, fill=(0, 0, 0))
-
-            tracks_to_process = tracks_to_process[len(tracks_for_this_column):]
-            column_drawn_width = max_name_width_in_current_column + scaled_name_time_spacing + max_time_width
-            cur_x += column_drawn_width + scaled_column_spacing
-            current_column += 1
+    # Çizgi ayırıcıyı çiz
+    draw.rectangle(list(plan.divider), fill=(0, 0, 0))
 
     # --- Albüm Adı, Sanatçı ve Renkleri Çiz ---
-    if font_name:
-        posterdraw.text((int(65 * scale_factor), int(725 * scale_factor)),
-                        album_name,
-                        font=font_name,
-                        fill=(0, 0, 0),
-                        anchor='ls')
-    else:
-        print("Albüm adı fontu yüklenmedi, albüm adı çizilemiyor.")
+    _draw_run(draw, fonts_cache, plan.album_name)
 
     if albumart_image:
-        domcolors = get_colors(albumart_image)
-        x = int(660 * scale_factor)
-        rectanglesize = int(30 * scale_factor)
-        for i in domcolors:
-            if isinstance(i, tuple) and len(i) == 3:
-                posterdraw.rectangle([(x - rectanglesize, int(670 * scale_factor)), (x, int(670 * scale_factor) + rectanglesize)],
-                                     fill=(i))
-            x -= rectanglesize
-
-    if font_artist:
-        posterdraw.text((int(660 * scale_factor), int(725 * scale_factor)),
-                        album_artist,
-                        font=font_artist,
-                        fill=(0, 0, 0),
-                        anchor='rs')
-    else:
-         print("Sanatçı fontu yüklenmedi, albüm sanatçısı çizilemiyor.")
+        with render_report.phase("palette"):
+            domcolors = colors if colors is not None else get_colors(albumart_image, count=len(plan.swatches), method=palette_method, cache_key=artwork_key)
+        for color, rect in zip(domcolors, plan.swatches):
+            if isinstance(color, tuple) and len(color) == 3:
+                draw.rectangle([(rect.x0, rect.y0), (rect.x1, rect.y1)], fill=color)
+
+    _draw_run(draw, fonts_cache, plan.artist)
+
+def _draw_band(draw, plan, fonts_cache, offset_y=0):
+    """Tracklist ve telif hakkı metnini çizer; offset_y bandın posterdeki üst kenarıdır."""
+    # Tracklist (satır başına ad ve süre); aynı font için nesne bir kez alınır
+    if plan.tracks:
+        font_tracks = poster_layout.load_font(fonts_cache, plan.tracks[0].font)
+        for run in plan.tracks:
+            draw.text((run.x, run.y - offset_y), run.text, font=font_tracks, fill=(0, 0, 0))
 
     # Telif hakkı metnini alta çiz
-    if include_copyright and album_copyright and album_copyright != "Telif Hakkı Bilgisi Yok":
+    if plan.copyright is not None:
         try:
-            if font_copyright and hasattr(font_copyright, 'getbbox'):
-                _, top, _, bottom = font_copyright.getbbox(album_copyright)
-                copyright_text_height = bottom - top
-            else:
-                copyright_text_height = int(10 * scale_factor) * 1.2
-
-            copyright_y_position = poster_height - scaled_copyright_bottom_padding - copyright_text_height
-
-            if font_copyright and hasattr(font_copyright, 'getlength'):
-                copyright_width = font_copyright.getlength(album_copyright)
-            else:
-                copyright_width = len(album_copyright) * int(10 * scale_factor) * 0.6
+            _draw_run(draw, fonts_cache, plan.copyright, offset_y)
+        except Exception as e:
+            render_report.log_event(logger, logging.WARNING, "copyright_draw_error", f"Telif hakkı metni çizilirken hata: {e}", error=str(e))
+
+def _header_bottom(plan, fonts_cache):
+    """Üst katmanın çizdiği en alt piksel satırının bir altını döndürür."""
+    bottom = max(plan.divider.y1 + 1, plan.artwork_box.y1, max(rect.y1 + 1 for rect in plan.swatches))
+    for run in (plan.album_name, plan.artist):
+        # Kesirli konumlar kenar yumuşatmada bir piksel taşabilir
+        bottom = max(bottom, math.ceil(_run_bbox(fonts_cache, run)[3]) + 1)
+    return bottom
+
+def _band_top(plan, fonts_cache):
+    """Alt bandın çizdiği en üst piksel satırını döndürür (yalnızca ilk satırdaki parçalar ölçülür)."""
+    top = plan.size[1]
+    if plan.tracks:
+        first_row_y = min(run.y for run in plan.tracks)
+        for run in plan.tracks:
+            if run.y == first_row_y and run.text:
+                top = min(top, math.floor(_run_bbox(fonts_cache, run)[1]) - 1)
+    if plan.copyright is not None and plan.copyright.text:
+        top = min(top, math.floor(_run_bbox(fonts_cache, plan.copyright)[1]) - 1)
+    return top
+
+def _render_single_canvas(plan, albumart_image, palette_method, artwork_key, fonts_cache, colors=None):
+    """Katmanlar ayrılamadığında (alt bant üst katmana taşıyorsa) posteri tek tuvalde çizer."""
+    poster = Image.new("RGB", plan.size, color=(255, 255, 255))
+    draw = ImageDraw.Draw(poster)
+    _draw_header(draw, poster, plan, albumart_image, palette_method, artwork_key, fonts_cache, colors)
+    _draw_band(draw, plan, fonts_cache)
+    return poster
 
-            copyright_x_position = poster_width - scaled_copyright_right_padding - copyright_width
+def render_layout(plan, albumart_image, options=None, colors=None):
+    """
+    Yerleşim planını boyar.
 
-            posterdraw.text((copyright_x_position, copyright_y_position),
-                            album_copyright,
-                            font=font_copyright,
-                            fill=(0, 0, 0))
+    Poster iki katmandan birleştirilir: önbellekteki üst katman (kapak, ayırıcı, renk kutuları,
+    albüm adı ve sanatçı) ve önbellekteki veya yeniden çizilen alt bant (tracklist ve telif hakkı).
 
-        except Exception as e:
-            print(f"Telif hakkı metni çizilirken hata: {e}")
+    Args:
+        plan (poster_layout.LayoutPlan): get_layout ile elde edilen plan.
+        albumart_image (PIL.Image.Image or None): Albüm kapağı (get_artwork_size boyutunda).
+        options (dict or None): Yalnızca 'palette_method' kullanılır.
+        colors (list or None): Önceden hesaplanmış baskın renkler; verilmezse kapaktan çıkarılır.
 
+    Returns:
+        PIL.Image.Image: Poster.
+    """
+    options = options or {}
+    palette_method = options.get('palette_method', 'adaptive')
+    fonts_cache = get_font_manager()
+    artwork_key = palette.object_fingerprint(albumart_image) if albumart_image else None
+    poster_width, poster_height = plan.size
+
+    # Üst katman
+    header_key = (plan.size, plan.artwork_box, plan.divider, plan.album_name, plan.artist, plan.swatches,
+                  artwork_key, palette_method, tuple(colors) if colors is not None else None)
+    header = _lru_get(_header_layers, header_key, "header_hits", "header_misses")
+    if header is None:
+        split_y = min(_header_bottom(plan, fonts_cache), poster_height)
+        with render_report.phase("header"):
+            header_image = Image.new("RGB", (poster_width, split_y), color=(255, 255, 255))
+            _draw_header(ImageDraw.Draw(header_image), header_image, plan, albumart_image, palette_method, artwork_key, fonts_cache, colors)
+        header = (split_y, header_image)
+        _lru_put(_header_layers, header_key, header, MAX_CACHED_HEADER_LAYERS)
+    split_y, header_image = header
+
+    # Alt bant
+    band_key = (plan.size, split_y, plan.tracks, plan.copyright)
+    band_image = _lru_get(_band_layers, band_key, "band_hits", "band_misses")
+    if band_image is None:
+        if _band_top(plan, fonts_cache) < split_y:
+            # Katmanlar üst üste biniyor; kesilmemeleri için poster tek tuvalde çizilir
+            with _layers_lock:
+                _layer_stats["full_renders"] += 1
+            render_report.log_event(logger, logging.INFO, "single_canvas_render",
+                                    "Tracklist üst katmana taşıyor; poster tek tuvalde çiziliyor.", split_y=split_y)
+            with render_report.phase("single_canvas"):
+                return _render_single_canvas(plan, albumart_image, palette_method, artwork_key, fonts_cache, colors)
+        with render_report.phase("band"):
+            band_image = Image.new("RGB", (poster_width, poster_height - split_y), color=(255, 255, 255))
+            _draw_band(ImageDraw.Draw(band_image), plan, fonts_cache, offset_y=split_y)
+        _lru_put(_band_layers, band_key, band_image, MAX_CACHED_BAND_LAYERS)
+
+    with render_report.phase("compose"):
+        poster = Image.new("RGB", plan.size)
+        poster.paste(header_image, (0, 0))
+        poster.paste(band_image, (0, split_y))
 
     # Oluşturulan PIL Image nesnesini döndür
     return poster
+
+def layer_cache_stats():
+    """Üst katman ve alt bant önbelleklerinin sayaçlarını ve doluluğunu döndürür."""
+    with _layers_lock:
+        return dict(_layer_stats, cached_headers=len(_header_layers), cached_bands=len(_band_layers))
+
+def clear_layer_cache():
+    """Katman önbelleklerini ve sayaçlarını sıfırlar."""
+    with _layers_lock:
+        _header_layers.clear()
+        _band_layers.clear()
+        for counter in _layer_stats:
+            _layer_stats[counter] = 0
+
+
+# Toplu işlem: python -m poster_core <klasör veya glob> ... (ayrıntılar için batch.py)
+if __name__ == "__main__":
+    import batch
+    sys.exit(batch.main())
@@ -0,0 +1,165 @@
+# poster_export.py
+# Posterin dosya biçimine kodlanması (PNG, JPEG, WebP).
+# Kodlama, büyük posterlerde (A2 ve üstü) çizim kadar sürebilir; bu yüzden ayarlanabilir
+# (PNG sıkıştırma düzeyi ve isteğe bağlı palet indirgeme, yüksek kaliteli JPEG, WebP) ve
+# arka planda bir iş parçacığı havuzunda ya da yalnızca istendiğinde yapılır.
+# Her kodlamanın süresi ve bayt boyutu raporlanır.
+
+import os
+import time
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image
+
+# Desteklenen biçimler: MIME türü ve dosya uzantısı
+FORMATS = {
+    "PNG": ("image/png", ".png"),
+    "JPEG": ("image/jpeg", ".jpg"),
+    "WEBP": ("image/webp", ".webp"),
+}
+
+# Biçim adı takma adları (komut satırı ve dosya uzantıları için)
+FORMAT_ALIASES = {"JPG": "JPEG"}
+
+# Arka plan kodlama havuzundaki iş parçacığı sayısı (Pillow kodlarken GIL'i bırakır)
+DEFAULT_ENCODE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Kodlama ayarları
+#   format         - "PNG", "JPEG" veya "WEBP"
+#   compress_level - PNG zlib düzeyi (0-9); düşük düzey daha hızlı, daha büyük dosya demektir
+#   png_colors     - verilirse PNG bu kadar renge (2-256) indirgenir (palet PNG; çok daha küçük dosya)
+#   quality        - JPEG/WebP kalitesi (1-100)
+#   lossless       - WebP kayıpsız modu
+#   dpi            - dosyaya yazılacak çözünürlük (None ise yazılmaz)
+EncodeSettings = namedtuple("EncodeSettings", "format compress_level png_colors quality lossless dpi")
+DEFAULT_SETTINGS = EncodeSettings("PNG", 6, None, 95, False, None)
+
+# Kodlama sonucu: baytlar, ayarlar, MIME türü, uzantı ve kodlama süresi (ms)
+EncodedImage = namedtuple("EncodedImage", "data settings mime extension encode_ms")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def normalize_format(name):
+    """Biçim adını FORMATS anahtarına çevirir ('jpg' -> 'JPEG'); desteklenmiyorsa ValueError."""
+    key = str(name).upper().lstrip(".")
+    key = FORMAT_ALIASES.get(key, key)
+    if key not in FORMATS:
+        raise ValueError(f"Desteklenmeyen biçim: {name}")
+    return key
+
+def make_settings(fmt="PNG", **overrides):
+    """Varsayılan ayarlardan biçimi ve verilen alanları değiştirilmiş bir EncodeSettings üretir."""
+    return DEFAULT_SETTINGS._replace(format=normalize_format(fmt), **overrides)
+
+def encode_image(image, settings=DEFAULT_SETTINGS):
+    """
+    Resmi verilen ayarlarla kodlar.
+
+    Args:
+        image (PIL.Image.Image): RGB poster.
+        settings (EncodeSettings): Kodlama ayarları (bkz. make_settings).
+
+    Returns:
+        EncodedImage: Kodlanmış baytlar ve süre.
+    """
+    started = time.perf_counter()
+    fmt = normalize_format(settings.format)
+    params = {"dpi": (settings.dpi, settings.dpi)} if settings.dpi else {}
+    if fmt == "PNG":
+        params["compress_level"] = settings.compress_level
+        if settings.png_colors:
+            image = image.quantize(colors=max(2, min(256, int(settings.png_colors))), method=Image.Quantize.FASTOCTREE)
+    elif fmt == "JPEG":
+        # Metin kenarları için renk alt örneklemesi kapatılır (4:4:4)
+        params.update(quality=settings.quality, subsampling=0, optimize=True)
+    else:
+        params.update(quality=settings.quality, lossless=settings.lossless, method=4)
+    if image.mode not in ("RGB", "L", "P"):
+        image = image.convert("RGB")
+
+    buffer = BytesIO()
+    image.save(buffer, format=fmt, **params)
+    mime, extension = FORMATS[fmt]
+    return EncodedImage(buffer.getvalue(), settings._replace(format=fmt), mime, extension,
+                        (time.perf_counter() - started) * 1000)
+
+def get_executor():
+    """Süreç genelinde paylaşılan kodlama havuzunu (ilk kullanımda) oluşturup döndürür."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_ENCODE_WORKERS, thread_name_prefix="poster-encode")
+        return _executor
+
+def encode_async(image, settings=DEFAULT_SETTINGS):
+    """Kodlamayı arka plan havuzuna gönderir ve EncodedImage döndürecek bir Future döndürür."""
+    return get_executor().submit(encode_image, image, settings)
+
+class LazyExports:
+    """
+    Tek bir posterin kodlamalarını tutar. Her ayar için kodlama yalnızca ilk istendiğinde arka planda
+    başlatılır ve sonucu saklanır; aynı ayar tekrar istendiğinde yeniden kodlanmaz.
+    """
+
+    def __init__(self, image):
+        self.image = image
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, settings=DEFAULT_SETTINGS):
+        """Kodlamayı (gerekirse) başlatır ve Future döndürür."""
+        with self._lock:
+            future = self._futures.get(settings)
+            if future is None:
+                future = encode_async(self.image, settings)
+                self._futures[settings] = future
+            return future
+
+    def get(self, settings=DEFAULT_SETTINGS):
+        """Kodlanmış sonucu bekleyip döndürür."""
+        return self.submit(settings).result()
+
+    def encoded(self):
+        """Tamamlanmış kodlamaları {ayarlar: EncodedImage} olarak döndürür."""
+        with self._lock:
+            return {settings: future.result() for settings, future in self._futures.items()
+                    if future.done() and future.exception() is None}
+
+def save_formats(image, base_path, settings_list, parallel=True):
+    """
+    Posteri birden çok biçimde eşzamanlı kodlayıp base_path'e (uzantı biçime göre) yazar.
+
+    Args:
+        image (PIL.Image.Image): Poster.
+        base_path (str): Uzantısız veya uzantılı hedef yol; uzantı her biçim için değiştirilir.
+        settings_list (iterable): EncodeSettings listesi.
+        parallel (bool): False ise biçimler sırayla kodlanır.
+
+    Returns:
+        list: (yol, EncodedImage) çiftleri, settings_list sırasıyla.
+
+    Raises:
+        ValueError: Aynı biçim birden çok kez istenirse; yollar yalnızca uzantıdan türetildiği için
+            çıktılar birbirinin üzerine yazılırdı.
+    """
+    stem = os.path.splitext(base_path)[0]
+    settings_list = list(settings_list)
+    formats = [normalize_format(s.format) for s in settings_list]
+    duplicates = sorted({fmt for fmt in formats if formats.count(fmt) > 1})
+    if duplicates:
+        raise ValueError(f"Her biçim bir kez istenebilir: {', '.join(duplicates)}")
+    if parallel and len(settings_list) > 1:
+        results = [future.result() for future in [encode_async(image, s) for s in settings_list]]
+    else:
+        results = [encode_image(image, s) for s in settings_list]
+    return [(write_encoded(stem, encoded), encoded) for encoded in results]
+
+def write_encoded(base_path, encoded):
+    """Kodlanmış posteri base_path'e biçimin uzantısıyla yazar ve yazılan yolu döndürür."""
+    path = os.path.splitext(base_path)[0] + encoded.extension
+    with open(path, "wb") as f:
+        f.write(encoded.data)
+    return path
@@ -0,0 +1,698 @@
+# poster_layout.py
+# Posterin yerleşim (layout) aşaması: piksel çizmeden yalnızca font ölçümleriyle tüm boyutları
+# ve konumları hesaplar ve değişmez bir yerleşim planı döndürür. Plan; seçilen font boyutlarını,
+# her metin parçasının konumunu ve fontunu, kolon genişliklerini ve renk kutularının
+# dikdörtgenlerini içerir. poster_core.render_layout bu planı boyar.
+# Planlar (albüm, poster boyutu, yerleşimi etkileyen seçenekler) anahtarıyla önbelleğe alınır;
+# yalnızca tracklist_horizontal_offset veya copyright_bottom_padding_px değiştiğinde
+# önbellekteki plan yeniden ölçüm yapılmadan kaydırılır (translate_layout).
+
+import math
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from PIL import ImageFont
+from album_model import DEFAULT_ALBUM_TEXTS
+import render_report
+
+logger = logging.getLogger(__name__)
+
+# Poster boyutu ön ayarları (piksel)
+SIZE_PRESETS = {
+    "A4": (720, 960),
+    "A3": (1024, 1365),
+    "A2": (1440, 1920),
+}
+
+# Baskı için kağıt boyutları (milimetre); 'A2@300dpi' gibi poster boyutları bunlardan hesaplanır
+PAPER_SIZES_MM = {
+    "A4": (210, 297),
+    "A3": (297, 420),
+    "A2": (420, 594),
+}
+
+# Önbellekte tutulacak en fazla yerleşim planı sayısı
+MAX_CACHED_LAYOUTS = 64
+
+# Tracklist tuvale sığmadığında izlenecek yol ('tracklist_overflow' seçeneği)
+#   'clip'  - istenen kolon düzeni korunur; tuvalin dışında kalan kolonlar yerleştirilmez ve çizilmez
+#   'dense' - kolon başına satır sayısı ve font boyutu, tüm parçalar tek sayfaya sığacak şekilde seçilir
+#   'pages' - parçalar, her biri tek sayfaya sığan poster sayfalarına bölünür (bkz. paginate_tracks)
+OVERFLOW_MODES = ("clip", "dense", "pages")
+
+# 'dense' ve 'pages' modlarında inilebilecek en küçük tracklist boyutu (ölçeklenmemiş; A4'te piksel)
+DEFAULT_MIN_TRACKLIST_SIZE = 6
+
+# Sayfalara bölme sonucu: her sayfanın (ilk, son) parça aralığı ve sayfalarda kullanılacak kolon başına satır
+Pagination = namedtuple("Pagination", "pages tracks_per_column")
+
+# Yüz yolu ve piksel boyutu; path None ise Pillow'un varsayılan fontu kullanılır
+FontSpec = namedtuple("FontSpec", "path size")
+DEFAULT_FONT = FontSpec(None, 0)
+
+# Çizilecek tek bir metin parçası (anchor None ise Pillow'un varsayılanı 'la')
+TextRun = namedtuple("TextRun", "text x y font anchor")
+
+# Dolu dikdörtgen (sol, üst, sağ, alt)
+Rect = namedtuple("Rect", "x0 y0 x1 y1")
+
+# Tracklist kolonu: başlangıç x'i, en geniş ad, süre metinlerinin x'i, toplam genişlik ve kapsadığı parçalar
+Column = namedtuple("Column", "x name_width time_x width first_track track_count")
+
+# Yerleşim planı
+#   size               - (genişlik, yükseklik)
+#   scale_factor       - A4 tabanına göre ölçek
+#   artwork_box        - kapağın yapıştırılacağı Rect (kapak yoksa da hesaplanır)
+#   divider            - ayırıcı çizginin Rect'i
+#   album_name, artist - TextRun
+#   copyright          - TextRun veya None
+#   tracks             - her satır için (ad, süre) TextRun çiftlerinin düz demeti
+#   columns            - Column demeti
+#   swatches           - renk kutularının sağdan sola Rect demeti
+#   tracklist_size     - seçilen tracklist font boyutu (ölçeklenmemiş)
+#   line_height        - tracklist satır yüksekliği
+#   tracklist_offset, copyright_padding - planın hesaplandığı kaydırma seçenekleri
+#   hidden_tracks      - tuvalin dışında kaldığı için yerleştirilmeyen parça sayısı
+LayoutPlan = namedtuple("LayoutPlan", "size scale_factor artwork_box divider album_name artist copyright "
+                                      "tracks columns swatches tracklist_size line_height "
+                                      "tracklist_offset copyright_padding hidden_tracks")
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "translated": 0}
+
+def print_size(paper, dpi):
+    """Kağıt boyutunun (PAPER_SIZES_MM) verilen DPI'daki piksel boyutunu döndürür (A2, 300 DPI -> 4961x7016)."""
+    width_mm, height_mm = PAPER_SIZES_MM[paper]
+    return (round(width_mm / 25.4 * dpi), round(height_mm / 25.4 * dpi))
+
+def print_size_key(paper, dpi):
+    """Baskı boyutu için 'poster_size' seçeneğinde kullanılabilecek anahtarı döndürür (ör. 'A2@300dpi')."""
+    return f"{paper}@{dpi:g}dpi"
+
+def resolve_poster_size(poster_size):
+    """
+    'poster_size' seçeneğini piksel boyutuna çevirir.
+    SIZE_PRESETS anahtarlarını, 'A2@300dpi' biçimindeki baskı boyutlarını ve (genişlik, yükseklik) demetlerini kabul eder;
+    tanınmayan değerler için A4 döndürülür.
+    """
+    if isinstance(poster_size, (tuple, list)) and len(poster_size) == 2:
+        return (int(poster_size[0]), int(poster_size[1]))
+    if isinstance(poster_size, str) and "@" in poster_size:
+        paper, _, dpi = poster_size.partition("@")
+        try:
+            dpi = float(dpi.lower().replace("dpi", "").strip())
+            if paper in PAPER_SIZES_MM and dpi > 0:
+                return print_size(paper, dpi)
+        except ValueError:
+            pass
+    return SIZE_PRESETS.get(poster_size, SIZE_PRESETS["A4"])
+
+def get_scale_factor(poster_size_key):
+    """Poster boyutunun A4 (720 piksel genişlik) tabanına göre ölçek katsayısını döndürür."""
+    poster_width, _ = resolve_poster_size(poster_size_key)
+    return poster_width / 720
+
+def get_artwork_size(poster_size_key):
+    """Verilen poster boyutunda albüm kapağının kaplaması gereken (genişlik, yükseklik) değerini döndürür."""
+    scale_factor = get_scale_factor(poster_size_key)
+    return (int(600 * scale_factor), int(600 * scale_factor))
+
+def _largest_fitting_size(low, high, fits):
+    """
+    [low, high] aralığında fits(size) koşulunu sağlayan en büyük tamsayı boyutu ikili aramayla bulur.
+    fits'in monoton olduğu (bir boyutta sağlanıyorsa daha küçük boyutlarda da sağlandığı) varsayılır.
+    Hiçbir boyut uymuyorsa None döndürür.
+    """
+    best = None
+    while low <= high:
+        mid = (low + high) // 2
+        if fits(mid):
+            best = mid
+            low = mid + 1
+        else:
+            high = mid - 1
+    return best
+
+def _refine_fitting_size(guess, low, high, fits):
+    """
+    Tahmini bir boyuttan başlayarak fits(size) koşulunu sağlayan en büyük boyutu bulur.
+    Tahmin doğruysa yalnızca tahmin ve bir üst komşusu denenir; değilse kalan aralıkta ikili arama yapılır.
+    """
+    if guess is None:
+        guess = low
+    guess = min(max(guess, low), high)
+    if fits(guess):
+        if guess == high or not fits(guess + 1):
+            return guess
+        return _largest_fitting_size(guess + 2, high, fits) or guess + 1
+    return _largest_fitting_size(low, guess - 1, fits)
+
+def load_font(fonts_cache, spec):
+    """FontSpec'i font yöneticisi üzerinden (veya varsayılan font olarak) yükler."""
+    if spec.path is None:
+        return ImageFont.load_default()
+    return fonts_cache.truetype(spec.path, spec.size)
+
+def layout_options(options):
+    """Seçeneklerden yerleşimi etkileyen ve ölçüm gerektiren kısmı (kaydırmalar hariç) demet olarak döndürür."""
+    poster_size = options.get('poster_size', 'A4')
+    return (
+        tuple(poster_size) if isinstance(poster_size, list) else poster_size,
+        options.get('tracks_per_column', 6),
+        tuple(options.get('tracklist_font_size_search_range', (10, 20))),
+        bool(options.get('include_copyright', True)),
+        options.get('palette_colors', 5),
+        options.get('tracklist_overflow', 'clip'),
+        options.get('min_tracklist_font_size', DEFAULT_MIN_TRACKLIST_SIZE),
+    )
+
+def _tracklist_area(scale_factor):
+    """Tracklist'in sığması gereken (yatay, dikey) alanı döndürür."""
+    return (int(720 * scale_factor) - int(60 * scale_factor) - int(60 * scale_factor),
+            int(920 * scale_factor) - int(775 * scale_factor))
+
+def _line_height(font, pixel_size):
+    """Tracklist satır yüksekliği (boyut aramasında ve çizimde aynı formül)."""
+    _, top, _, bottom = font.getbbox("AgjypQ")
+    return bottom - top + pixel_size * 0.8
+
+def rows_that_fit(fonts_cache, path, size, scale_factor):
+    """Verilen (ölçeklenmemiş) tracklist boyutunda bir kolona dikey olarak sığan satır sayısını döndürür (en az 1)."""
+    pixel_size = int(size * scale_factor)
+    try:
+        line_height = _line_height(fonts_cache.truetype(path, pixel_size), pixel_size)
+    except Exception:
+        return 1
+    return max(1, int(_tracklist_area(scale_factor)[1] * 1.05 // line_height))
+
+def _choose_font(fonts_cache, path, size, label):
+    """Yüz varsa verilen boyutta FontSpec döndürür; yoksa veya yüklenemezse varsayılan fonta döner."""
+    if not fonts_cache.has_face(path):
+        render_report.log_event(logger, logging.WARNING, "font_missing", f"{label} fontu '{path}' bulunamadı. Varsayılana dönülüyor.", role=label, path=path)
+        return DEFAULT_FONT
+    try:
+        fonts_cache.truetype(path, size)
+        return FontSpec(path, size)
+    except Exception as e:
+        render_report.log_event(logger, logging.WARNING, "font_load_error", f"{label} fontu '{path}' yüklenirken hata: {e}. Varsayılana dönülüyor.", role=label, path=path, error=str(e))
+        return DEFAULT_FONT
+
+def _album_name_font(fonts_cache, path, album_name, scale_factor):
+    """Albüm adı için FontSpec'i seçer; uzun adlarda sığan en büyük boyut aranır."""
+    cursize_name = int(55 * scale_factor)
+    if not fonts_cache.has_face(path):
+        render_report.log_event(logger, logging.WARNING, "font_missing", f"Albüm adı fontu '{path}' bulunamadı. Varsayılana dönülüyor.", role="albumname", path=path)
+        return DEFAULT_FONT
+    try:
+        font_name = fonts_cache.truetype(path, cursize_name)
+        # Albüm adı uzunsa boyutu ayarla
+        uzunluk_siniri = 14
+        if len(album_name) > uzunluk_siniri:
+            try:
+                # Genişlik boyutla monoton arttığından, sığan en büyük boyut ikili aramayla bulunur.
+                # Hiçbir boyut sığmazsa eski azaltma döngüsü, font yeniden yüklenmeden önce durduğu için
+                # son yüklenen boyutta, yani alt sınırın bir üstünde (int(10 * scale_factor) + 1) kalırdı.
+                max_name_width = int(400 * scale_factor)
+                if font_name.getlength(album_name) > max_name_width:
+                    min_name_size = int(10 * scale_factor) + 1
+                    fitting_size = _largest_fitting_size(
+                        min_name_size, cursize_name - 1,
+                        render_report.counted(lambda size: fonts_cache.truetype(path, size).getlength(album_name) <= max_name_width,
+                                              "album_name")
+                    )
+                    if fitting_size is None:
+                        render_report.log_event(logger, logging.INFO, "album_name_min_size", "Albüm adı hiçbir boyutta sığmadı; en küçük boyut kullanılıyor.",
+                                                size=min_name_size)
+                    cursize_name = fitting_size if fitting_size is not None else min_name_size
+                    fonts_cache.truetype(path, cursize_name)
+            except Exception as e:
+                render_report.log_event(logger, logging.WARNING, "album_name_size_error", f"Albüm adı font boyutu ayarlanırken hata: {e}. Varsayılan boyut kullanılıyor.", error=str(e))
+                cursize_name = int(30 * scale_factor)
+                try:
+                    fonts_cache.truetype(path, cursize_name)
+                except Exception:
+                    render_report.log_event(logger, logging.WARNING, "font_load_error", f"'{path}' fontu varsayılan boyutla yüklenemedi. Varsayılana dönülüyor.", role="albumname", path=path)
+                    return DEFAULT_FONT
+        return FontSpec(path, cursize_name)
+    except Exception as e:
+        render_report.log_event(logger, logging.WARNING, "font_load_error", f"Albüm adı fontu '{path}' yüklenirken hata: {e}. Varsayılana dönülüyor.", role="albumname", path=path, error=str(e))
+        return DEFAULT_FONT
+
+def _tracklist_size(fonts_cache, path, tracks, tracks_per_column, size_range, scale_factor):
+    """
+    Tracklist için hem dikey hem yatay alana sığan en büyük font boyutunu (ölçeklenmemiş) döndürür.
+    Parça yoksa aralığın alt sınırı, uygun boyut yoksa veya font bulunamazsa 10 döndürülür.
+    """
+    scaled_column_spacing = int(40 * scale_factor)
+    scaled_name_time_spacing = int(25 * scale_factor)
+    total_tracks_count = len(tracks)
+    min_size_to_try = max(1, size_range[0])
+    max_size_to_try = size_range[1]
+
+    if total_tracks_count == 0:
+        render_report.log_event(logger, logging.INFO, "no_tracks", "Tracklist'te görüntülenecek parça yok.")
+        if not fonts_cache.has_face(path):
+            render_report.log_event(logger, logging.WARNING, "font_missing", f"Tracklist fontu '{path}' bulunamadı. Boş tracklist için varsayılana dönülüyor.", role="tracklist", path=path)
+            return 10
+        return min_size_to_try
+
+    if not fonts_cache.has_face(path):
+        render_report.log_event(logger, logging.WARNING, "font_missing", f"Tracklist fontu '{path}' bulunamadı. Boyutlandırma için varsayılana dönülüyor.", role="tracklist", path=path)
+        return 10
+
+    # Dinamik font boyutlandırma
+    available_vertical_space = int(920 * scale_factor) - int(775 * scale_factor)
+    # Görüntülenecek parça adları normalleştirme sırasında bir kez hesaplandı
+    display_track_names = [track.display_name for track in tracks]
+
+    estimated_columns = math.ceil(total_tracks_count / (tracks_per_column if tracks_per_column > 0 else 1))
+    if total_tracks_count > 0 and estimated_columns <= 0:
+        estimated_columns = 1
+    available_horizontal_space = int(720 * scale_factor) - int(60 * scale_factor) - int(60 * scale_factor)
+
+    def fits_vertically(cursize_tracks):
+        """Verilen boyutta bir kolonun dikey alana sığıp sığmadığını döndürür."""
+        try:
+            font_tracks_test = fonts_cache.truetype(path, int(cursize_tracks * scale_factor))
+            _, top, _, bottom = font_tracks_test.getbbox("AgjypQ")
+            temp_line_height = bottom - top + int(cursize_tracks * scale_factor) * 0.8
+            return tracks_per_column * temp_line_height <= available_vertical_space * 1.05
+        except Exception:
+            return False
+
+    # Parça adlarının boyuttan bağımsız birim genişlikleri glif ilerleme tablosundan bir kez hesaplanır;
+    # herhangi bir boyuttaki genişlik tahmini birim genişlik * piksel boyutudur.
+    try:
+        track_advance_table = fonts_cache.advance_table(
+            path,
+            kerning=fonts_cache.truetype(path, int(max(1, max_size_to_try) * scale_factor)).layout_engine == ImageFont.Layout.RAQM
+        )
+        track_unit_widths = track_advance_table.unit_widths(display_track_names)
+        track_tolerances = [track_advance_table.tolerance(len(name)) for name in display_track_names]
+        max_track_unit_width = max(track_unit_widths)
+        time_unit_width = track_advance_table.unit_width("00:00")
+    except Exception:
+        track_advance_table = None
+
+    def max_track_name_width(font_tracks_test, pixel_size):
+        """Verilen fonttaki en geniş parça adının kesin genişliğini döndürür."""
+        if track_advance_table is not None:
+            # Yalnızca tahmini üst sınırı mevcut en geniş addan büyük olan adlar kesin olarak ölçülür
+            try:
+                upper_bounds = [width * pixel_size + tolerance for width, tolerance in zip(track_unit_widths, track_tolerances)]
+                lower_bound = max(width * pixel_size - tolerance for width, tolerance in zip(track_unit_widths, track_tolerances))
+                candidates = sorted((i for i, upper in enumerate(upper_bounds) if upper >= lower_bound), key=upper_bounds.__getitem__, reverse=True)
+                widest = 0
+                for i in candidates:
+                    if upper_bounds[i] < widest:
+                        break
+                    widest = max(widest, font_tracks_test.getlength(display_track_names[i]))
+                return widest
+            except Exception:
+                pass
+        max_name_width_overall_for_size = 0
+        for display_track_name in display_track_names:
+            try:
+                max_name_width_overall_for_size = max(max_name_width_overall_for_size, font_tracks_test.getlength(display_track_name))
+            except:
+                max_name_width_overall_for_size = max(max_name_width_overall_for_size, len(display_track_name) * pixel_size * 0.6)
+        return max_name_width_overall_for_size
+
+    def total_tracklist_width(max_name_width, max_time_width_for_spacing):
+        """Tüm kolonların kaplayacağı toplam yatay genişliği döndürür."""
+        return (max_name_width + scaled_name_time_spacing + max_time_width_for_spacing) * estimated_columns + scaled_column_spacing * max(0, estimated_columns - 1)
+
+    def fits_horizontally_estimate(cursize_tracks):
+        """Verilen boyutta kolonların yatay alana sığıp sığmadığını yalnızca tablo tahminiyle döndürür."""
+        pixel_size = int(cursize_tracks * scale_factor)
+        estimated_width = total_tracklist_width(max_track_unit_width * pixel_size, time_unit_width * pixel_size)
+        return estimated_width <= available_horizontal_space * 1.05
+
+    def fits_horizontally(cursize_tracks):
+        """Verilen boyutta tüm kolonların yatay alana sığıp sığmadığını kesin ölçümle döndürür."""
+        try:
+            font_tracks_test = fonts_cache.truetype(path, int(cursize_tracks * scale_factor))
+            max_name_width_overall_for_size = max_track_name_width(font_tracks_test, int(cursize_tracks * scale_factor))
+
+            max_time_width_for_spacing = 0
+            try:
+                max_time_width_for_spacing = font_tracks_test.getlength("00:00")
+            except:
+                max_time_width_for_spacing = int(cursize_tracks * scale_factor) * 3
+
+            estimated_total_horizontal_width = total_tracklist_width(max_name_width_overall_for_size, max_time_width_for_spacing)
+            return estimated_total_horizontal_width <= available_horizontal_space * 1.05
+        except Exception:
+            return False
+
+    # Her iki koşul da boyut küçüldükçe gevşediği için, yukarıdan aşağıya tek tek denemek yerine
+    # önce ucuz dikey sınır bulunur. Yatay sınır glif tablosu tahminiyle belirlenir ve yalnızca
+    # tahmin edilen boyut ile komşusu kesin ölçümle doğrulanır (tablo yoksa ikili arama yapılır).
+    # Sonuç, en büyük boyuttan başlayıp ilk sığan boyutta duran eski döngüyle aynıdır.
+    bestsize = 0
+    # Etkin bir RenderReport varsa her aramanın denediği boyut sayısı sayılır
+    fits_vertically = render_report.counted(fits_vertically, "tracklist_vertical")
+    fits_horizontally_estimate = render_report.counted(fits_horizontally_estimate, "tracklist_estimate")
+    fits_horizontally = render_report.counted(fits_horizontally, "tracklist_horizontal")
+    vertical_limit = _largest_fitting_size(min_size_to_try, max_size_to_try, fits_vertically)
+    if vertical_limit is not None:
+        if track_advance_table is not None:
+            estimated_size = _largest_fitting_size(min_size_to_try, vertical_limit, fits_horizontally_estimate)
+            bestsize = _refine_fitting_size(estimated_size, min_size_to_try, vertical_limit, fits_horizontally) or 0
+        else:
+            bestsize = _largest_fitting_size(min_size_to_try, vertical_limit, fits_horizontally) or 0
+
+    if bestsize == 0:
+        render_report.log_event(logger, logging.WARNING, "tracklist_size_fallback", "Belirtilen aralıkta istenen kolon başına parça sayısına dikey ve yatay olarak uyan uygun bir font boyutu bulunamadı. Varsayılan boyut kullanılıyor.",
+                                size_range=list(size_range), tracks_per_column=tracks_per_column, vertical_limit=vertical_limit, size=10)
+        bestsize = 10
+    return bestsize
+
+def _columns_fit(font, tracks, rows, limit, scale_factor):
+    """
+    Parçalar kolon başına rows satırla dizildiğinde kolonların limit genişliğine sığıp sığmadığını döndürür.
+    Kolon genişlikleri çizimdeki gibi kolonun kendi en geniş adıyla ölçülür; sınır aşıldığı anda durulduğu için
+    sığmayan uzun listelerde maliyet parça sayısıyla büyümez.
+    """
+    column_extra = int(25 * scale_factor) + font.getlength("00:00")
+    column_spacing = int(40 * scale_factor)
+    width = -column_spacing
+    for first in range(0, len(tracks), rows):
+        width += column_spacing + column_extra + max(font.getlength(track.display_name) for track in tracks[first:first + rows])
+        if width > limit:
+            return False
+    return True
+
+def _fitted_tracklist(fonts_cache, path, tracks, tracks_per_column, size_range, min_size, scale_factor):
+    """
+    'dense' ve 'pages' modları için tüm parçaları tracklist alanına sığdıran en büyük boyutu ve kolon başına satır
+    sayısını döndürür. tracks_per_column None ise satır sayısı her boyutta dikeyde sığabildiği kadardır.
+    Boyut, aralığın üst sınırıyla en küçük okunabilir boyut arasında aranır; en küçük boyutta bile sığmıyorsa
+    o boyut kullanılır ve tuvale sığmayan kolonlar kırpılır.
+    """
+    low = max(1, min_size)
+    high = max(low, size_range[1])
+    limit = _tracklist_area(scale_factor)[0] * 1.05
+
+    def fits(size):
+        """Verilen boyutta tüm kolonların dikey ve yatay alana sığıp sığmadığını döndürür."""
+        fitting_rows = rows_that_fit(fonts_cache, path, size, scale_factor)
+        rows = fitting_rows if tracks_per_column is None else tracks_per_column
+        if rows > fitting_rows:
+            return False
+        try:
+            return _columns_fit(fonts_cache.truetype(path, int(size * scale_factor)), tracks, rows, limit, scale_factor)
+        except Exception:
+            return False
+
+    size = _largest_fitting_size(low, high, render_report.counted(fits, "tracklist_fitted"))
+    if size is None:
+        render_report.log_event(logger, logging.WARNING, "tracklist_overflow", "Parçalar en küçük okunabilir boyutta bile tracklist alanına sığmadı; sığmayan kolonlar kırpılıyor.",
+                                tracks=len(tracks), size=low)
+        size = low
+    if tracks_per_column is None:
+        return size, rows_that_fit(fonts_cache, path, size, scale_factor)
+    return size, max(1, tracks_per_column)
+
+def paginate_tracks(album, options, fonts_cache, font_paths):
+    """
+    'pages' modu için parçaları, her biri tek poster sayfasına sığan ardışık aralıklara böler.
+    Kolonlar tek geçişte doldurulur: her sayfa, tracklist boyut aralığının alt sınırında (en az okunabilir boyut)
+    sığacak kadar kolon alır; sayfa sonra kendi parçalarıyla yerleştirilip sığan en büyük boyutu seçer.
+
+    Returns:
+        Pagination: Sayfaların (ilk, son) parça aralıkları ve sayfalarda kullanılacak kolon başına satır sayısı.
+    """
+    poster_size_key, tracks_per_column, size_range, _, _, _, min_size = layout_options(options)
+    tracks = album.tracks
+    rows = max(1, tracks_per_column)
+    path = font_paths["tracklist"]
+    if not tracks or not fonts_cache.has_face(path):
+        return Pagination(((0, len(tracks)),), rows)
+
+    scale_factor = get_scale_factor(poster_size_key)
+    size = max(1, size_range[0], min_size)
+    rows = min(rows, rows_that_fit(fonts_cache, path, size, scale_factor))
+    font = fonts_cache.truetype(path, int(size * scale_factor))
+    # Kolon genişlikleri _columns_fit ile aynı ölçülür; böylece her sayfa bu boyutta sığar
+    limit = _tracklist_area(scale_factor)[0] * 1.05
+    column_extra = int(25 * scale_factor) + font.getlength("00:00")
+    column_spacing = int(40 * scale_factor)
+
+    pages = []
+    page_start, width = 0, None
+    for first in range(0, len(tracks), rows):
+        column_width = column_extra + max(font.getlength(track.display_name) for track in tracks[first:first + rows])
+        if width is not None and width + column_spacing + column_width > limit:
+            pages.append((page_start, first))
+            page_start, width = first, column_width
+        else:
+            width = column_width if width is None else width + column_spacing + column_width
+    pages.append((page_start, len(tracks)))
+    return Pagination(tuple(pages), rows)
+
+def compute_layout(album, options, fonts_cache, font_paths):
+    """
+    Albüm ve seçenekler için yerleşim planını hesaplar (önbelleğe bakmaz, piksel çizmez).
+
+    Args:
+        album (album_model.Album): Normalleştirilmiş albüm.
+        options (dict): create_album_poster seçenekleri.
+        fonts_cache (font_manager.FontManager): Ölçümlerde kullanılan font yöneticisi.
+        font_paths (dict): 'albumname', 'albumartist', 'tracklist' ve 'copyright' rolleri için font yolları.
+
+    Returns:
+        LayoutPlan: Yerleşim planı.
+    """
+    (poster_size_key, tracks_per_column, tracklist_font_size_search_range, include_copyright, palette_colors,
+     tracklist_overflow, min_tracklist_size) = layout_options(options)
+    tracklist_horizontal_offset = options.get('tracklist_horizontal_offset', 0)
+    copyright_bottom_padding_px = options.get('copyright_bottom_padding_px', 20)
+
+    poster_width, poster_height = resolve_poster_size(poster_size_key)
+    scale_factor = poster_width / 720 # 720 A4'e göre ölçeklendirme
+
+    # Ölçeklendirilmiş boşluk değerleri
+    scaled_column_spacing = int(40 * scale_factor)
+    scaled_name_time_spacing = int(25 * scale_factor)
+    scaled_copyright_bottom_padding = int(copyright_bottom_padding_px * scale_factor)
+    scaled_copyright_right_padding = int(60 * scale_factor)
+
+    artwork_width, artwork_height = get_artwork_size(poster_size_key)
+    artwork_box = Rect(int(60 * scale_factor), int(60 * scale_factor),
+                       int(60 * scale_factor) + artwork_width, int(60 * scale_factor) + artwork_height)
+    divider = Rect(int(60 * scale_factor), int(740 * scale_factor), int(660 * scale_factor), int(745 * scale_factor))
+
+    # Fontları seç (font yöneticisi yüzleri bellekte ve boyutlara göre önbellekte tutar)
+    name_spec = _album_name_font(fonts_cache, font_paths["albumname"], album.name, scale_factor)
+    artist_spec = _choose_font(fonts_cache, font_paths["albumartist"], int(25 * scale_factor), "Sanatçı")
+    copyright_spec = _choose_font(fonts_cache, font_paths["copyright"], int(10 * scale_factor), "Telif hakkı")
+
+    # Tracklist font boyutu
+    tracklist_path = font_paths["tracklist"]
+    if tracklist_overflow in ("dense", "pages") and album.tracks and fonts_cache.has_face(tracklist_path):
+        # 'dense' modunda kolon başına satır sayısı da boyutla birlikte seçilir; 'pages' modunda sayfa
+        # paginate_tracks'in seçtiği satır sayısıyla bu boyutta sığar
+        bestsize, tracks_per_column = _fitted_tracklist(fonts_cache, tracklist_path, album.tracks,
+                                                        None if tracklist_overflow == "dense" else tracks_per_column,
+                                                        tracklist_font_size_search_range, min_tracklist_size, scale_factor)
+    else:
+        bestsize = _tracklist_size(fonts_cache, tracklist_path, album.tracks, tracks_per_column,
+                                   tracklist_font_size_search_range, scale_factor)
+    tracks_spec = DEFAULT_FONT
+    if fonts_cache.has_face(tracklist_path):
+        tracks_spec = _choose_font(fonts_cache, tracklist_path, int(bestsize * scale_factor), "Nihai tracklist")
+    elif album.tracks:
+        render_report.log_event(logger, logging.WARNING, "font_missing", f"Tracklist fontu '{tracklist_path}' bulunamadı. Varsayılana dönülüyor.", role="tracklist", path=tracklist_path)
+    font_tracks = load_font(fonts_cache, tracks_spec)
+
+    # Nihai fontla satır yüksekliği ve maksimum zaman genişliği
+    line_height_estimate = 0
+    max_time_width = 0
+    try:
+        if hasattr(font_tracks, 'getbbox'):
+            _, top, _, bottom = font_tracks.getbbox("AgjypQ")
+            line_height_estimate = bottom - top + int(bestsize * scale_factor) * 0.8
+        else:
+            line_height_estimate = int(bestsize * scale_factor) * 1.8
+    except Exception as e:
+        render_report.log_event(logger, logging.WARNING, "line_height_error", f"Çizim için satır yüksekliği tahmini yeniden hesaplanırken hata: {e}. Önceki tahmin kullanılıyor.", error=str(e))
+    try:
+        if hasattr(font_tracks, 'getlength'):
+            max_time_width = font_tracks.getlength("00:00")
+        else:
+            max_time_width = int(bestsize * scale_factor) * 3
+    except Exception as e:
+        render_report.log_event(logger, logging.WARNING, "time_width_error", f"Çizim için maksimum zaman genişliği tahmini yeniden hesaplanırken hata: {e}. Önceki tahmin kullanılıyor.", error=str(e))
+
+    # --- DİNAMİK KOLONLU TRACKLİST ---
+    # Başlangıç X koordinatına yatay ofseti ekle
+    start_x = int(60 * scale_factor) + tracklist_horizontal_offset
+    start_y = int(775 * scale_factor)
+    track_runs = []
+    columns = []
+    hidden_tracks = 0
+    if not album.tracks:
+        render_report.log_event(logger, logging.INFO, "no_tracks", "Çizilecek parça yok.")
+    else:
+        linesoftracks_for_drawing = tracks_per_column
+        if linesoftracks_for_drawing <= 0:
+            linesoftracks_for_drawing = 1
+            render_report.log_event(logger, logging.WARNING, "tracks_per_column_fallback", "Kolon başına parça sayısı 0 veya daha az olarak ayarlanmıştı. 1 parça/kolon kullanılıyor.",
+                                    tracks_per_column=tracks_per_column)
+
+        # Sağ kenarın ötesinde başlayan kolonlar yerleştirilmez. Plan önbellekte kaydırma seçeneğinden bağımsız
+        # tutulduğundan sınır, -poster genişliğine kadar sola kaydırmalarda da görünecek kolonları kapsar.
+        clip_x = poster_width + int(bestsize * scale_factor) + max(poster_width, -tracklist_horizontal_offset) + tracklist_horizontal_offset
+        cur_x = start_x
+        for first in range(0, len(album.tracks), linesoftracks_for_drawing):
+            if cur_x >= clip_x:
+                hidden_tracks = len(album.tracks) - first
+                render_report.log_event(logger, logging.INFO, "tracklist_clipped", f"{hidden_tracks} parça tuvalin dışında kaldığı için yerleştirilmedi.",
+                                        hidden_tracks=hidden_tracks, columns=len(columns))
+                break
+            column_tracks = album.tracks[first:first + linesoftracks_for_drawing]
+            # Kolondaki en geniş ad, süre metinlerinin hizalanacağı x'i belirler
+            max_name_width_in_current_column = 0
+            for track in column_tracks:
+                try:
+                    current_name_width = font_tracks.getlength(track.display_name)
+                except Exception as e:
+                    render_report.log_event(logger, logging.WARNING, "track_width_error", f"Yerleşim sırasında parça adı '{track.display_name}' için genişlik alınırken hata: {e}. Tahmin ediliyor.",
+                                            track=track.display_name, error=str(e))
+                    current_name_width = len(track.display_name) * int(bestsize * scale_factor) * 0.6
+                max_name_width_in_current_column = max(max_name_width_in_current_column, current_name_width)
+
+            time_x = cur_x + max_name_width_in_current_column + scaled_name_time_spacing
+            for i, track in enumerate(column_tracks):
+                text_y = start_y + i * line_height_estimate
+                track_runs.append(TextRun(track.display_name, cur_x, text_y, tracks_spec, None))
+                track_runs.append(TextRun(track.duration_text, time_x, text_y, tracks_spec, None))
+
+            column_drawn_width = max_name_width_in_current_column + scaled_name_time_spacing + max_time_width
+            columns.append(Column(cur_x, max_name_width_in_current_column, time_x, column_drawn_width, first, len(column_tracks)))
+            cur_x += column_drawn_width + scaled_column_spacing
+
+    # --- Albüm adı, sanatçı ve renk kutuları ---
+    album_name_run = TextRun(album.name, int(65 * scale_factor), int(725 * scale_factor), name_spec, 'ls')
+    artist_run = TextRun(album.artist, int(660 * scale_factor), int(725 * scale_factor), artist_spec, 'rs')
+
+    swatches = []
+    x = int(660 * scale_factor)
+    rectanglesize = int(30 * scale_factor)
+    for _ in range(max(1, int(palette_colors))):
+        swatches.append(Rect(x - rectanglesize, int(670 * scale_factor), x, int(670 * scale_factor) + rectanglesize))
+        x -= rectanglesize
+
+    # Telif hakkı metni sağ alt köşeye hizalanır
+    copyright_run = None
+    if include_copyright and album.copyright and album.copyright != DEFAULT_ALBUM_TEXTS["album_data_no_copyright"]:
+        try:
+            font_copyright = load_font(fonts_cache, copyright_spec)
+            if hasattr(font_copyright, 'getbbox'):
+                _, top, _, bottom = font_copyright.getbbox(album.copyright)
+                copyright_text_height = bottom - top
+            else:
+                copyright_text_height = int(10 * scale_factor) * 1.2
+
+            if hasattr(font_copyright, 'getlength'):
+                copyright_width = font_copyright.getlength(album.copyright)
+            else:
+                copyright_width = len(album.copyright) * int(10 * scale_factor) * 0.6
+
+            copyright_run = TextRun(album.copyright,
+                                    poster_width - scaled_copyright_right_padding - copyright_width,
+                                    poster_height - scaled_copyright_bottom_padding - copyright_text_height,
+                                    copyright_spec, None)
+        except Exception as e:
+            render_report.log_event(logger, logging.WARNING, "copyright_layout_error", f"Telif hakkı metni yerleştirilirken hata: {e}", error=str(e))
+
+    return LayoutPlan(
+        size=(poster_width, poster_height),
+        scale_factor=scale_factor,
+        artwork_box=artwork_box,
+        divider=divider,
+        album_name=album_name_run,
+        artist=artist_run,
+        copyright=copyright_run,
+        tracks=tuple(track_runs),
+        columns=tuple(columns),
+        swatches=tuple(swatches),
+        tracklist_size=bestsize,
+        line_height=line_height_estimate,
+        tracklist_offset=tracklist_horizontal_offset,
+        copyright_padding=copyright_bottom_padding_px,
+        hidden_tracks=hidden_tracks,
+    )
+
+def translate_layout(plan, tracklist_horizontal_offset=None, copyright_bottom_padding_px=None):
+    """
+    Planı yeniden ölçmeden yeni kaydırma seçeneklerine taşır.
+    Tracklist metinleri ve kolonları yatayda, telif hakkı metni dikeyde kaydırılır.
+    """
+    if tracklist_horizontal_offset is None:
+        tracklist_horizontal_offset = plan.tracklist_offset
+    if copyright_bottom_padding_px is None:
+        copyright_bottom_padding_px = plan.copyright_padding
+    dx = tracklist_horizontal_offset - plan.tracklist_offset
+    dy = int(plan.copyright_padding * plan.scale_factor) - int(copyright_bottom_padding_px * plan.scale_factor)
+    if dx == 0 and dy == 0:
+        return plan._replace(tracklist_offset=tracklist_horizontal_offset, copyright_padding=copyright_bottom_padding_px)
+
+    tracks = plan.tracks
+    columns = plan.columns
+    if dx:
+        tracks = tuple(run._replace(x=run.x + dx) for run in tracks)
+        columns = tuple(column._replace(x=column.x + dx, time_x=column.time_x + dx) for column in columns)
+    copyright_run = plan.copyright
+    if dy and copyright_run is not None:
+        copyright_run = copyright_run._replace(y=copyright_run.y + dy)
+    return plan._replace(tracks=tracks, columns=columns, copyright=copyright_run,
+                         tracklist_offset=tracklist_horizontal_offset, copyright_padding=copyright_bottom_padding_px)
+
+def get_layout(album, options, fonts_cache, font_paths):
+    """
+    Yerleşim planını önbellekten döndürür; yoksa hesaplar.
+    Anahtar (albüm, font yolları, layout_options) olup kaydırma seçeneklerini içermez;
+    bu seçenekler yalnızca translate_layout ile uygulanır.
+    """
+    key = (album.layout_key(), tuple(sorted(font_paths.items())), layout_options(options))
+    with _cache_lock:
+        plan = _cache.get(key)
+        if plan is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+        else:
+            _stats["misses"] += 1
+    render_report.count("layout_cache_hits" if plan is not None else "layout_cache_misses")
+
+    offset = options.get('tracklist_horizontal_offset', 0)
+    if plan is not None and plan.hidden_tracks and offset < min(-plan.size[0], plan.tracklist_offset):
+        # Kırpılmış plan bu kadar sola kaydırıldığında görünecek kolonları içermez
+        plan = None
+    if plan is None:
+        plan = compute_layout(album, options, fonts_cache, font_paths)
+        with _cache_lock:
+            _cache[key] = plan
+            while len(_cache) > MAX_CACHED_LAYOUTS:
+                _cache.popitem(last=False)
+
+    translated = translate_layout(plan, offset, options.get('copyright_bottom_padding_px', 20))
+    if (translated.tracklist_offset, translated.copyright_padding) != (plan.tracklist_offset, plan.copyright_padding):
+        with _cache_lock:
+            _stats["translated"] += 1
+        render_report.count("layout_translated")
+    return translated
+
+def cache_stats():
+    """Yerleşim önbelleğinin isabet/ıska/kaydırma sayaçlarını ve doluluğunu döndürür."""
+    with _cache_lock:
+        return dict(_stats, cached_layouts=len(_cache))
+
+def clear_cache():
+    """Yerleşim önbelleğini ve sayaçlarını sıfırlar."""
+    with _cache_lock:
+        _cache.clear()
+        for counter in _stats:
+            _stats[counter] = 0
@@ -0,0 +1,265 @@
+# print_render.py
+# Baskı çözünürlüğünde (ör. A2, 300 DPI -> 4961x7016) poster üretimi.
+# Bu boyutta tek bir RGB tuval ~100 MB, PNG kodlaması için kopyası da bir o kadar yer tutar.
+# Burada yerleşim planı (poster_layout) bir kez hesaplanır, poster yatay bantlar halinde çizilir
+# ve her bant zlib ile sıkıştırılarak doğrudan PNG dosyasına yazılır; bellekte aynı anda
+# yalnızca bir bant bulunur.
+#
+# Bellek bütçesi denetimi:
+#   python print_render.py examples/spotify.json --artwork cover.jpg --paper A2 --dpi 300 --budget-mb 300
+
+import os
+import sys
+import math
+import zlib
+import struct
+import logging
+import argparse
+from PIL import Image, ImageDraw
+
+import poster_core
+import poster_layout
+import json_stream
+import artwork_loader
+import render_report
+
+try:
+    import resource # Yalnızca POSIX; bellek bütçesi denetimi için en yüksek RSS
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan bant yüksekliği (satır)
+DEFAULT_BAND_HEIGHT = 256
+
+# Sıkıştırılmış veri bu boyuta ulaştığında bir IDAT parçası yazılır
+IDAT_CHUNK_SIZE = 256 * 1024
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+class PngStreamWriter:
+    """
+    RGB satırlarını sırayla alıp PNG dosyasına akış halinde yazan yazıcı.
+
+    Args:
+        fp: İkili modda açık dosya.
+        width, height (int): Resim boyutu.
+        dpi (float or None): Verilirse pHYs parçasına yazılır (baskı programları boyutu buradan okur).
+        compress_level (int): zlib sıkıştırma düzeyi (0-9).
+    """
+
+    def __init__(self, fp, width, height, dpi=None, compress_level=6):
+        self.fp = fp
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending = []
+        self._pending_size = 0
+        fp.write(PNG_SIGNATURE)
+        # Bit derinliği 8, renk tipi 2 (RGB), sıkıştırma 0, filtre 0, taramasız
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        if dpi:
+            pixels_per_meter = int(round(dpi / 0.0254))
+            self._write_chunk(b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1))
+
+    def _write_chunk(self, chunk_type, data):
+        """Tek bir PNG parçasını (uzunluk, tür, veri, CRC) yazar."""
+        self.fp.write(struct.pack(">I", len(data)))
+        self.fp.write(chunk_type)
+        self.fp.write(data)
+        self.fp.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
+
+    def _emit(self, compressed):
+        """Sıkıştırılmış veriyi biriktirir; yeterince biriktiğinde IDAT parçası olarak yazar."""
+        if compressed:
+            self._pending.append(compressed)
+            self._pending_size += len(compressed)
+        if self._pending_size >= IDAT_CHUNK_SIZE:
+            self._write_chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def write_band(self, band):
+        """RGB bir bant resminin satırlarını (filtre türü 0 ile) sıkıştırıp yazar."""
+        if band.mode != "RGB" or band.size[0] != self.width:
+            raise ValueError("Bant, yazıcıyla aynı genişlikte RGB bir resim olmalı.")
+        if self.rows_written + band.size[1] > self.height:
+            raise ValueError("Resmin yüksekliğinden fazla satır yazılamaz.")
+        row_bytes = self.width * 3
+        data = band.tobytes()
+        for start in range(0, len(data), row_bytes):
+            self._emit(self._compressor.compress(b"\x00"))
+            self._emit(self._compressor.compress(data[start:start + row_bytes]))
+        self.rows_written += band.size[1]
+
+    def close(self):
+        """Kalan veriyi ve IEND parçasını yazar."""
+        if self.rows_written != self.height:
+            raise ValueError(f"{self.height} satır bekleniyordu, {self.rows_written} satır yazıldı.")
+        self._pending.append(self._compressor.flush())
+        self._pending_size = IDAT_CHUNK_SIZE
+        self._emit(b"")
+        self._write_chunk(b"IEND", b"")
+
+def _run_extent(font, run):
+    """Metin parçasının dikey olarak kaplayabileceği (üst, alt) aralığı font ölçüleriyle güvenli biçimde tahmin eder."""
+    try:
+        ascent, descent = font.getmetrics()
+        margin = getattr(font, "size", ascent)
+    except Exception:
+        return (-math.inf, math.inf)
+    anchor = run.anchor or "la"
+    if anchor[1] == "s": # taban çizgisi
+        return (run.y - ascent - margin, run.y + descent + margin)
+    return (run.y - margin, run.y + ascent + descent + margin)
+
+def _draw_operations(plan, albumart_image, palette_method, fonts_cache):
+    """
+    Planı (üst, alt, metin y'si, çizim fonksiyonu) işlemlerine çevirir; sıra poster_core'daki çizim sırasıyla aynıdır.
+    Metin y'si yalnızca metinler için verilir (diğerleri için None). Çizim fonksiyonları (draw, bant resmi,
+    bandın üst kenarı) alır.
+    """
+    operations = []
+
+    if albumart_image:
+        box = plan.artwork_box
+        operations.append((box.y0, box.y0 + albumart_image.size[1], None,
+                           lambda draw, band, top: band.paste(albumart_image, (box.x0, box.y0 - top))))
+
+    divider = plan.divider
+    operations.append((divider.y0, divider.y1 + 1, None,
+                       lambda draw, band, top: draw.rectangle([divider.x0, divider.y0 - top, divider.x1, divider.y1 - top], fill=(0, 0, 0))))
+
+    def text_operation(run, font):
+        top, bottom = _run_extent(font, run)
+        kwargs = {"anchor": run.anchor} if run.anchor else {}
+        return (top, bottom, run.y, lambda draw, band, band_top: draw.text((run.x, run.y - band_top), run.text, font=font, fill=(0, 0, 0), **kwargs))
+
+    if plan.tracks:
+        font_tracks = poster_layout.load_font(fonts_cache, plan.tracks[0].font)
+        operations.extend(text_operation(run, font_tracks) for run in plan.tracks)
+
+    operations.append(text_operation(plan.album_name, poster_layout.load_font(fonts_cache, plan.album_name.font)))
+
+    if albumart_image:
+        domcolors = poster_core.get_colors(albumart_image, count=len(plan.swatches), method=palette_method)
+        for color, rect in zip(domcolors, plan.swatches):
+            if isinstance(color, tuple) and len(color) == 3:
+                operations.append((rect.y0, rect.y1 + 1, None,
+                                   lambda draw, band, top, rect=rect, color=color: draw.rectangle(
+                                       [(rect.x0, rect.y0 - top), (rect.x1, rect.y1 - top)], fill=color)))
+
+    operations.append(text_operation(plan.artist, poster_layout.load_font(fonts_cache, plan.artist.font)))
+
+    if plan.copyright is not None:
+        operations.append(text_operation(plan.copyright, poster_layout.load_font(fonts_cache, plan.copyright.font)))
+    return operations
+
+def render_poster_to_file(album_data, albumart_image, options, output, band_height=DEFAULT_BAND_HEIGHT, dpi=None):
+    """
+    Posteri bantlar halinde çizip PNG olarak akış halinde yazar; sonuç create_album_poster ile aynıdır.
+
+    Args:
+        album_data (album_model.Album or dict): Albüm.
+        albumart_image (PIL.Image.Image or None): get_artwork_size boyutunda RGB kapak.
+        options (dict): create_album_poster seçenekleri ('poster_size' 'A2@300dpi' gibi bir baskı boyutu olabilir).
+        output (str or file): Hedef dosya yolu veya ikili modda açık dosya.
+        band_height (int): Tek seferde çizilen satır sayısı.
+        dpi (float or None): PNG'ye yazılacak çözünürlük.
+
+    Returns:
+        tuple or None: Posterin (genişlik, yükseklik) boyutu; albüm verisi yoksa None.
+    """
+    if not album_data:
+        render_report.log_event(logger, logging.ERROR, "no_album_data", "Poster oluşturmak için albüm verisi sağlanmadı.")
+        return None
+
+    plan = poster_core.get_layout(album_data, options)
+    fonts_cache = poster_core.get_font_manager()
+    operations = _draw_operations(plan, albumart_image, options.get('palette_method', 'adaptive'), fonts_cache)
+    width, height = plan.size
+
+    close_output = isinstance(output, (str, os.PathLike))
+    fp = open(output, "wb") if close_output else output
+    try:
+        writer = PngStreamWriter(fp, width, height, dpi=dpi)
+        for band_top in range(0, height, band_height):
+            band_bottom = min(height, band_top + band_height)
+            band_operations = [(text_y, operation) for top, bottom, text_y, operation in operations
+                               if bottom >= band_top and top < band_bottom]
+            # Pillow metin konumunun kesirli kısmını math.modf ile ayırır; negatif bir y farklı bir alt piksel
+            # kaydırmasıyla çizilirdi. Bandın üstünden taşan metinler için bant yukarı doğru genişletilir ve
+            # fazlalık yazılmadan atılır; böylece her metin tuvaldeki ile aynı biçimde rasterleştirilir.
+            margin = max([math.ceil(band_top - text_y) for text_y, _ in band_operations
+                          if text_y is not None and text_y < band_top] or [0])
+            origin = band_top - margin
+            band = Image.new("RGB", (width, band_bottom - origin), color=(255, 255, 255))
+            draw = ImageDraw.Draw(band)
+            for _, operation in band_operations:
+                operation(draw, band, origin)
+            writer.write_band(band.crop((0, margin, width, band.size[1])) if margin else band)
+            del draw, band
+        writer.close()
+    finally:
+        if close_output:
+            fp.close()
+    return (width, height)
+
+def _load_album(json_path):
+    """JSON dosyasını akış halinde okuyup Album döndürür."""
+    with open(json_path, 'rb') as f:
+        album_data_raw, track_items = json_stream.read_album_json(f)
+    album, _ = poster_core.normalize_album_data(album_data_raw, track_items=track_items)
+    return album
+
+def peak_rss_mb():
+    """Sürecin başlangıcından beri en yüksek yerleşik bellek kullanımını (MB) döndürür; ölçülemiyorsa None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux kilobayt, macOS bayt cinsinden döndürür
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="python print_render.py",
+        description="Render a poster at print resolution in bands, streaming the PNG to disk, and check peak memory.")
+    parser.add_argument("json", help="Album JSON file (Spotify API response or rip.json).")
+    parser.add_argument("-o", "--output", default="poster_print.png", help="Output PNG path.")
+    parser.add_argument("--paper", choices=sorted(poster_layout.PAPER_SIZES_MM), default="A2", help="Paper size (default: A2).")
+    parser.add_argument("--dpi", type=float, default=300, help="Print resolution (default: 300).")
+    parser.add_argument("--artwork", help="Cover image file.")
+    parser.add_argument("--band-height", type=int, default=DEFAULT_BAND_HEIGHT, help="Rows drawn at once.")
+    parser.add_argument("--budget-mb", type=float, help="Fail (exit 1) if the process's peak RSS exceeds this many MB.")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    album = _load_album(args.json)
+    if album is None:
+        print(f"'{args.json}' JSON biçimi tanınmadı.")
+        return 1
+
+    poster_size = poster_layout.print_size_key(args.paper, args.dpi)
+    options = {'poster_size': poster_size}
+
+    # Kapak da bütçeye dahildir: baskı boyutunda kapağın kendisi de onlarca MB tutar
+    artwork = artwork_loader.prepare_artwork(args.artwork, poster_layout.get_artwork_size(poster_size)) if args.artwork else None
+    size = render_poster_to_file(album, artwork, options, args.output, band_height=args.band_height, dpi=args.dpi)
+
+    full_canvas_mb = size[0] * size[1] * 3 / (1024 * 1024)
+    print(f"{args.output}: {size[0]}x{size[1]} ({args.paper}, {args.dpi:g} DPI), tek tuval {full_canvas_mb:.1f} MB olurdu")
+    peak_mb = peak_rss_mb()
+    if peak_mb is not None:
+        print(f"Sürecin en yüksek bellek kullanımı (RSS): {peak_mb:.1f} MB")
+    if args.budget_mb is not None and peak_mb is None:
+        print("Bu platformda en yüksek RSS ölçülemiyor; bellek bütçesi denetlenmedi.")
+    elif args.budget_mb is not None and peak_mb > args.budget_mb:
+        print(f"Bellek bütçesi aşıldı: {peak_mb:.1f} MB > {args.budget_mb:g} MB")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
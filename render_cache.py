@@ -0,0 +1,285 @@
+# render_cache.py
+# Kodlanmış posterleri girdilerin içerik özetine göre diskte saklayan önbellek.
+# Aynı normalleştirilmiş albüm, aynı kapak baytları, aynı seçenekler, aynı font dosyaları ve aynı kodlama
+# ayarları her zaman aynı dosyayı üretir; anahtar bu girdilerin ve poster_core.RENDERER_VERSION'ın özetidir.
+# İsabette poster çizilmez ve kodlanmaz; kayıtlı baytlar olduğu gibi döndürülür.
+#
+# Her kayıt ayrı bir dosyadır ve paylaşılan bir indeks yoktur: yazımlar geçici dosya + os.replace ile atomiktir,
+# son kullanım zamanı dosyanın mtime'ıdır ve toplam boyut sınırı aşıldığında en uzun süredir kullanılmayan
+# kayıtlar silinir. Bu yüzden aynı klasörü birden çok süreç (toplu işlem işçileri, GUI, render servisi) paylaşabilir.
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+
+import poster_core
+import poster_export
+import render_report
+from album_model import as_album
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan önbellek klasörü (POSTER_RENDER_CACHE_DIR ortam değişkeni ile değiştirilebilir)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "spotify_poster_maker", "renders")
+
+# Varsayılan toplam önbellek boyutu sınırı (bayt)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Diğer süreçlerin yazdıkları da hesaba katılsın diye klasör en geç bu kadar yazımda bir yeniden taranır
+RESCAN_EVERY_WRITES = 32
+
+# Bir kaydın mtime'ı en fazla bu sıklıkta güncellenir (saniye); sık istenen kayıtlarda her isabette yazılmaz
+TOUCH_INTERVAL = 60
+
+_font_digests = {}
+_font_digests_lock = threading.Lock()
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def font_digest(paths=None):
+    """
+    Font dosyalarının içerik özetini döndürür.
+    paths verilmezse poster_core.font_paths() kullanılır. Dosya boyutu ve mtime değişmedikçe süreç içinde yeniden okunmaz.
+    """
+    paths = sorted(set(paths if paths is not None else poster_core.font_paths().values()))
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append((path, None, None))
+    signature = tuple(signature)
+    with _font_digests_lock:
+        digest = _font_digests.get(signature)
+    if digest is None:
+        hasher = hashlib.blake2b(digest_size=16)
+        for path, size, _ in signature:
+            hasher.update(os.path.basename(path).encode("utf-8"))
+            if size is not None:
+                with open(path, "rb") as f:
+                    hasher.update(f.read())
+        digest = hasher.hexdigest()
+        with _font_digests_lock:
+            _font_digests[signature] = digest
+    return digest
+
+def artwork_digest(source):
+    """
+    Kapağın içerik özetini döndürür; kapak çözülmez.
+
+    Args:
+        source: Dosya yolu, bayt dizisi, dosya benzeri nesne, PIL resmi veya None.
+    """
+    if source is None:
+        return None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _digest(bytes(source))
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return _digest(f.read())
+    if hasattr(source, "read"):
+        position = source.tell() if hasattr(source, "tell") else None
+        data = source.read()
+        if position is not None:
+            source.seek(position)
+        return _digest(data)
+    # Zaten çözülmüş bir resim verildiyse piksel özeti kullanılır
+    import palette
+    return "image:" + palette.object_fingerprint(source)
+
+def canonical_options(options):
+    """Seçenekleri anahtar sırasından ve demet/liste farkından bağımsız JSON metnine çevirir."""
+    return json.dumps(options or {}, sort_keys=True, ensure_ascii=True, separators=(",", ":"), default=str)
+
+def render_key(album_data, artwork, options, settings=poster_export.DEFAULT_SETTINGS):
+    """
+    Posteri belirleyen tüm girdilerin kararlı özetini döndürür; süreçler ve oturumlar arasında aynıdır.
+
+    Args:
+        album_data (album_model.Album or dict): Normalleştirilmiş albüm.
+        artwork (str or None): artwork_digest ile hesaplanmış kapak özeti.
+        options (dict): create_album_poster seçenekleri.
+        settings (poster_export.EncodeSettings): Kodlama ayarları.
+    """
+    album = as_album(album_data)
+    payload = "\n".join([
+        str(poster_core.RENDERER_VERSION),
+        poster_core.Image.__version__,
+        album.fingerprint() if album else "",
+        artwork or "",
+        canonical_options(options),
+        json.dumps(list(settings)),
+        font_digest(),
+    ])
+    return _digest(payload.encode("utf-8"))
+
+class RenderCache:
+    """
+    Kodlanmış posterler için boyutu sınırlı, süreçler arasında paylaşılabilir disk önbelleği.
+
+    Args:
+        cache_dir (str or None): Önbellek klasörü. None ise POSTER_RENDER_CACHE_DIR veya DEFAULT_CACHE_DIR.
+        max_bytes (int): Kayıtların toplam boyut sınırı.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.environ.get("POSTER_RENDER_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._approx_bytes = None
+        self._writes_since_scan = 0
+        self.stats_counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    def _path(self, key, settings):
+        """Kaydın yolu; uzantı biçimden gelir, böylece dosyalar doğrudan açılabilir."""
+        extension = poster_export.FORMATS[poster_export.normalize_format(settings.format)][1]
+        return os.path.join(self.cache_dir, key[:2], key + extension)
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self.stats_counters[counter] += amount
+
+    def get(self, key, settings=poster_export.DEFAULT_SETTINGS):
+        """
+        Kayıtlı kodlanmış posteri döndürür (yoksa None). Pillow kullanılmaz.
+
+        Returns:
+            poster_export.EncodedImage or None: encode_ms alanı 0'dır.
+        """
+        path = self._path(key, settings)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self._count("misses")
+            return None
+        try:
+            # mtime son kullanım zamanıdır (LRU); başka bir süreç kaydı bu arada silmiş olabilir
+            if time.time() - os.stat(path).st_mtime > TOUCH_INTERVAL:
+                os.utime(path)
+        except OSError:
+            pass
+        self._count("hits")
+        fmt = poster_export.normalize_format(settings.format)
+        mime, extension = poster_export.FORMATS[fmt]
+        return poster_export.EncodedImage(data, settings._replace(format=fmt), mime, extension, 0.0)
+
+    def put(self, key, encoded):
+        """Kodlanmış posteri atomik olarak yazar ve gerekirse eski kayıtları siler."""
+        if len(encoded.data) > self.max_bytes:
+            return
+        path = self._path(key, encoded.settings)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(encoded.data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            self._count("errors")
+            render_report.log_event(logger, logging.WARNING, "render_cache_write_error", f"Poster önbelleğine yazılamadı: {e}",
+                                    path=path, error=str(e))
+            return
+        with self._lock:
+            self.stats_counters["writes"] += 1
+            self._writes_since_scan += 1
+            if self._approx_bytes is not None:
+                self._approx_bytes += len(encoded.data)
+            needs_scan = (self._approx_bytes is None or self._approx_bytes > self.max_bytes
+                          or self._writes_since_scan >= RESCAN_EVERY_WRITES)
+        if needs_scan:
+            self._evict()
+
+    def _entries(self):
+        """(mtime, boyut, yol) kayıt listesi; yarım kalmış geçici dosyalar sayılmaz."""
+        entries = []
+        try:
+            shards = list(os.scandir(self.cache_dir))
+        except OSError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                for entry in os.scandir(shard.path):
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self):
+        """Klasörü tarar; toplam boyut sınırı aşıldıysa en uzun süredir kullanılmayan kayıtları siler."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    evicted += 1
+                except FileNotFoundError:
+                    pass # Başka bir süreç zaten silmiş
+                except OSError:
+                    continue
+                total -= size
+        with self._lock:
+            self._approx_bytes = total
+            self._writes_since_scan = 0
+            self.stats_counters["evictions"] += evicted
+
+    def total_bytes(self):
+        """Önbellekteki kayıtların toplam boyutunu (klasörü tarayarak) döndürür."""
+        return sum(size for _, size, _ in self._entries())
+
+    def stats(self):
+        """Bu süreçteki sayaçları ve önbelleğin doluluğunu sözlük olarak döndürür."""
+        entries = self._entries()
+        with self._lock:
+            stats = dict(self.stats_counters)
+        stats["entries"] = len(entries)
+        stats["bytes"] = sum(size for _, size, _ in entries)
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+    def clear(self):
+        """Önbellekteki tüm kayıtları siler."""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._approx_bytes = 0
+
+_default_caches = {}
+_default_caches_lock = threading.Lock()
+
+def get_cache(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Klasör başına süreç genelinde paylaşılan RenderCache nesnesini döndürür."""
+    key = (cache_dir, max_bytes)
+    with _default_caches_lock:
+        cache = _default_caches.get(key)
+        if cache is None:
+            cache = _default_caches[key] = RenderCache(cache_dir, max_bytes)
+        return cache
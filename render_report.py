@@ -0,0 +1,185 @@
+# render_report.py
+# create_album_poster için isteğe bağlı ölçüm (instrumentation) yüzeyi.
+# Bir RenderReport verildiğinde (veya bir metrik kancası kayıtlıysa) çizim sırasında aşama süreleri,
+# font/yerleşim/katman/palet önbelleği isabetleri, font boyutu aramalarındaki deneme sayıları,
+# seçilen boyutlar ve varsayılana dönme olayları bu rapora yazılır. Etkin rapor bir ContextVar'da
+# tutulur; rapor yokken her ölçüm noktası yalnızca bir ContextVar okumasıdır.
+#
+# Uyarılar ve olaylar print yerine logging ile yazılır. Kayıtlarda 'event' (olay adı) ve 'fields'
+# (olayın alanları) öznitelikleri bulunur; bir logging.Handler bunları yapılandırılmış olarak işleyebilir.
+
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("render_report", default=None)
+_hooks = []
+_hooks_lock = threading.Lock()
+
+# Rapor yokken phase() tarafından döndürülen, hiçbir şey yapmayan bağlam yöneticisi
+_NO_PHASE = nullcontext()
+
+class RenderReport:
+    """
+    Tek bir poster çiziminin ölçüm raporu.
+
+    Attributes:
+        phases (dict): Aşama adı -> süre (ms); iç içe aşamalar 'render.header' gibi adlandırılır.
+        counters (dict): Önbellek isabet/ıska ve benzeri sayaçlar.
+        sizing (dict): Boyut araması adı -> denenen boyut sayısı.
+        sizes (dict): Seçilen font boyutları ve poster boyutu.
+        events (list): Varsayılana dönme ve hata olayları; her biri {'event', 'level', 'message', ...} sözlüğü.
+        total_ms (float or None): Toplam süre (finish çağrıldıktan sonra).
+    """
+
+    __slots__ = ("phases", "counters", "sizing", "sizes", "events", "total_ms", "_started", "_stack")
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.sizing = {}
+        self.sizes = {}
+        self.events = []
+        self.total_ms = None
+        self._started = time.perf_counter()
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        """Bloğun süresini name aşamasına ekler."""
+        self._stack.append(name)
+        full_name = ".".join(self._stack)
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[full_name] = self.phases.get(full_name, 0.0) + (time.perf_counter() - started) * 1000
+            self._stack.pop()
+
+    def count(self, name, amount=1):
+        """name sayacını amount kadar artırır."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_event(self, event, level, message, fields):
+        """Bir olay kaydeder."""
+        self.events.append(dict(fields, event=event, level=logging.getLevelName(level), message=message))
+
+    def finish(self):
+        """Toplam süreyi sabitler ve raporu döndürür."""
+        self.total_ms = (time.perf_counter() - self._started) * 1000
+        return self
+
+    @property
+    def fallbacks(self):
+        """Uyarı ve hata düzeyindeki olaylar."""
+        return [event for event in self.events if event["level"] in ("WARNING", "ERROR")]
+
+    def as_dict(self):
+        """Raporu JSON'a yazılabilir bir sözlük olarak döndürür."""
+        return {
+            "total_ms": self.total_ms,
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+            "sizing": dict(self.sizing),
+            "sizes": dict(self.sizes),
+            "events": [dict(event) for event in self.events],
+        }
+
+    def __repr__(self):
+        total = f"{self.total_ms:.1f} ms" if self.total_ms is not None else "açık"
+        return f"RenderReport({total}, phases={len(self.phases)}, events={len(self.events)})"
+
+def current():
+    """Etkin raporu döndürür (yoksa None)."""
+    return _current.get()
+
+@contextmanager
+def activate(report):
+    """report'u bu bağlam (iş parçacığı veya görev) için etkin rapor yapar."""
+    token = _current.set(report)
+    try:
+        yield report
+    finally:
+        _current.reset(token)
+
+def phase(name):
+    """Etkin rapor varsa name aşamasını ölçen, yoksa hiçbir şey yapmayan bağlam yöneticisi döndürür."""
+    report = _current.get()
+    return report.phase(name) if report is not None else _NO_PHASE
+
+def count(name, amount=1):
+    """Etkin rapor varsa name sayacını artırır."""
+    report = _current.get()
+    if report is not None:
+        report.count(name, amount)
+
+def set_size(name, value):
+    """Etkin rapor varsa seçilen bir boyutu kaydeder."""
+    report = _current.get()
+    if report is not None:
+        report.sizes[name] = value
+
+def counted(fits, label):
+    """
+    Boyut araması koşulunu, her çağrıyı rapordaki sizing[label] sayacına ekleyecek şekilde sarar.
+    Etkin rapor yoksa fits olduğu gibi döndürülür.
+    """
+    report = _current.get()
+    if report is None:
+        return fits
+    sizing = report.sizing
+    sizing.setdefault(label, 0)
+
+    def counting_fits(size):
+        sizing[label] += 1
+        return fits(size)
+    return counting_fits
+
+def log_event(log, level, event, message, **fields):
+    """
+    Olayı log ile yazar ('event' ve 'fields' öznitelikleriyle) ve etkin rapor varsa rapora ekler.
+
+    Args:
+        log (logging.Logger): Modülün logger'ı.
+        level (int): logging düzeyi.
+        event (str): Makinece okunabilir olay adı (ör. 'tracklist_size_fallback').
+        message (str): İnsan için ileti.
+        **fields: Olayın ek alanları.
+    """
+    log.log(level, message, extra={"event": event, "fields": fields})
+    report = _current.get()
+    if report is not None:
+        report.record_event(event, level, message, fields)
+
+def add_hook(hook):
+    """
+    Her ölçülen çizimden sonra tamamlanmış RenderReport ile çağrılacak bir metrik kancası ekler.
+    Kanca kayıtlıyken create_album_poster rapor istenmese de ölçüm yapar.
+    """
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks.append(hook)
+
+def remove_hook(hook):
+    """Metrik kancasını kaldırır."""
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+def hooks_enabled():
+    """Kayıtlı metrik kancası olup olmadığını döndürür."""
+    return bool(_hooks)
+
+def publish(report):
+    """Raporu kayıtlı kancalara verir; kancadaki hatalar çizimi etkilemez."""
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(report)
+        except Exception:
+            logger.exception("Metrik kancası hata verdi", extra={"event": "metrics_hook_error", "fields": {}})
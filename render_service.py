@@ -0,0 +1,869 @@
+# render_service.py
+# create_album_poster'ı saran yerel HTTP çizim servisi.
+# İstekler normalleştirilmiş albüm JSON'u (veya ham Spotify/rip JSON'u), base64 kapak baytları ya da kapak URL'si
+# ve seçeneklerle gelir; çizim, fontları önceden yüklenmiş işçi süreçlerden oluşan bir havuzda yapılır.
+# Sınırlı bir kuyruk dolduğunda istek beklemek yerine 503 ile reddedilir (geri basınç). Yanıtlar girdilerin
+# özetinden üretilen bir ETag taşır ve bellekteki bir yanıt önbelleğinden sunulur; aynı anda gelen aynı istekler
+# tek bir çizimi paylaşır. Bellekteki önbelleğin altında toplu işlem ve GUI ile paylaşılan disk önbelleği
+# (render_cache) vardır; yeniden başlatmadan sonra da popüler posterler çizilmeden sunulur.
+# /metrics Prometheus metin biçiminde sayaçları, /healthz servis durumunu döndürür.
+#
+# Kullanım:
+#   python render_service.py serve --port 8765 --workers 4
+#   python render_service.py loadtest --url http://127.0.0.1:8765 --requests 200 --concurrency 8
+#
+# İstek (POST /render, application/json):
+#   {"album": {"name": ..., "artist": ..., "copyright": ..., "tracks": [{"name": ..., "duration_ms": ...}]},
+#    "artwork": "<base64>" | "artwork_url": "https://...",
+#    "options": {"poster_size": "A3", ...}, "format": "png", "quality": 95}
+# 'tracklist_overflow': 'pages' seçeneğinde "page" (1'den başlar) çizilecek sayfayı seçer; yanıttaki
+# X-Poster-Page başlığı sayfa numarasını ve sayfa sayısını ('2/5') verir.
+
+import os
+import sys
+import json
+import time
+import base64
+import logging
+import argparse
+import threading
+import http.client
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import urlsplit
+
+import palette
+import poster_core
+import poster_layout
+import artwork_loader
+import poster_export
+import render_report
+import render_cache
+from album_model import Album, Track
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Çalışan işçilerin dışında sırada bekleyebilecek en fazla çizim sayısı
+DEFAULT_QUEUE_SIZE = 16
+
+# Yanıt önbelleğinin varsayılan üst sınırı (MB, kodlanmış baytlar)
+DEFAULT_CACHE_MB = 256
+
+# Bir çizimin en uzun bekleme süresi (saniye); aşılırsa 504 döndürülür
+DEFAULT_RENDER_TIMEOUT = 120.0
+
+# Kabul edilen en büyük istek gövdesi (bayt); base64 kapaklar için yeterli
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+# Kabul edilen en büyük poster (piksel); A2@300dpi yaklaşık 35 milyon pikseldir
+MAX_POSTER_PIXELS = 40_000_000
+
+# Kuyruk dolu olduğunda istemciye önerilen bekleme süresi (saniye)
+RETRY_AFTER_SECONDS = 1
+
+# İstekte verilmeyen seçenekler için değerler (toplu işlem CLI'ının varsayılanlarıyla aynı)
+DEFAULT_OPTIONS = {
+    "poster_size": "A4",
+    "tracks_per_column": 6,
+    "tracklist_font_size_search_range": [10, 20],
+    "include_copyright": True,
+    "copyright_bottom_padding_px": 20,
+    "tracklist_horizontal_offset": 0,
+    "palette_colors": 5,
+    "palette_method": "adaptive",
+    "tracklist_overflow": "clip",
+    "min_tracklist_font_size": poster_layout.DEFAULT_MIN_TRACKLIST_SIZE,
+}
+
+# Tracklist font boyutlarının üst sınırı (ölçeklenmeden önce); çok daha büyükleri hiçbir postere sığmaz ve
+# sayfalama ölçümlerinde Pillow'un piksel sınırını (DecompressionBombError) aşar
+MAX_TRACKLIST_FONT_SIZE = 100
+
+# Tam sayı seçeneklerinin (en küçük, en büyük) sınırları; None sınır yok demektir
+INT_OPTION_RANGES = {
+    "tracks_per_column": (1, None),
+    "copyright_bottom_padding_px": (0, None),
+    "tracklist_horizontal_offset": (None, None),
+    "palette_colors": (1, 16), # Her renk için bir kutu çizilir; GUI en fazla 10 sunar
+    "min_tracklist_font_size": (1, MAX_TRACKLIST_FONT_SIZE),
+}
+
+# Kodlama alanlarının (istek alanı, EncodeSettings alanı, en küçük, en büyük) sınırları; Pillow'un kabul ettiği aralıklar
+SETTING_RANGES = (
+    ("quality", "quality", 1, 100),
+    ("png_compression", "compress_level", 0, 9),
+    ("png_colors", "png_colors", 2, 256),
+)
+
+# Metriklerde ayrı etiketlenen yollar; diğerleri 'other' olarak sayılır
+KNOWN_PATHS = ("/render", "/metrics", "/healthz")
+
+# Çizim süresi histogramının üst sınırları (saniye)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class RequestError(Exception):
+    """İstemciye belirli bir HTTP durum koduyla döndürülecek hata."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+# --- İstek ayrıştırma ---
+
+def parse_album(data):
+    """Normalleştirilmiş albüm sözlüğünü veya ham Spotify/rip JSON'unu Album'e çevirir; tanınmazsa RequestError."""
+    if not isinstance(data, dict):
+        raise RequestError(400, "'album' bir JSON nesnesi olmalı")
+    album = Album.from_raw(data)
+    if album is None and isinstance(data.get("tracks"), list):
+        album = Album.from_processed(data)
+    if album is None:
+        raise RequestError(400, "Albüm JSON biçimi tanınmadı")
+    return album
+
+def _check_int(name, value, low, high):
+    """Değerin [low, high] aralığında bir tam sayı olduğunu doğrular; değilse 400 ile RequestError."""
+    # JSON'da true/false bool'dur; bool int'in alt sınıfı olduğundan tam sayı alanlarında ayrıca reddedilir
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise RequestError(400, f"'{name}' bir tam sayı olmalı")
+    if low is not None and value < low:
+        raise RequestError(400, f"'{name}' en az {low} olmalı")
+    if high is not None and value > high:
+        raise RequestError(400, f"'{name}' en fazla {high} olmalı")
+
+def parse_options(data):
+    """İstekteki seçenekleri doğrular ve varsayılanlarla birleştirir."""
+    data = data or {}
+    if not isinstance(data, dict):
+        raise RequestError(400, "'options' bir JSON nesnesi olmalı")
+    unknown = sorted(set(data) - set(DEFAULT_OPTIONS))
+    if unknown:
+        raise RequestError(400, f"Bilinmeyen seçenek: {', '.join(unknown)}")
+    options = dict(DEFAULT_OPTIONS, **data)
+
+    poster_size = options["poster_size"]
+    if isinstance(poster_size, str) and poster_size not in poster_core.SIZE_PRESETS and "@" not in poster_size:
+        raise RequestError(400, f"Bilinmeyen poster boyutu: {poster_size}")
+    try:
+        width, height = poster_layout.resolve_poster_size(poster_size)
+    except (TypeError, ValueError):
+        raise RequestError(400, f"Geçersiz poster boyutu: {poster_size}")
+    if width <= 0 or height <= 0 or width * height > MAX_POSTER_PIXELS:
+        raise RequestError(400, f"Poster boyutu sınırların dışında: {width}x{height}")
+
+    font_range = options["tracklist_font_size_search_range"]
+    if not (isinstance(font_range, (list, tuple)) and len(font_range) == 2):
+        raise RequestError(400, "'tracklist_font_size_search_range' iki tam sayıdan oluşmalı")
+    for value in font_range:
+        _check_int("tracklist_font_size_search_range", value, 1, MAX_TRACKLIST_FONT_SIZE)
+    options["tracklist_font_size_search_range"] = list(font_range)
+    if options["tracklist_overflow"] not in poster_layout.OVERFLOW_MODES:
+        raise RequestError(400, f"'tracklist_overflow' şunlardan biri olmalı: {', '.join(poster_layout.OVERFLOW_MODES)}")
+
+    for name, (low, high) in INT_OPTION_RANGES.items():
+        _check_int(name, options[name], low, high)
+    if not isinstance(options["include_copyright"], bool):
+        raise RequestError(400, "'include_copyright' true veya false olmalı")
+    if options["palette_method"] not in palette.PALETTE_METHODS:
+        raise RequestError(400, f"'palette_method' şunlardan biri olmalı: {', '.join(palette.PALETTE_METHODS)}")
+    return options
+
+def parse_settings(data):
+    """İstekteki biçim alanlarından poster_export.EncodeSettings oluşturur."""
+    overrides = {}
+    for key, field, low, high in SETTING_RANGES:
+        if data.get(key) is not None:
+            _check_int(key, data[key], low, high)
+            overrides[field] = data[key]
+    if "lossless" in data:
+        overrides["lossless"] = bool(data["lossless"])
+    try:
+        return poster_export.make_settings(data.get("format") or "PNG", **overrides)
+    except ValueError as e:
+        raise RequestError(400, str(e))
+
+def load_artwork(data, fetch_url=None):
+    """
+    İstekteki kapağın baytlarını döndürür ('artwork' base64 veya 'artwork_url'; ikisi de yoksa None).
+
+    Args:
+        data (dict): İstek gövdesi.
+        fetch_url (callable or None): URL'den bayt indiren fonksiyon (varsayılan: artwork_cache'in paylaşılan deposu).
+    """
+    if data.get("artwork"):
+        try:
+            return base64.b64decode(data["artwork"], validate=True)
+        except (ValueError, TypeError):
+            raise RequestError(400, "'artwork' geçerli bir base64 dizesi değil")
+    url = data.get("artwork_url")
+    if not url:
+        return None
+    if urlsplit(url).scheme not in ("http", "https"):
+        raise RequestError(400, "'artwork_url' http veya https olmalı")
+    if fetch_url is None:
+        import artwork_cache
+        fetch_url = artwork_cache.get_default_store().get
+    try:
+        return fetch_url(url)
+    except Exception as e:
+        raise RequestError(502, f"Kapak indirilemedi: {e}")
+
+def request_key(album, artwork_bytes, options, settings):
+    """
+    Çıktıyı belirleyen tüm girdilerin kısa özetini döndürür; ETag, yanıt önbelleği ve disk önbelleği anahtarıdır.
+    Anahtar render_cache.render_key ile aynıdır, böylece toplu işlem ve GUI'nin yazdığı kayıtlar da kullanılır.
+    """
+    return render_cache.render_key(album, render_cache.artwork_digest(artwork_bytes or None), options, settings)
+
+def etag_matches(header, etag):
+    """If-None-Match başlığının etag ile eşleşip eşleşmediğini döndürür."""
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+# --- İşçi süreçler ---
+
+def _init_worker():
+    """İşçi süreç başlangıcında fontları belleğe alır; süreç ömrü boyunca önbellekte kalırlar."""
+    poster_core.get_font_manager().warm()
+
+def _warm_worker():
+    """Küçük bir poster çizerek işçinin çizim yolunu ısıtır ve süreç kimliğini döndürür."""
+    album = Album("Warm Up", "Render Service", None, [Track("Warm Up", 180000)])
+    poster_core.create_album_poster(album, None, DEFAULT_OPTIONS)
+    return os.getpid()
+
+def render_job(album, artwork_bytes, options, settings):
+    """
+    Posteri çizip kodlar (işçi süreçte çalışır).
+
+    Returns:
+        dict: 'data', 'mime', 'extension', 'render_ms', 'encode_ms', 'report' ve 'pid' anahtarları.
+    """
+    started = time.perf_counter()
+    albumart_image = None
+    if artwork_bytes:
+        albumart_image = artwork_loader.prepare_artwork(artwork_bytes, poster_core.get_artwork_size(options["poster_size"]))
+    report = render_report.RenderReport()
+    poster = poster_core.create_album_poster(album, albumart_image, options, report=report)
+    if poster is None:
+        raise RuntimeError("poster oluşturulamadı")
+    render_ms = (time.perf_counter() - started) * 1000
+    encoded = poster_export.encode_image(poster, settings)
+    return {
+        "data": encoded.data,
+        "mime": encoded.mime,
+        "extension": encoded.extension,
+        "render_ms": render_ms,
+        "encode_ms": encoded.encode_ms,
+        "report": report.as_dict(),
+        "pid": os.getpid(),
+    }
+
+def _forward_result(source, target):
+    """İşçi havuzundaki işin sonucunu veya hatasını yer tutucu Future'a aktarır."""
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+def cached_result(encoded):
+    """Disk önbelleğinden gelen EncodedImage'ı render_job sonucu biçimine çevirir."""
+    return {
+        "data": encoded.data,
+        "mime": encoded.mime,
+        "extension": encoded.extension,
+        "render_ms": 0.0,
+        "encode_ms": 0.0,
+        "report": {"phases": {}},
+        "pid": os.getpid(),
+    }
+
+# --- Önbellek ve metrikler ---
+
+class ResponseCache:
+    """Kodlanmış yanıtlar için bayt sınırlı LRU önbellek (anahtar: request_key)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        size = len(entry["data"])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old["data"])
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted["data"])
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+class ServiceMetrics:
+    """Servis sayaçları; /metrics için Prometheus metin biçiminde yazılır."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.renders = 0
+        self.render_failures = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.not_modified = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.encode_ms_sum = 0.0
+        self.phase_ms = {}
+
+    def record_request(self, path, status):
+        with self._lock:
+            key = (path, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def record_render(self, result, seconds):
+        with self._lock:
+            self.renders += 1
+            self.latency_count += 1
+            self.latency_sum += seconds
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self.latency_buckets[index] += 1
+            self.encode_ms_sum += result["encode_ms"]
+            for name, ms in result["report"]["phases"].items():
+                self.phase_ms[name] = self.phase_ms.get(name, 0.0) + ms
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def render_text(self, service):
+        """Metrikleri Prometheus metin biçiminde döndürür."""
+        cache = service.cache.stats()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP poster_service_{name} {help_text}")
+            lines.append(f"# TYPE poster_service_{name} {kind}")
+            for labels, value in samples:
+                label_text = "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""
+                lines.append(f"poster_service_{name}{label_text} {value}")
+
+        with self._lock:
+            metric("requests_total", "counter", "HTTP requests by path and status.",
+                   [((("path", path), ("status", status)), count) for (path, status), count in sorted(self.requests.items())])
+            metric("renders_total", "counter", "Posters rendered by the worker pool.", [((), self.renders)])
+            metric("render_failures_total", "counter", "Renders that raised an error.", [((), self.render_failures)])
+            metric("coalesced_total", "counter", "Requests that shared an identical in-flight render.", [((), self.coalesced)])
+            metric("rejected_total", "counter", "Requests rejected because the queue was full.", [((), self.rejected)])
+            metric("not_modified_total", "counter", "Requests answered with 304 Not Modified.", [((), self.not_modified)])
+            cumulative = [((("le", str(bound)),), count) for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)]
+            lines.append("# HELP poster_service_render_seconds Render and encode time in the worker, including queueing.")
+            lines.append("# TYPE poster_service_render_seconds histogram")
+            for labels, value in cumulative + [((("le", "+Inf"),), self.latency_count)]:
+                lines.append(f'poster_service_render_seconds_bucket{{le="{labels[0][1]}"}} {value}')
+            lines.append(f"poster_service_render_seconds_sum {self.latency_sum:.6f}")
+            lines.append(f"poster_service_render_seconds_count {self.latency_count}")
+            metric("encode_ms_sum", "counter", "Total encode time in milliseconds.", [((), f"{self.encode_ms_sum:.3f}")])
+            metric("phase_ms_sum", "counter", "Total render phase time in milliseconds (from render reports).",
+                   [((("phase", name),), f"{ms:.3f}") for name, ms in sorted(self.phase_ms.items())])
+        metric("cache_hits_total", "counter", "Response cache hits.", [((), cache["hits"])])
+        metric("cache_misses_total", "counter", "Response cache misses.", [((), cache["misses"])])
+        metric("cache_evictions_total", "counter", "Response cache evictions.", [((), cache["evictions"])])
+        metric("cache_entries", "gauge", "Responses in the cache.", [((), cache["entries"])])
+        metric("cache_bytes", "gauge", "Bytes held by the response cache.", [((), cache["bytes"])])
+        if service.disk_cache is not None:
+            disk = service.disk_cache.stats()
+            metric("disk_cache_hits_total", "counter", "Disk render cache hits.", [((), disk["hits"])])
+            metric("disk_cache_misses_total", "counter", "Disk render cache misses.", [((), disk["misses"])])
+            metric("disk_cache_evictions_total", "counter", "Disk render cache evictions by this process.",
+                   [((), disk["evictions"])])
+            metric("disk_cache_bytes", "gauge", "Bytes held by the disk render cache.", [((), disk["bytes"])])
+        metric("queue_depth", "gauge", "Renders running or waiting in the worker pool.", [((), service.queue_depth())])
+        metric("queue_capacity", "gauge", "Maximum renders running or waiting before requests are rejected.",
+               [((), service.capacity)])
+        metric("workers", "gauge", "Worker processes.", [((), service.workers)])
+        return "\n".join(lines) + "\n"
+
+# --- Servis ---
+
+class RenderService:
+    """
+    İşçi havuzu, yanıt önbelleği ve kuyruk sınırını bir arada tutar; HTTP katmanından bağımsızdır.
+
+    Args:
+        workers (int or None): İşçi süreç sayısı (None ise CPU sayısı).
+        queue_size (int): Çalışan işçilerin dışında sırada bekleyebilecek en fazla çizim.
+        cache_bytes (int): Yanıt önbelleğinin üst sınırı.
+        render_timeout (float): Bir çizimin en uzun bekleme süresi (saniye).
+        fetch_url (callable or None): Kapak URL'lerini indiren fonksiyon (bkz. load_artwork).
+        disk_cache (render_cache.RenderCache or None): Yanıt önbelleğinin altındaki kalıcı önbellek;
+            yeniden başlatmalardan sonra ve diğer süreçlerle paylaşılır. None ise kullanılmaz.
+    """
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE, cache_bytes=DEFAULT_CACHE_MB * 1024 * 1024,
+                 render_timeout=DEFAULT_RENDER_TIMEOUT, fetch_url=None, disk_cache=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.capacity = self.workers + max(0, queue_size)
+        self.render_timeout = render_timeout
+        self.fetch_url = fetch_url
+        self.cache = ResponseCache(cache_bytes)
+        self.disk_cache = disk_cache
+        self.metrics = ServiceMetrics()
+        self.started_at = time.time()
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._pending = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._pool = None
+
+    def start(self):
+        """İşçi süreçleri başlatır ve her birini ısıtır (fontlar yüklenir, küçük bir poster çizilir)."""
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        pids = {future.result() for future in [self._pool.submit(_warm_worker) for _ in range(self.workers)]}
+        logger.info("Render service workers ready: %s", sorted(pids))
+        return self
+
+    def close(self):
+        """İşçi havuzunu kapatır."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def queue_depth(self):
+        """Havuzda çalışan veya bekleyen çizim sayısı."""
+        with self._lock:
+            return self._pending
+
+    def prepare(self, data):
+        """
+        İstek gövdesini ayrıştırır ve (anahtar, iş) döndürür; iş render_job argümanlarıdır.
+        Geçersiz isteklerde RequestError fırlatılır.
+        """
+        if not isinstance(data, dict):
+            raise RequestError(400, "İstek gövdesi bir JSON nesnesi olmalı")
+        album = parse_album(data.get("album"))
+        options = parse_options(data.get("options"))
+        settings = parse_settings(data)
+        paginated = options["tracklist_overflow"] == "pages"
+        # Kapak indirme ve sayfalama ölçümleri HTTP iş parçacığında çalışır; sınırsız çoğalmamaları için
+        # süreleri boyunca bir kuyruk yuvası tutulur (kuyruk doluysa 503)
+        reserved = paginated or bool(data.get("artwork_url") and not data.get("artwork"))
+        if reserved:
+            self._acquire_slot()
+        try:
+            if paginated:
+                # Sayfalara bölme yalnızca ölçüm yapar; seçilen sayfanın albüm dilimi ve seçenekleri işçiye gönderilir
+                pages = poster_core.paginate(album, options)
+                page = data.get("page", 1)
+                if not isinstance(page, int) or not 1 <= page <= len(pages):
+                    raise RequestError(404 if isinstance(page, int) else 400, f"Sayfa 1 ile {len(pages)} arasında olmalı")
+                album, options = pages[page - 1]
+            artwork_bytes = load_artwork(data, self.fetch_url)
+        finally:
+            if reserved:
+                self._slots.release()
+        return request_key(album, artwork_bytes, options, settings), (album, artwork_bytes, options, settings)
+
+    def render(self, key, job):
+        """
+        Anahtarın yanıtını önbellekten döndürür veya işçi havuzunda çizdirir.
+
+        Returns:
+            tuple: (sonuç sözlüğü, kaynak); kaynak 'hit', 'disk', 'miss' veya 'shared'.
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, "hit"
+        if self.disk_cache is not None:
+            encoded = self.disk_cache.get(key, job[3])
+            if encoded is not None:
+                result = cached_result(encoded)
+                self.cache.put(key, result)
+                return result, "disk"
+
+        with self._lock:
+            future = self._inflight.get(key)
+            shared = future is not None
+            if not shared:
+                self._acquire_slot()
+                self._pending += 1
+                # Havuza gönderim (ve çökmüş havuzun yeniden kurulması) kilit dışında yapılır; aynı anda gelen
+                # aynı istekler bu yer tutucuyu bekler
+                future = Future()
+                self._inflight[key] = future
+        if shared:
+            self.metrics.increment("coalesced")
+        else:
+            started = time.perf_counter()
+            future.add_done_callback(lambda f: self._finished(key, job[3], f, started))
+            try:
+                self._submit(job).add_done_callback(lambda f: _forward_result(f, future))
+            except Exception as e:
+                future.set_exception(e)
+
+        try:
+            result = future.result(timeout=self.render_timeout)
+        except FutureTimeoutError:
+            raise RequestError(504, "Çizim zaman aşımına uğradı")
+        except BrokenProcessPool as e:
+            raise RequestError(500, f"İşçi süreç çöktü: {e}")
+        except Exception as e:
+            raise RequestError(500, f"{type(e).__name__}: {e}")
+        return result, "shared" if shared else "miss"
+
+    def _acquire_slot(self):
+        """Kuyrukta bir yuva ayırır; kuyruk doluysa 503 ile RequestError fırlatır."""
+        if not self._slots.acquire(blocking=False):
+            self.metrics.increment("rejected")
+            raise RequestError(503, "Kuyruk dolu", {"Retry-After": str(RETRY_AFTER_SECONDS)})
+
+    def _submit(self, job):
+        pool = self._pool
+        try:
+            return pool.submit(render_job, *job)
+        except BrokenProcessPool:
+            # Bir işçi çöktüyse (ör. bellek yetersizliği) havuz yeniden kurulur; aynı anda gelen gönderimler
+            # havuzu bir kez yeniden kurar
+            with self._pool_lock:
+                if self._pool is pool:
+                    logger.warning("Worker pool broken; restarting", extra={"event": "worker_pool_restart", "fields": {}})
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self.start()
+            return self._pool.submit(render_job, *job)
+
+    def _finished(self, key, settings, future, started):
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._pending -= 1
+        self._slots.release()
+        if future.cancelled() or future.exception() is not None:
+            self.metrics.increment("render_failures")
+            return
+        result = future.result()
+        self.cache.put(key, result)
+        if self.disk_cache is not None:
+            self.disk_cache.put(key, poster_export.EncodedImage(result["data"], settings, result["mime"],
+                                                                result["extension"], result["encode_ms"]))
+        self.metrics.record_render(result, time.perf_counter() - started)
+
+    def health(self):
+        """Servis durumunu sözlük olarak döndürür."""
+        return {
+            "status": "ok" if self._pool is not None else "stopped",
+            "workers": self.workers,
+            "queue_depth": self.queue_depth(),
+            "queue_capacity": self.capacity,
+            "cache": self.cache.stats(),
+            "disk_cache": self.disk_cache.stats() if self.disk_cache is not None else None,
+            "uptime_s": round(time.time() - self.started_at, 1),
+        }
+
+# --- HTTP katmanı ---
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """RenderService'i HTTP üzerinden sunan istek işleyici."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "PosterRenderService/1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+        path = urlsplit(self.path).path
+        self.service.metrics.record_request(path if path in KNOWN_PATHS else "other", status)
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), headers=headers)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self._send(200, self.service.metrics.render_text(self.service).encode("utf-8"),
+                       "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/healthz":
+            self._send_json(200, self.service.health())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/render":
+            self._drain()
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            data = self._read_json()
+            key, job = self.service.prepare(data)
+            etag = f'"{key}"'
+            if etag_matches(self.headers.get("If-None-Match"), etag):
+                # ETag girdilerden türetildiği için eşleşme, çizmeden yanıt vermeye yeter
+                self.service.metrics.increment("not_modified")
+                self._send(304, headers={"ETag": etag})
+                return
+            result, source = self.service.render(key, job)
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)}, headers=e.headers)
+            return
+        except Exception as e:
+            logger.exception("Render request failed")
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        headers = {"ETag": etag}
+        if job[2].get("tracklist_page"):
+            headers["X-Poster-Page"] = "{}/{}".format(*job[2]["tracklist_page"])
+        phases = result["report"]["phases"]
+        server_timing = [f"worker;dur={result['render_ms']:.1f}", f"encode;dur={result['encode_ms']:.1f}"]
+        server_timing += [f"{name.replace('.', '-')};dur={ms:.1f}" for name, ms in phases.items() if "." not in name]
+        self._send(200, result["data"], result["mime"], headers=dict(headers, **{
+            "Cache-Control": "no-cache",
+            "X-Cache": source.upper(),
+            "Server-Timing": ", ".join(server_timing),
+            "Content-Disposition": f'inline; filename="poster{result["extension"]}"',
+        }))
+
+    def _read_json(self):
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise RequestError(411, "Content-Length gerekli")
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise RequestError(413, f"İstek gövdesi çok büyük (en fazla {MAX_BODY_BYTES} bayt)")
+        try:
+            return json.loads(self.rfile.read(length))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise RequestError(400, f"Geçersiz JSON: {e}")
+
+    def _drain(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(min(length, MAX_BODY_BYTES))
+
+class RenderHTTPServer(ThreadingHTTPServer):
+    """Her bağlantıyı ayrı bir iş parçacığında işleyen, RenderService'e bağlı HTTP sunucusu."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service):
+        super().__init__(address, RenderRequestHandler)
+        self.service = service
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **service_options):
+    """Servisi başlatır ve durdurulana kadar istekleri işler."""
+    service = RenderService(**service_options).start()
+    server = RenderHTTPServer((host, port), service)
+    print(f"Render service listening on http://{host}:{server.server_address[1]} "
+          f"({service.workers} workers, queue {service.capacity - service.workers})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+# --- Yük testi ---
+
+def build_payloads(distinct, track_count=12, poster_size="A4", fmt="png", seed=0):
+    """Spotify olmadan yük testi için benchmark'ın sentetik albümlerinden istek gövdeleri üretir."""
+    import benchmark
+    payloads = []
+    for index in range(distinct):
+        album = Album.from_raw(benchmark.synthetic_album_raw(track_count, "varied", seed + index))
+        buffer = BytesIO()
+        benchmark.synthetic_artwork((640, 640), seed + index).save(buffer, format="JPEG", quality=90)
+        payloads.append(json.dumps({
+            "album": album.as_dict(),
+            "artwork": base64.b64encode(buffer.getvalue()).decode("ascii"),
+            "options": {"poster_size": poster_size},
+            "format": fmt,
+        }).encode("utf-8"))
+    return payloads
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+def load_test(url, payloads, requests_total, concurrency, revalidate=False):
+    """
+    Servise eşzamanlı istekler gönderir ve durum kodlarını, önbellek kaynaklarını ve gecikmeleri döndürür.
+
+    Args:
+        url (str): Servisin kök adresi (ör. http://127.0.0.1:8765).
+        payloads (list): İstek gövdeleri; sırayla dönüşümlü gönderilir.
+        requests_total (int): Toplam istek sayısı.
+        concurrency (int): Eşzamanlı bağlantı sayısı.
+        revalidate (bool): Daha önce alınan ETag'ler If-None-Match ile gönderilir.
+    """
+    parts = urlsplit(url)
+    counter = iter(range(requests_total))
+    counter_lock = threading.Lock()
+    etags = {}
+    statuses, sources, latencies = {}, {}, []
+    results_lock = threading.Lock()
+
+    def worker():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=DEFAULT_RENDER_TIMEOUT + 10)
+        while True:
+            with counter_lock:
+                index = next(counter, None)
+            if index is None:
+                break
+            payload_index = index % len(payloads)
+            headers = {"Content-Type": "application/json"}
+            if revalidate and payload_index in etags:
+                headers["If-None-Match"] = etags[payload_index]
+            started = time.perf_counter()
+            try:
+                connection.request("POST", "/render", body=payloads[payload_index], headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status, source = response.status, response.getheader("X-Cache", "-")
+                if response.getheader("ETag"):
+                    etags[payload_index] = response.getheader("ETag")
+            except (OSError, http.client.HTTPException) as e:
+                status, source = type(e).__name__, "-"
+                connection.close()
+            elapsed = (time.perf_counter() - started) * 1000
+            with results_lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                sources[source] = sources.get(source, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+        connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    return {
+        "requests": requests_total,
+        "seconds": seconds,
+        "throughput": requests_total / seconds if seconds else 0.0,
+        "statuses": statuses,
+        "sources": sources,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+    }
+
+# --- Komut satırı ---
+
+def build_arg_parser():
+    """Servis komut satırı ayrıştırıcısını oluşturur."""
+    parser = argparse.ArgumentParser(prog="python render_service.py",
+                                     description="Local HTTP poster render service and load tester.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the render service.")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST}).")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT}).")
+    serve_parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    serve_parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                              help=f"Renders allowed to wait for a worker before requests get 503 (default: {DEFAULT_QUEUE_SIZE}).")
+    serve_parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_MB,
+                              help=f"Response cache size in MB (default: {DEFAULT_CACHE_MB}).")
+    serve_parser.add_argument("--render-cache-dir", default=None,
+                              help="Disk render cache shared with batch and GUI (default: $POSTER_RENDER_CACHE_DIR "
+                                   "or ~/.cache/spotify_poster_maker/renders).")
+    serve_parser.add_argument("--render-cache-mb", type=float, default=render_cache.DEFAULT_MAX_BYTES / (1024 * 1024),
+                              help="Disk render cache size limit in MB (default: %(default)g).")
+    serve_parser.add_argument("--no-render-cache", action="store_true", help="Do not read or write the disk render cache.")
+    serve_parser.add_argument("--timeout", type=float, default=DEFAULT_RENDER_TIMEOUT,
+                              help=f"Seconds to wait for a render before answering 504 (default: {DEFAULT_RENDER_TIMEOUT:g}).")
+    serve_parser.add_argument("-v", "--verbose", action="store_true", help="Log every request.")
+
+    load_parser = commands.add_parser("loadtest", help="Send synthetic render requests to a running service.")
+    load_parser.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", help="Service address.")
+    load_parser.add_argument("-n", "--requests", type=int, default=100, help="Total requests (default: 100).")
+    load_parser.add_argument("-c", "--concurrency", type=int, default=4, help="Concurrent connections (default: 4).")
+    load_parser.add_argument("--distinct", type=int, default=10, help="Distinct synthetic albums; the rest are repeats (default: 10).")
+    load_parser.add_argument("--tracks", type=int, default=12, help="Tracks per synthetic album (default: 12).")
+    load_parser.add_argument("--size", default="A4", help="Poster size (default: A4).")
+    load_parser.add_argument("--format", default="png", choices=["png", "jpeg", "webp"], help="Output format (default: png).")
+    load_parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match with ETags already received.")
+    return parser
+
+def main(argv=None):
+    """Servis giriş noktası."""
+    args = build_arg_parser().parse_args(argv)
+    if args.command == "serve":
+        logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                            format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+        disk_cache = None
+        if not args.no_render_cache:
+            disk_cache = render_cache.RenderCache(args.render_cache_dir, int(args.render_cache_mb * 1024 * 1024))
+        serve(args.host, args.port, workers=args.workers, queue_size=args.queue_size,
+              cache_bytes=int(args.cache_mb * 1024 * 1024), render_timeout=args.timeout, disk_cache=disk_cache)
+        return 0
+
+    payloads = build_payloads(max(1, args.distinct), args.tracks, args.size, args.format)
+    result = load_test(args.url, payloads, args.requests, args.concurrency, args.revalidate)
+    print(f"{result['requests']} requests in {result['seconds']:.2f}s ({result['throughput']:.1f} req/s)")
+    print("status: " + ", ".join(f"{k}={v}" for k, v in sorted(result["statuses"].items(), key=str)))
+    print("cache:  " + ", ".join(f"{k}={v}" for k, v in sorted(result["sources"].items())))
+    print(f"latency (200): p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms")
+    return 0 if set(result["statuses"]) <= {200, 304, 503} else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# spotify_cache.py
+# spotipy istemcisinin önüne konan iki katmanlı (bellek + SQLite) meta veri önbelleği.
+# Streamlit her etkileşimde betiği baştan çalıştırdığından aynı arama ve albüm istekleri
+# tekrar tekrar yapılıyordu; bu katman tekrarlanan istekleri API'ye gitmeden yanıtlar.
+# Süresi dolmuş kayıtlar veritabanı açılırken ve belirli sayıda yazımda bir silinir; dosya sınırsız büyümez.
+
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import render_report
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan SQLite dosyası (POSTER_SPOTIFY_CACHE_PATH ortam değişkeni ile değiştirilebilir)
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".cache", "spotify_poster_maker", "spotify.sqlite")
+
+# Uç nokta başına varsayılan yaşam süreleri (saniye)
+DEFAULT_TTLS = {
+    "search": 60 * 60, # Arama sonuçları değişebilir: 1 saat
+    "album": 7 * 24 * 60 * 60, # Albüm bilgileri nadiren değişir: 1 hafta
+    "albums": 7 * 24 * 60 * 60,
+    "album_tracks": 7 * 24 * 60 * 60,
+    "next": 7 * 24 * 60 * 60, # Sayfalı yanıtların sonraki sayfaları
+}
+
+# Bellek katmanında tutulacak en fazla yanıt sayısı
+DEFAULT_MEMORY_ITEMS = 512
+
+# Uzun süre açık kalan süreçlerde (GUI, render servisi) süresi dolmuş kayıtlar bu kadar yazımda bir silinir
+PURGE_EVERY_WRITES = 256
+
+class CachedSpotify:
+    """
+    spotipy.Spotify (veya aynı metotlara sahip sahte bir istemci) için önbellekli sarmalayıcı.
+    search, album, albums, album_tracks ve next çağrıları önbelleğe alınır; diğer tüm
+    öznitelikler doğrudan istemciye iletilir.
+
+    Args:
+        client: Sarmalanan istemci.
+        db_path (str or None): SQLite dosyası. None ise POSTER_SPOTIFY_CACHE_PATH veya DEFAULT_DB_PATH;
+            ":memory:" yalnızca bellek içi bir veritabanı kullanır.
+        ttls (dict or None): Uç nokta başına yaşam süreleri (DEFAULT_TTLS üzerine yazılır).
+        memory_items (int): Bellek katmanının kapasitesi.
+    """
+
+    def __init__(self, client, db_path=None, ttls=None, memory_items=DEFAULT_MEMORY_ITEMS):
+        self.client = client
+        self.db_path = db_path or os.environ.get("POSTER_SPOTIFY_CACHE_PATH") or DEFAULT_DB_PATH
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.memory_items = memory_items
+        self._memory = OrderedDict() # anahtar -> (kaydedilme zamanı, yanıt)
+        self._lock = threading.RLock()
+        self._stats = {}
+        self._writes_since_purge = 0
+        self._db = self._open_db()
+        self.purge_expired()
+
+    def _open_db(self):
+        """SQLite veritabanını açar ve tabloyu oluşturur; açılamazsa yalnızca bellek katmanı kullanılır."""
+        try:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, endpoint TEXT, stored_at REAL, value TEXT)")
+            db.execute("CREATE INDEX IF NOT EXISTS responses_expiry ON responses (endpoint, stored_at)")
+            db.commit()
+            return db
+        except (sqlite3.Error, OSError) as e:
+            render_report.log_event(logger, logging.WARNING, "spotify_cache_unavailable",
+                                    f"Spotify önbellek veritabanı '{self.db_path}' açılamadı: {e}. Yalnızca bellek önbelleği kullanılıyor.",
+                                    path=self.db_path, error=str(e))
+            return None
+
+    def _count(self, endpoint, counter):
+        """Uç nokta için bir sayacı artırır."""
+        endpoint_stats = self._stats.setdefault(endpoint, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+        endpoint_stats[counter] += 1
+
+    def _remember(self, key, stored_at, value):
+        """Yanıtı bellek katmanına ekler ve kapasite aşıldıysa en eskisini çıkarır."""
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def cached_call(self, endpoint, fetch, *args, **kwargs):
+        """
+        endpoint için (args, kwargs) anahtarlı yanıtı önbellekten döndürür; yoksa fetch(*args, **kwargs) çağrılır.
+        Hatalı yanıtlar önbelleğe alınmaz.
+        """
+        key = endpoint + ":" + json.dumps([args, kwargs], sort_keys=True, default=str)
+        ttl = self.ttls.get(endpoint, 0)
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and now - cached[0] < ttl:
+                self._memory.move_to_end(key)
+                self._count(endpoint, "memory_hits")
+                return cached[1]
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT stored_at, value FROM responses WHERE key = ?", (key,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row and now - row[0] < ttl:
+                    value = json.loads(row[1])
+                    self._remember(key, row[0], value)
+                    self._count(endpoint, "disk_hits")
+                    return value
+            self._count(endpoint, "misses")
+
+        value = fetch(*args, **kwargs)
+        if ttl <= 0:
+            return value
+
+        purge = False
+        with self._lock:
+            stored_at = time.time()
+            self._remember(key, stored_at, value)
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO responses (key, endpoint, stored_at, value) VALUES (?, ?, ?, ?)",
+                                     (key, endpoint, stored_at, json.dumps(value)))
+                    self._db.commit()
+                    self._writes_since_purge += 1
+                    purge = self._writes_since_purge >= PURGE_EVERY_WRITES
+                except sqlite3.Error as e:
+                    render_report.log_event(logger, logging.WARNING, "spotify_cache_write_error",
+                                            f"Spotify yanıtı önbelleğe yazılamadı: {e}", endpoint=endpoint, error=str(e))
+        if purge:
+            self.purge_expired()
+        return value
+
+    # --- Önbelleğe alınan spotipy metotları ---
+
+    def search(self, q, limit=10, offset=0, type="track", market=None):
+        return self.cached_call("search", self.client.search, q, limit=limit, offset=offset, type=type, market=market)
+
+    def album(self, album_id, market=None):
+        if market is None:
+            return self.cached_call("album", self.client.album, album_id)
+        return self.cached_call("album", self.client.album, album_id, market=market)
+
+    def albums(self, albums, market=None):
+        if market is None:
+            return self.cached_call("albums", self.client.albums, list(albums))
+        return self.cached_call("albums", self.client.albums, list(albums), market=market)
+
+    def album_tracks(self, album_id, limit=50, offset=0, market=None):
+        return self.cached_call("album_tracks", self.client.album_tracks, album_id, limit=limit, offset=offset, market=market)
+
+    def next(self, result):
+        # Sonraki sayfa URL'si anahtar olarak yeterlidir; önceki sayfanın tamamı anahtara girmez
+        if not result or not result.get("next"):
+            return None
+        return self.cached_call("next", lambda url: self.client.next({"next": url}), result["next"])
+
+    def __getattr__(self, name):
+        # Önbelleğe alınmayan diğer tüm çağrılar istemciye iletilir
+        return getattr(self.client, name)
+
+    # --- İstatistikler ve bakım ---
+
+    def stats(self):
+        """Uç nokta başına ve toplam isabet/ıska sayaçlarını döndürür."""
+        with self._lock:
+            endpoints = {endpoint: dict(values) for endpoint, values in self._stats.items()}
+        totals = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        for values in endpoints.values():
+            for counter in totals:
+                totals[counter] += values[counter]
+        requests_total = sum(totals.values())
+        totals["hit_rate"] = ((totals["memory_hits"] + totals["disk_hits"]) / requests_total) if requests_total else 0.0
+        totals["api_calls"] = totals["misses"]
+        return {"endpoints": endpoints, "total": totals}
+
+    def purge_expired(self):
+        """
+        Yaşam süresi dolmuş kayıtları (ve yaşam süresi tanımlı olmayan uç noktaların kayıtlarını) SQLite katmanından
+        siler; silinen kayıt sayısını döndürür. Açılışta ve PURGE_EVERY_WRITES yazımda bir otomatik çağrılır.
+        """
+        if self._db is None:
+            return 0
+        now = time.time()
+        removed = 0
+        with self._lock:
+            self._writes_since_purge = 0
+            try:
+                for endpoint, ttl in self.ttls.items():
+                    cursor = self._db.execute("DELETE FROM responses WHERE endpoint = ? AND stored_at < ?", (endpoint, now - ttl))
+                    removed += cursor.rowcount
+                endpoints = list(self.ttls)
+                cursor = self._db.execute(f"DELETE FROM responses WHERE endpoint NOT IN ({', '.join('?' * len(endpoints))})",
+                                          endpoints)
+                removed += cursor.rowcount
+                self._db.commit()
+            except sqlite3.Error as e:
+                # Başka bir süreç veritabanını kilitli tutuyor olabilir; bir sonraki temizlikte tekrar denenir
+                render_report.log_event(logger, logging.WARNING, "spotify_cache_purge_error",
+                                        f"Spotify önbelleğinde süresi dolmuş kayıtlar silinemedi: {e}", error=str(e))
+        return removed
+
+    def clear(self):
+        """Her iki katmanı da boşaltır."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
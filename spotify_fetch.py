@@ -0,0 +1,160 @@
+# spotify_fetch.py
+# Toplu işler ve uzun albümler için Spotify albüm verisini eksiksiz çeken yardımcılar.
+# sp.album() yanıtı yalnızca parçaların ilk sayfasını içerir; uzun albümler ve kutu setleri
+# bu yüzden kesiliyordu. Burada albümler çoklu albüm uç noktasından 20'şerli gruplar halinde
+# alınır, kalan parça sayfaları sınırlı bir iş parçacığı havuzunda eşzamanlı çekilir ve
+# 429 (istek sınırı) yanıtlarında Retry-After süresi kadar beklenip tekrar denenir.
+# Yanıtta parça toplamı yoksa sayfalar 'next' bağlantısı bitene kadar sırayla çekilir.
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import poster_core
+import render_report
+
+logger = logging.getLogger(__name__)
+
+# Spotify'ın çoklu albüm uç noktasının tek istekte kabul ettiği en fazla kimlik sayısı
+MAX_ALBUMS_PER_REQUEST = 20
+
+# album_tracks uç noktasının sayfa başına döndürebildiği en fazla parça sayısı
+MAX_TRACKS_PER_PAGE = 50
+
+# Varsayılan eşzamanlı istek sayısı
+DEFAULT_WORKERS = 4
+
+def _retry_after_seconds(error, attempt, base_delay):
+    """429 hatası için beklenecek süreyi (Retry-After başlığı veya üstel geri çekilme) döndürür."""
+    headers = getattr(error, "headers", None) or {}
+    retry_after = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return base_delay * (2 ** attempt)
+
+def call_with_backoff(func, *args, max_retries=5, base_delay=1.0, sleep=time.sleep, **kwargs):
+    """
+    func(*args, **kwargs) çağrısını yapar; HTTP 429 hatasında bekleyip en fazla max_retries kez tekrar dener.
+    Diğer hatalar olduğu gibi fırlatılır.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if getattr(e, "http_status", None) != 429 or attempt >= max_retries:
+                raise
+            delay = _retry_after_seconds(e, attempt, base_delay)
+            render_report.log_event(logger, logging.WARNING, "spotify_rate_limited",
+                                    f"Spotify istek sınırına ulaşıldı (429). {delay:.1f} sn sonra tekrar denenecek.",
+                                    delay=delay, attempt=attempt + 1)
+            sleep(delay)
+            attempt += 1
+
+def _next_offset(tracks_page):
+    """Sayfadan sonraki ilk parçanın konumu."""
+    return (tracks_page.get("offset") or 0) + len(tracks_page.get("items") or [])
+
+def _remaining_page_offsets(tracks_page):
+    """
+    İlk parça sayfasından sonra çekilmesi gereken sayfaların başlangıç konumlarını döndürür.
+    Sonraki sayfa varken toplam eksik veya tutarsızsa konumlar bilinemez; None döndürülür.
+    """
+    total = tracks_page.get("total")
+    if not tracks_page.get("next"):
+        return []
+    start = _next_offset(tracks_page)
+    if isinstance(total, bool) or not isinstance(total, int) or total <= start:
+        return None
+    return list(range(start, total, MAX_TRACKS_PER_PAGE))
+
+def _walk_next_pages(client, album_id, tracks_page, retry_options):
+    """Toplam bilinmiyorsa kalan sayfaları 'next' bağlantısı bitene kadar sırayla çeker ve tek sayfa olarak döndürür."""
+    items = []
+    offset = _next_offset(tracks_page)
+    while tracks_page.get("next"):
+        tracks_page = call_with_backoff(client.album_tracks, album_id, limit=MAX_TRACKS_PER_PAGE, offset=offset,
+                                        **retry_options) or {}
+        page_items = tracks_page.get("items") or []
+        if not page_items:
+            break
+        items.extend(page_items)
+        offset += len(page_items)
+    return {"items": items}
+
+def _fetch_remaining_pages(client, album, executor, retry_options):
+    """Albümün ilk sayfadan sonraki parça sayfalarını havuza gönderir; (albüm, future listesi) döndürür."""
+    tracks_page = album.get("tracks") or {}
+    offsets = _remaining_page_offsets(tracks_page)
+    if offsets is None:
+        return album, [executor.submit(_walk_next_pages, client, album["id"], tracks_page, retry_options)]
+    futures = [
+        executor.submit(call_with_backoff, client.album_tracks, album["id"],
+                        limit=MAX_TRACKS_PER_PAGE, offset=offset, **retry_options)
+        for offset in offsets
+    ]
+    return album, futures
+
+def _merge_pages(album, page_futures):
+    """Eşzamanlı çekilen sayfaları albümün parça listesine sırayla ekler."""
+    tracks_page = dict(album.get("tracks") or {})
+    items = list(tracks_page.get("items") or [])
+    for future in page_futures:
+        items.extend(future.result().get("items") or [])
+    tracks_page["items"] = items
+    tracks_page["next"] = None
+    tracks_page["offset"] = 0
+    tracks_page["limit"] = len(items)
+    merged = dict(album)
+    merged["tracks"] = tracks_page
+    return merged
+
+def fetch_albums_raw(client, album_ids, workers=DEFAULT_WORKERS, max_retries=5, base_delay=1.0):
+    """
+    Albümleri 20'şerli gruplarla çeker ve tüm parça sayfalarını tamamlar.
+
+    Args:
+        client: spotipy.Spotify, spotify_cache.CachedSpotify veya aynı metotlara sahip bir istemci.
+        album_ids (list): Spotify albüm kimlikleri.
+        workers (int): Eşzamanlı istek sayısı.
+        max_retries (int): 429 yanıtı başına en fazla tekrar sayısı.
+        base_delay (float): Retry-After başlığı yoksa üstel geri çekilmenin başlangıç süresi.
+
+    Returns:
+        list: album_ids ile aynı sırada, parça listesi eksiksiz ham albüm sözlükleri (bulunamayanlar için None).
+    """
+    album_ids = list(album_ids)
+    retry_options = {"max_retries": max_retries, "base_delay": base_delay}
+    batches = [album_ids[i:i + MAX_ALBUMS_PER_REQUEST] for i in range(0, len(album_ids), MAX_ALBUMS_PER_REQUEST)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        batch_futures = [executor.submit(call_with_backoff, client.albums, batch, **retry_options) for batch in batches]
+        albums = []
+        for batch, future in zip(batches, batch_futures):
+            response_albums = (future.result() or {}).get("albums") or []
+            # Geçersiz kimlikler için Spotify None döndürür; sıra korunur
+            albums.extend(response_albums + [None] * (len(batch) - len(response_albums)))
+
+        pending = [_fetch_remaining_pages(client, album, executor, retry_options) if album else (None, []) for album in albums]
+        return [_merge_pages(album, futures) if album else None for album, futures in pending]
+
+def fetch_album_raw(client, album_id, workers=DEFAULT_WORKERS, max_retries=5, base_delay=1.0):
+    """Tek bir albümü tüm parça sayfalarıyla birlikte ham sözlük olarak döndürür (bulunamazsa None)."""
+    retry_options = {"max_retries": max_retries, "base_delay": base_delay}
+    album = call_with_backoff(client.album, album_id, **retry_options)
+    if not album:
+        return None
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        album, futures = _fetch_remaining_pages(client, album, executor, retry_options)
+        return _merge_pages(album, futures)
+
+def fetch_albums(client, album_ids, workers=DEFAULT_WORKERS, texts=None, **retry_options):
+    """
+    Albümleri çeker ve poster için normalleştirir.
+
+    Returns:
+        list: album_ids ile aynı sırada (album_model.Album, album_artwork_url) demetleri;
+        bulunamayan veya tanınmayan albümler için (None, None).
+    """
+    raw_albums = fetch_albums_raw(client, album_ids, workers=workers, **retry_options)
+    return [poster_core.normalize_album_data(album, texts) if album else (None, None) for album in raw_albums]
@@ -0,0 +1,9 @@
+# conftest.py
+# Testlerin kök klasördeki modülleri (poster_core, poster_layout, ...) içe aktarabilmesi için yol ayarı.
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
@@ -0,0 +1,136 @@
+# test_artwork_cache.py
+# ArtworkStore'u yerel bir HTTP sunucusuna (http.server) karşı, ağa çıkmadan dener:
+# indirme, isabet, ETag ile doğrulama, ağ hatasında eski kopya ve aynı klasörü paylaşan depolarda boyut sınırı.
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import artwork_cache
+
+COVER_SIZE = 10 * 1024
+
+def _cover(name):
+    return hashlib.sha256(name.encode("utf-8")).digest() * (COVER_SIZE // 32)
+
+class _CoverHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if server.fail:
+            self.send_error(500)
+            return
+        body = _cover(self.path)
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _CoverHandler)
+    httpd.requests = []
+    httpd.fail = False
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = "http://127.0.0.1:%d" % httpd.server_address[1]
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_download_then_hit_without_rewriting(server, tmp_path):
+    store = artwork_cache.ArtworkStore(str(tmp_path))
+    url = server.url + "/a.jpg"
+    assert store.get(url) == _cover("/a.jpg")
+    entry_path = store._entry_path(url)
+    written_at = os.stat(entry_path).st_mtime_ns
+
+    for _ in range(5):
+        assert store.get(url) == _cover("/a.jpg")
+    assert len(server.requests) == 1
+    # Tazelik süresi içindeki isabetler kaydı yeniden yazmaz (TOUCH_INTERVAL'dan yeni dosyaya dokunulmaz)
+    assert os.stat(entry_path).st_mtime_ns == written_at
+    stats = store.stats()
+    assert (stats["downloads"], stats["hits"], stats["entries"]) == (1, 5, 1)
+
+def test_hit_refreshes_old_last_used(server, tmp_path):
+    store = artwork_cache.ArtworkStore(str(tmp_path))
+    url = server.url + "/a.jpg"
+    store.get(url)
+    digest = store._read_entry(url)["sha256"]
+    old = time.time() - 10 * artwork_cache.TOUCH_INTERVAL
+    for path in (store._entry_path(url), store._object_path(digest)):
+        os.utime(path, (old, old))
+    store.get(url)
+    for path in (store._entry_path(url), store._object_path(digest)):
+        assert os.stat(path).st_mtime > old + artwork_cache.TOUCH_INTERVAL
+
+def test_revalidates_with_etag(server, tmp_path):
+    store = artwork_cache.ArtworkStore(str(tmp_path), max_age=0)
+    url = server.url + "/b.jpg"
+    store.get(url)
+    assert store.get(url) == _cover("/b.jpg")
+    assert server.requests[0][1] is None
+    assert server.requests[1][1] is not None
+    assert store.stats()["revalidated"] == 1
+
+def test_serves_stale_copy_when_server_fails(server, tmp_path, caplog, capsys):
+    store = artwork_cache.ArtworkStore(str(tmp_path), max_age=0)
+    url = server.url + "/c.jpg"
+    store.get(url)
+    server.fail = True
+    with caplog.at_level(logging.WARNING, logger="artwork_cache"):
+        assert store.get(url) == _cover("/c.jpg")
+    assert store.stats()["stale_served"] == 1
+    assert any(getattr(record, "event", None) == "artwork_stale_served" for record in caplog.records)
+    assert capsys.readouterr().out == ""
+
+def test_missing_cover_without_copy_raises(server, tmp_path):
+    server.fail = True
+    store = artwork_cache.ArtworkStore(str(tmp_path))
+    with pytest.raises(artwork_cache.requests.exceptions.RequestException):
+        store.get(server.url + "/d.jpg")
+
+def test_size_cap_covers_other_stores_and_orphans(server, tmp_path):
+    max_bytes = 3 * COVER_SIZE + 4096
+    first = artwork_cache.ArtworkStore(str(tmp_path), max_bytes=max_bytes)
+    second = artwork_cache.ArtworkStore(str(tmp_path), max_bytes=max_bytes)
+    # Kaydı olmayan (ör. eski bir sürümden kalmış) bir kapak da sınıra dahildir
+    orphan = first._object_path(first._write_object(b"x" * COVER_SIZE))
+    old = time.time() - 3600
+    os.utime(orphan, (old, old))
+
+    for index in range(3):
+        first.get(server.url + "/first-%d.jpg" % index)
+        second.get(server.url + "/second-%d.jpg" % index)
+        # Ayrı süreçlerdeki gibi her kapağın son kullanımı farklı bir zamandır
+        for store, name in ((first, "first"), (second, "second")):
+            url = server.url + "/%s-%d.jpg" % (name, index)
+            entry = store._read_entry(url)
+            used = old + 60 * (2 * index + (name == "second") + 1)
+            for path in (store._entry_path(url), store._object_path(entry["sha256"])):
+                os.utime(path, (used, used))
+    second._evict()
+
+    assert second.total_bytes() <= max_bytes
+    assert not os.path.exists(orphan)
+    # En son kullanılanlar kalır; en eskiler (diğer deponun yazdıkları dahil) silinir
+    assert first._read_entry(server.url + "/first-0.jpg") is None
+    assert second.get(server.url + "/second-2.jpg") == _cover("/second-2.jpg")
+    assert second.stats()["downloads"] == 3
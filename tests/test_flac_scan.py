@@ -0,0 +1,93 @@
+# test_flac_scan.py
+# flac_scan'i küçük sentetik FLAC dosyalarıyla (yalnızca meta veri blokları ve birkaç ses baytı) dener:
+# etiketlerin okunması, albümlerin gruplanması ve yazılan rip.json dosyaları.
+
+import json
+import logging
+import os
+import struct
+
+import pytest
+
+import flac_scan
+
+def _block(block_type, data, last=False):
+    return bytes([(0x80 if last else 0) | block_type]) + len(data).to_bytes(3, "big") + data
+
+def _streaminfo(total_samples, sample_rate=44100, channels=2, bits_per_sample=16):
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | ((bits_per_sample - 1) << 36) | total_samples
+    return struct.pack(">HH", 4096, 4096) + b"\0\0\x10" + b"\0\x20\0" + packed.to_bytes(8, "big") + b"\0" * 16
+
+def _vorbis_comment(tags):
+    data = struct.pack("<I", 9) + b"reference" + struct.pack("<I", len(tags))
+    for tag in tags:
+        encoded = tag.encode("utf-8")
+        data += struct.pack("<I", len(encoded)) + encoded
+    return data
+
+def write_flac(path, tags, seconds=120):
+    """Verilen Vorbis etiketleriyle ve süreyle (0 ise bilinmeyen) bir FLAC dosyası yazar."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    blocks = [_block(0, _streaminfo(int(seconds * 44100))), _block(4, _vorbis_comment(tags)),
+              _block(1, b"\0" * 64, last=True)]
+    with open(path, "wb") as f:
+        f.write(b"fLaC" + b"".join(blocks) + b"\0" * 256)
+
+def _scan(tmp_path):
+    output_dir = tmp_path / "out"
+    result = flac_scan.scan([str(tmp_path / "lib")], str(output_dir), index_path=str(tmp_path / "index.sqlite"), workers=2)
+    rips = {}
+    for name in sorted(os.listdir(output_dir)):
+        with open(output_dir / name, encoding="utf-8") as f:
+            rips[name] = json.load(f)
+    return result, rips
+
+def _tracks(rip):
+    return [(item["track"]["name"], item["track"].get("duration_ms")) for item in rip["tracks"]["items"]]
+
+def test_album_with_album_artist_across_discs(tmp_path):
+    for disc in (1, 2):
+        for number in (2, 1):
+            write_flac(str(tmp_path / "lib" / "Album" / f"CD{disc}" / f"{number}.flac"),
+                       [f"TITLE=Song {disc}-{number}", "ARTIST=Guest", "ALBUMARTIST=Band", "ALBUM=Album",
+                        f"TRACKNUMBER={number}", f"DISCNUMBER={disc}"], seconds=100 + number)
+    result, rips = _scan(tmp_path)
+    assert (result.albums, result.errors) == (1, 0)
+    rip = rips["Band - Album.json"]
+    assert rip["owner"] == {"display_name": "Band"}
+    assert [name for name, _ in _tracks(rip)] == ["Song 1-1", "Song 1-2", "Song 2-1", "Song 2-2"]
+
+def test_compilation_without_album_artist_stays_together(tmp_path):
+    for number, artist in enumerate(("A", "B", "C"), start=1):
+        write_flac(str(tmp_path / "lib" / "Hits" / f"{number}.flac"),
+                   [f"TITLE=S{number}", f"ARTIST={artist}", "ALBUM=Hits", f"TRACKNUMBER={number}"])
+    # Aynı albüm adı başka bir klasörde ayrı bir albümdür
+    write_flac(str(tmp_path / "lib" / "Other" / "1.flac"), ["TITLE=Z1", "ARTIST=Z", "ALBUM=Hits", "TRACKNUMBER=1"])
+    _, rips = _scan(tmp_path)
+    assert sorted(rips) == [f"{flac_scan.VARIOUS_ARTISTS} - Hits.json", "Z - Hits.json"]
+    assert [name for name, _ in _tracks(rips[f"{flac_scan.VARIOUS_ARTISTS} - Hits.json"])] == ["S1", "S2", "S3"]
+
+def test_disc_folders_without_album_artist_are_one_album(tmp_path):
+    for disc in (1, 2):
+        write_flac(str(tmp_path / "lib" / "Multi" / f"Disc {disc}" / "1.flac"),
+                   [f"TITLE=D{disc}", "ARTIST=Solo", "ALBUM=Multi", "TRACKNUMBER=1", f"DISCNUMBER={disc}"])
+    _, rips = _scan(tmp_path)
+    assert list(rips) == ["Solo - Multi.json"]
+    assert [name for name, _ in _tracks(rips["Solo - Multi.json"])] == ["D1", "D2"]
+
+def test_unknown_duration_is_omitted_and_logged(tmp_path, caplog):
+    write_flac(str(tmp_path / "lib" / "A" / "1.flac"), ["TITLE=Known", "ARTIST=X", "ALBUM=A", "TRACKNUMBER=1"], seconds=90)
+    write_flac(str(tmp_path / "lib" / "A" / "2.flac"), ["TITLE=Unknown", "ARTIST=X", "ALBUM=A", "TRACKNUMBER=2"], seconds=0)
+    with caplog.at_level(logging.WARNING, logger="flac_scan"):
+        _, rips = _scan(tmp_path)
+    assert _tracks(rips["X - A.json"]) == [("Known", 90000), ("Unknown", None)]
+    assert "duration_ms" not in rips["X - A.json"]["tracks"]["items"][1]["track"]
+    assert [getattr(record, "event", None) for record in caplog.records] == ["flac_duration_unknown"]
+
+def test_broken_file_is_counted_as_error(tmp_path):
+    write_flac(str(tmp_path / "lib" / "A" / "1.flac"), ["TITLE=T", "ARTIST=X", "ALBUM=A"])
+    (tmp_path / "lib" / "A" / "broken.flac").write_bytes(b"notflac")
+    result, rips = _scan(tmp_path)
+    assert (result.files, result.errors, result.albums) == (2, 1, 1)
+    with pytest.raises(flac_scan.FlacError):
+        flac_scan.read_flac(str(tmp_path / "lib" / "A" / "broken.flac"))
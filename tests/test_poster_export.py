@@ -0,0 +1,25 @@
+# test_poster_export.py
+# poster_export.save_formats'ın her biçimi kendi uzantısıyla yazdığını ve yolları çakışacak
+# (aynı biçimli) ayar listelerini hiçbir şey yazmadan reddettiğini dener.
+
+import os
+
+import pytest
+from PIL import Image
+
+import poster_export
+
+@pytest.fixture
+def image():
+    return Image.new("RGB", (32, 24), (200, 40, 40))
+
+def test_each_format_gets_its_own_file(tmp_path, image):
+    settings = [poster_export.make_settings("png"), poster_export.make_settings("jpg")]
+    written = poster_export.save_formats(image, str(tmp_path / "poster.png"), settings)
+    assert [os.path.basename(path) for path, _ in written] == ["poster.png", "poster.jpg"]
+
+def test_duplicate_formats_are_rejected(tmp_path, image):
+    settings = [poster_export.make_settings("jpeg", quality=95), poster_export.make_settings("jpg", quality=60)]
+    with pytest.raises(ValueError, match="JPEG"):
+        poster_export.save_formats(image, str(tmp_path / "poster"), settings)
+    assert not os.listdir(tmp_path)
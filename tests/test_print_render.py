@@ -0,0 +1,68 @@
+# test_print_render.py
+# Bantlı baskı çıktısının create_album_poster ile aynı olduğunu ve A2 / 300 DPI'da tam tuvalin
+# belleğe alınmadığını doğrular. Pillow resim tamponları C tarafında ayrıldığından tracemalloc bunları
+# görmez; bu yüzden en yüksek RSS, önceki testlerden etkilenmemesi için ayrı bir süreçte ölçülür.
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from PIL import Image, ImageChops
+
+import benchmark
+import poster_core
+import poster_layout
+import print_render
+from conftest import ROOT_DIR
+
+EXAMPLE_JSON = os.path.join(ROOT_DIR, "examples", "spotify.json")
+
+# Bant çiziminin (kapak hazırlığı hariç) tam tuvale oranla en fazla ekleyebileceği bellek
+MAX_PEAK_FRACTION_OF_CANVAS = 0.5
+
+_MEASURE_SCRIPT = """
+import json, os, sys
+sys.path.insert(0, sys.argv[1])
+import artwork_loader, benchmark, poster_layout, print_render
+album = print_render._load_album(sys.argv[2])
+poster_size = poster_layout.print_size_key("A2", 300)
+artwork = None
+if sys.argv[3] == "artwork":
+    artwork = artwork_loader.prepare_artwork(benchmark.synthetic_artwork((1000, 1000)), poster_layout.get_artwork_size(poster_size))
+before = print_render.peak_rss_mb()
+size = print_render.render_poster_to_file(album, artwork, {"poster_size": poster_size}, sys.argv[4], dpi=300)
+print(json.dumps({"size": size, "before_mb": before, "after_mb": print_render.peak_rss_mb()}))
+"""
+
+def _measure(artwork, output):
+    result = subprocess.run([sys.executable, "-c", _MEASURE_SCRIPT, ROOT_DIR, EXAMPLE_JSON, artwork, output],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+@pytest.mark.skipif(print_render.resource is None, reason="en yüksek RSS bu platformda ölçülemiyor")
+@pytest.mark.parametrize("artwork", ["none", "artwork"])
+def test_a2_300dpi_banded_peak_memory(artwork, tmp_path):
+    output = str(tmp_path / "poster.png")
+    measured = _measure(artwork, output)
+    width, height = measured["size"]
+    assert (width, height) == poster_layout.resolve_poster_size(poster_layout.print_size_key("A2", 300))
+    with Image.open(output) as image:
+        assert image.size == (width, height)
+        assert round(image.info["dpi"][0]) == 300
+
+    full_canvas_mb = width * height * 3 / (1024 * 1024)
+    growth_mb = measured["after_mb"] - measured["before_mb"]
+    assert growth_mb < full_canvas_mb * MAX_PEAK_FRACTION_OF_CANVAS, (growth_mb, full_canvas_mb)
+
+@pytest.mark.parametrize("band_height", [1, 37, print_render.DEFAULT_BAND_HEIGHT])
+def test_banded_output_matches_canvas(band_height, tmp_path):
+    album = print_render._load_album(EXAMPLE_JSON)
+    options = {"poster_size": "A4"}
+    artwork = benchmark.synthetic_artwork(poster_layout.get_artwork_size("A4"), seed=1)
+    output = str(tmp_path / "poster.png")
+    print_render.render_poster_to_file(album, artwork, options, output, band_height=band_height)
+    with Image.open(output) as banded:
+        canvas = poster_core.create_album_poster(album, artwork, options)
+        assert ImageChops.difference(banded.convert("RGB"), canvas).getbbox() is None
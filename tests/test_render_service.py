@@ -0,0 +1,135 @@
+# test_render_service.py
+# render_service.parse_options ve parse_settings'in her seçeneğin türünü ve aralığını doğruladığını, hatalı
+# seçeneklerin HTTP katmanında 500 yerine 400 döndürdüğünü ve kapak indirmenin bir kuyruk yuvası tuttuğunu dener.
+# Doğrulama çizimden önce yapıldığından işçi havuzu başlatılmaz.
+
+import http.client
+import json
+import threading
+
+import pytest
+
+import render_service
+
+ALBUM = {"name": "Album", "artists": [{"name": "Artist"}],
+         "tracks": {"items": [{"name": "Track", "duration_ms": 180000}]}}
+
+INVALID_OPTIONS = [
+    {"tracks_per_column": "abc"},
+    {"tracks_per_column": 2.5},
+    {"tracks_per_column": True},
+    {"tracks_per_column": 0},
+    {"palette_colors": None},
+    {"palette_colors": 0},
+    {"palette_colors": 10_000},
+    {"copyright_bottom_padding_px": "20"},
+    {"copyright_bottom_padding_px": -5},
+    {"tracklist_horizontal_offset": [1]},
+    {"min_tracklist_font_size": 0},
+    {"min_tracklist_font_size": 5000},
+    {"include_copyright": "false"},
+    {"include_copyright": 1},
+    {"palette_method": "octree"},
+    {"palette_method": ["adaptive"]},
+    {"tracklist_overflow": "scroll"},
+    {"tracklist_font_size_search_range": [10]},
+    {"tracklist_font_size_search_range": [0, 20]},
+    {"tracklist_font_size_search_range": [10, 5000]},
+    {"tracklist_font_size_search_range": [10, True]},
+    {"poster_size": "B5"},
+    {"colour": "red"},
+]
+
+def test_defaults_are_valid():
+    assert render_service.parse_options(None) == render_service.DEFAULT_OPTIONS
+
+def test_valid_options_are_accepted():
+    options = render_service.parse_options({
+        "tracks_per_column": 12, "palette_colors": 8, "include_copyright": False, "palette_method": "median_cut",
+        "tracklist_horizontal_offset": -40, "copyright_bottom_padding_px": 0, "min_tracklist_font_size": 4,
+    })
+    assert options["tracks_per_column"] == 12 and options["include_copyright"] is False
+
+@pytest.mark.parametrize("options", INVALID_OPTIONS, ids=lambda options: "-".join(f"{k}={v!r}" for k, v in options.items()))
+def test_invalid_options_are_rejected(options):
+    with pytest.raises(render_service.RequestError) as error:
+        render_service.parse_options(options)
+    assert error.value.status == 400
+
+INVALID_SETTINGS = [
+    {"png_compression": 42},
+    {"png_compression": -1},
+    {"format": "webp", "quality": -1},
+    {"format": "jpeg", "quality": 101},
+    {"format": "jpeg", "quality": "95"},
+    {"png_colors": 1},
+    {"png_colors": 257},
+    {"png_colors": True},
+]
+
+def test_valid_settings_are_accepted():
+    settings = render_service.parse_settings({"format": "webp", "quality": 1, "png_compression": 9, "png_colors": 256})
+    assert (settings.format, settings.quality, settings.compress_level, settings.png_colors) == ("WEBP", 1, 9, 256)
+
+@pytest.mark.parametrize("settings", INVALID_SETTINGS, ids=lambda settings: "-".join(f"{k}={v!r}" for k, v in settings.items()))
+def test_invalid_settings_are_rejected(settings):
+    with pytest.raises(render_service.RequestError) as error:
+        render_service.parse_settings(settings)
+    assert error.value.status == 400
+
+def test_artwork_download_holds_a_queue_slot():
+    data = {"album": ALBUM, "artwork_url": "https://example.com/cover.jpg"}
+    rejected = []
+
+    def fetch_url(url):
+        # Kapasite tek yuva olduğundan indirme sürerken gelen ikinci istek reddedilir
+        with pytest.raises(render_service.RequestError) as error:
+            service.prepare(data)
+        rejected.append(error.value.status)
+        return b"cover"
+
+    service = render_service.RenderService(workers=1, queue_size=0, fetch_url=fetch_url)
+    service.prepare(data)
+    assert rejected == [503]
+    # Yuva indirmeden sonra geri verilir
+    assert service._slots.acquire(blocking=False)
+
+def test_failed_submit_releases_the_slot():
+    service = render_service.RenderService(workers=1, queue_size=0)
+    key, job = service.prepare({"album": ALBUM})
+    # Havuz başlatılmadığından gönderim başarısız olur; yuva ve bekleyen iş geri verilir
+    with pytest.raises(render_service.RequestError) as error:
+        service.render(key, job)
+    assert error.value.status == 500
+    assert service.queue_depth() == 0 and not service._inflight
+    assert service._slots.acquire(blocking=False)
+
+@pytest.fixture
+def server():
+    httpd = render_service.RenderHTTPServer(("127.0.0.1", 0), render_service.RenderService(workers=1))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def post(server, data):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    body = json.dumps(data)
+    connection.request("POST", "/render", body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response.status, payload
+
+@pytest.mark.parametrize("options", [{"tracks_per_column": "abc"}, {"include_copyright": "no"}, {"palette_method": 3}])
+def test_invalid_options_return_400_over_http(server, options):
+    status, payload = post(server, {"album": ALBUM, "options": options})
+    assert status == 400
+    assert list(options)[0] in payload["error"]
+
+@pytest.mark.parametrize("settings", [{"png_compression": 42}, {"format": "webp", "quality": -1}])
+def test_invalid_settings_return_400_over_http(server, settings):
+    status, payload = post(server, dict(settings, album=ALBUM))
+    assert status == 400
+    assert [key for key in settings if key != "format"][0] in payload["error"]
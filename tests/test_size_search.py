@@ -0,0 +1,105 @@
+# test_size_search.py
+# poster_layout'taki ikili arama ile seçilen font boyutlarının eski doğrusal taramayla aynı olduğunu doğrular.
+# Karşılaştırma hem examples/ altındaki JSON'larda hem de benchmark.synthetic_album_raw albümlerinde yapılır.
+
+import glob
+import json
+import math
+import os
+
+import pytest
+
+import benchmark
+import poster_core
+import poster_layout
+from album_model import Album
+from conftest import ROOT_DIR
+
+EXAMPLE_FILES = sorted(glob.glob(os.path.join(ROOT_DIR, "examples", "*.json")))
+SYNTHETIC_CASES = [(count, style, seed) for count in (1, 12, 100) for style in benchmark.DEFAULT_STYLES for seed in (0, 1)]
+SCALE_FACTORS = [poster_layout.get_scale_factor(size) for size in ("A4", "A3", "A2")]
+
+def _linear_tracklist_size(fonts_cache, path, tracks, tracks_per_column, size_range, scale_factor):
+    """Eski (ikili aramadan önceki) yukarıdan aşağıya doğrusal tarama; bulunamazsa 10."""
+    available_vertical_space = int(920 * scale_factor) - int(775 * scale_factor)
+    available_horizontal_space = int(720 * scale_factor) - int(60 * scale_factor) - int(60 * scale_factor)
+    estimated_columns = max(1, math.ceil(len(tracks) / (tracks_per_column if tracks_per_column > 0 else 1)))
+    for size in range(size_range[1], max(1, size_range[0]) - 1, -1):
+        pixel_size = int(size * scale_factor)
+        font = fonts_cache.truetype(path, pixel_size)
+        _, top, _, bottom = font.getbbox("AgjypQ")
+        if tracks_per_column * (bottom - top + pixel_size * 0.8) > available_vertical_space * 1.05:
+            continue
+        max_name_width = max(font.getlength(track.display_name) for track in tracks)
+        width = ((max_name_width + int(25 * scale_factor) + font.getlength("00:00")) * estimated_columns
+                 + int(40 * scale_factor) * max(0, estimated_columns - 1))
+        if width <= available_horizontal_space * 1.05:
+            return size
+    return 10
+
+def _linear_album_name_size(fonts_cache, path, album_name, scale_factor):
+    """
+    Eski albüm adı küçültme döngüsü, denetim akışıyla birebir: boyut azaltılır, alt sınıra ulaşılırsa font
+    yeniden yüklenmeden durulur. Çizimde son yüklenen font kullanıldığından döndürülen boyut odur.
+    """
+    size = int(55 * scale_factor)
+    font = fonts_cache.truetype(path, size)
+    if len(album_name) <= 14:
+        return font.size
+    while font.getlength(album_name) > int(400 * scale_factor):
+        size -= 1
+        if size <= int(10 * scale_factor):
+            break
+        font = fonts_cache.truetype(path, size)
+    return font.size
+
+def _load_examples():
+    albums = []
+    for path in EXAMPLE_FILES:
+        with open(path, encoding="utf-8") as f:
+            albums.append(Album.from_raw(json.load(f)))
+    return albums
+
+def _synthetic_albums():
+    return [Album.from_raw(benchmark.synthetic_album_raw(count, style, seed)) for count, style, seed in SYNTHETIC_CASES]
+
+@pytest.fixture(scope="module")
+def fonts():
+    return poster_core.get_font_manager(), poster_core.font_paths()
+
+@pytest.fixture(scope="module")
+def albums():
+    return _load_examples() + _synthetic_albums()
+
+def test_examples_present():
+    assert EXAMPLE_FILES, "examples/*.json bulunamadı"
+
+@pytest.mark.parametrize("high", range(0, 12))
+def test_largest_fitting_size_matches_scan(high):
+    for limit in range(-1, high + 2):
+        fits = lambda size: size <= limit
+        expected = next((size for size in range(high, -1, -1) if fits(size)), None)
+        assert poster_layout._largest_fitting_size(0, high, fits) == expected
+
+@pytest.mark.parametrize("tracks_per_column", [6, 12])
+@pytest.mark.parametrize("size_range", [(10, 20), (8, 30)])
+def test_tracklist_size_matches_linear_scan(fonts, albums, tracks_per_column, size_range):
+    fonts_cache, paths = fonts
+    path = paths["tracklist"]
+    for album in albums:
+        if not album.tracks:
+            continue
+        for scale_factor in SCALE_FACTORS:
+            expected = _linear_tracklist_size(fonts_cache, path, album.tracks, tracks_per_column, size_range, scale_factor)
+            actual = poster_layout._tracklist_size(fonts_cache, path, album.tracks, tracks_per_column, size_range, scale_factor)
+            assert actual == expected, (album.name, len(album.tracks), scale_factor)
+
+def test_album_name_size_matches_linear_scan(fonts, albums):
+    fonts_cache, paths = fonts
+    path = paths["albumname"]
+    names = [album.name for album in albums] + ["A" * 40, "W" * 200]
+    for name in names:
+        for scale_factor in SCALE_FACTORS:
+            expected = _linear_album_name_size(fonts_cache, path, name, scale_factor)
+            actual = poster_layout._album_name_font(fonts_cache, path, name, scale_factor).size
+            assert actual == expected, (name, scale_factor)
@@ -0,0 +1,122 @@
+# test_spotify_cache.py
+# CachedSpotify'ı sahte bir istemci ve sahte bir saatle dener: bellek ve disk isabetleri, yaşam süresinin
+# dolması, süresi dolmuş kayıtların silinmesi ve veritabanı açılamadığında yalnızca bellek katmanı.
+
+import logging
+import sqlite3
+
+import pytest
+
+import spotify_cache
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def album(self, album_id):
+        self.calls.append(("album", album_id))
+        return {"id": album_id, "name": f"Album {album_id}", "version": len(self.calls)}
+
+    def search(self, q, limit=10, offset=0, type="track", market=None):
+        self.calls.append(("search", q))
+        return {"albums": {"items": [{"id": q}]}}
+
+    def current_user(self):
+        return {"id": "passthrough"}
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(spotify_cache, "time", clock)
+    return clock
+
+def _rows(db_path):
+    with sqlite3.connect(db_path) as db:
+        return db.execute("SELECT endpoint FROM responses ORDER BY endpoint").fetchall()
+
+def test_memory_and_disk_hits(clock, tmp_path):
+    db_path = str(tmp_path / "spotify.sqlite")
+    client = FakeClient()
+    cached = spotify_cache.CachedSpotify(client, db_path=db_path)
+    first = cached.album("x")
+    assert cached.album("x") == first
+    # Yeni bir süreç gibi: bellek boş, yanıt SQLite'tan gelir
+    reopened = spotify_cache.CachedSpotify(client, db_path=db_path)
+    assert reopened.album("x") == first
+    assert client.calls == [("album", "x")]
+    assert cached.stats()["endpoints"]["album"] == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+    assert reopened.stats()["endpoints"]["album"] == {"memory_hits": 0, "disk_hits": 1, "misses": 0}
+    assert reopened.current_user() == {"id": "passthrough"}
+
+def test_ttl_expiry_fetches_again(clock, tmp_path):
+    client = FakeClient()
+    cached = spotify_cache.CachedSpotify(client, db_path=str(tmp_path / "spotify.sqlite"), ttls={"album": 60})
+    first = cached.album("x")
+    clock.now += 59
+    assert cached.album("x") == first
+    clock.now += 2
+    second = cached.album("x")
+    assert second != first
+    assert client.calls == [("album", "x"), ("album", "x")]
+
+def test_expired_rows_are_purged_on_open_and_periodically(clock, tmp_path, monkeypatch):
+    db_path = str(tmp_path / "spotify.sqlite")
+    client = FakeClient()
+    cached = spotify_cache.CachedSpotify(client, db_path=db_path, ttls={"search": 60})
+    cached.search("old")
+    cached.album("kept")
+    clock.now += 120
+    assert _rows(db_path) == [("album",), ("search",)]
+
+    spotify_cache.CachedSpotify(client, db_path=db_path, ttls={"search": 60})
+    assert _rows(db_path) == [("album",)]
+
+    monkeypatch.setattr(spotify_cache, "PURGE_EVERY_WRITES", 3)
+    cached = spotify_cache.CachedSpotify(client, db_path=db_path, ttls={"search": 60})
+    cached.search("a")
+    clock.now += 120
+    cached.search("b")
+    assert len(_rows(db_path)) == 3
+    cached.search("c") # Üçüncü yazım temizliği tetikler; "a" silinir
+    assert _rows(db_path) == [("album",), ("search",), ("search",)]
+
+def test_rows_of_unknown_endpoints_are_purged(clock, tmp_path):
+    db_path = str(tmp_path / "spotify.sqlite")
+    with sqlite3.connect(db_path) as db:
+        db.execute("CREATE TABLE responses (key TEXT PRIMARY KEY, endpoint TEXT, stored_at REAL, value TEXT)")
+        db.execute("INSERT INTO responses VALUES ('legacy:1', 'legacy', ?, '{}')", (clock.now,))
+    spotify_cache.CachedSpotify(FakeClient(), db_path=db_path)
+    assert _rows(db_path) == []
+
+def test_memory_only_fallback_when_database_cannot_open(clock, tmp_path, caplog):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    client = FakeClient()
+    with caplog.at_level(logging.WARNING, logger="spotify_cache"):
+        cached = spotify_cache.CachedSpotify(client, db_path=str(blocker / "spotify.sqlite"))
+    assert cached._db is None
+    assert any(getattr(record, "event", None) == "spotify_cache_unavailable" for record in caplog.records)
+    first = cached.album("x")
+    assert cached.album("x") == first
+    assert client.calls == [("album", "x")]
+    assert cached.purge_expired() == 0
+
+def test_errors_are_not_cached(clock, tmp_path):
+    cached = spotify_cache.CachedSpotify(FakeClient(), db_path=str(tmp_path / "spotify.sqlite"))
+    attempts = []
+
+    def failing(album_id):
+        attempts.append(album_id)
+        raise RuntimeError("boom")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cached.cached_call("album", failing, "x")
+    assert attempts == ["x", "x"]
@@ -0,0 +1,127 @@
+# test_spotify_fetch.py
+# spotify_fetch'i sahte bir Spotify istemcisiyle dener: sayfalama (toplam varken eşzamanlı, yokken 'next' ile),
+# 20'şerli albüm grupları ve 429 yanıtlarında tekrar deneme.
+
+import logging
+import threading
+
+import pytest
+
+import spotify_fetch
+
+class _RateLimited(Exception):
+    """spotipy.SpotifyException gibi http_status ve headers taşıyan 429 hatası."""
+    http_status = 429
+
+    def __init__(self, retry_after="0"):
+        super().__init__("rate limited")
+        self.headers = {"Retry-After": retry_after}
+
+class FakeSpotify:
+    """
+    albums / album / album_tracks uç noktalarını taklit eden istemci.
+
+    Args:
+        track_counts (dict): Albüm kimliği -> parça sayısı.
+        include_total (bool): False ise sayfalarda 'total' alanı olmaz.
+        rate_limits (int): İlk bu kadar album_tracks çağrısı 429 ile reddedilir.
+    """
+
+    def __init__(self, track_counts, include_total=True, rate_limits=0):
+        self.track_counts = track_counts
+        self.include_total = include_total
+        self.rate_limits = rate_limits
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+
+    def _page(self, album_id, offset, limit):
+        count = self.track_counts[album_id]
+        items = [{"name": f"{album_id} track {i + 1}", "duration_ms": 180000 + i, "track_number": i + 1}
+                 for i in range(offset, min(count, offset + limit))]
+        page = {"items": items, "offset": offset, "limit": limit,
+                "next": f"https://api.spotify.test/albums/{album_id}/tracks?offset={offset + limit}" if offset + limit < count else None}
+        if self.include_total:
+            page["total"] = count
+        return page
+
+    def _album(self, album_id):
+        if album_id not in self.track_counts:
+            return None
+        return {"id": album_id, "name": f"Album {album_id}", "artists": [{"name": "Artist"}],
+                "images": [], "copyrights": [], "tracks": self._page(album_id, 0, spotify_fetch.MAX_TRACKS_PER_PAGE)}
+
+    def album(self, album_id):
+        self._record("album", album_id)
+        return self._album(album_id)
+
+    def albums(self, album_ids):
+        self._record("albums", tuple(album_ids))
+        assert len(album_ids) <= spotify_fetch.MAX_ALBUMS_PER_REQUEST
+        return {"albums": [self._album(album_id) for album_id in album_ids]}
+
+    def album_tracks(self, album_id, limit=50, offset=0):
+        self._record("album_tracks", album_id, offset)
+        with self._lock:
+            if self.rate_limits > 0:
+                self.rate_limits -= 1
+                raise _RateLimited()
+        return self._page(album_id, offset, limit)
+
+def _names(album):
+    return [item["name"] for item in album["tracks"]["items"]]
+
+def _expected(album_id, count):
+    return [f"{album_id} track {i + 1}" for i in range(count)]
+
+@pytest.mark.parametrize("include_total", [True, False])
+def test_fetch_album_raw_completes_all_pages(include_total):
+    client = FakeSpotify({"box": 237}, include_total=include_total)
+    album = spotify_fetch.fetch_album_raw(client, "box")
+    assert _names(album) == _expected("box", 237)
+    assert album["tracks"]["next"] is None
+    offsets = sorted(call[2] for call in client.calls if call[0] == "album_tracks")
+    assert offsets == [50, 100, 150, 200]
+
+def test_remaining_page_offsets_without_usable_total():
+    assert spotify_fetch._remaining_page_offsets({"items": [{}] * 50, "offset": 0, "next": "x"}) is None
+    assert spotify_fetch._remaining_page_offsets({"items": [{}] * 50, "offset": 0, "next": "x", "total": 50}) is None
+    assert spotify_fetch._remaining_page_offsets({"items": [{}] * 10, "offset": 0, "next": None}) == []
+    assert spotify_fetch._remaining_page_offsets({"items": [{}] * 50, "offset": 0, "next": "x", "total": 120}) == [50, 100]
+
+def test_short_album_makes_no_page_requests():
+    client = FakeSpotify({"single": 3})
+    assert _names(spotify_fetch.fetch_album_raw(client, "single")) == _expected("single", 3)
+    assert [call[0] for call in client.calls] == ["album"]
+
+@pytest.mark.parametrize("include_total", [True, False])
+def test_fetch_albums_raw_batches_and_keeps_order(include_total):
+    track_counts = {f"a{i}": (i * 17) % 130 + 1 for i in range(45)}
+    client = FakeSpotify(track_counts, include_total=include_total)
+    album_ids = list(track_counts) + ["missing"]
+    albums = spotify_fetch.fetch_albums_raw(client, album_ids, workers=3)
+    assert [len(call[1]) for call in client.calls if call[0] == "albums"] == [20, 20, 6]
+    assert albums[-1] is None
+    for album_id, album in zip(album_ids, albums[:-1]):
+        assert _names(album) == _expected(album_id, track_counts[album_id])
+
+def test_rate_limit_is_retried_and_logged(caplog, capsys):
+    client = FakeSpotify({"box": 120}, rate_limits=2)
+    with caplog.at_level(logging.WARNING, logger="spotify_fetch"):
+        album = spotify_fetch.fetch_album_raw(client, "box", workers=1)
+    assert _names(album) == _expected("box", 120)
+    assert [getattr(record, "event", None) for record in caplog.records] == ["spotify_rate_limited"] * 2
+    assert capsys.readouterr().out == ""
+
+def test_rate_limit_gives_up_after_max_retries():
+    delays = []
+
+    def always_limited():
+        raise _RateLimited(retry_after=None)
+
+    with pytest.raises(_RateLimited):
+        spotify_fetch.call_with_backoff(always_limited, max_retries=3, base_delay=0.5, sleep=delays.append)
+    assert delays == [0.5, 1.0, 2.0]
@@ -0,0 +1,69 @@
+# test_vector_render.py
+# SVG çıktısının yapısını ve gerçek bir SVG motoruyla (resvg_py veya cairosvg) rasterleştirildiğinde
+# create_album_poster çıktısıyla aynı göründüğünü doğrular. Motor kurulu değilse karşılaştırma testleri atlanır.
+
+import logging
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import benchmark
+import vector_render
+from conftest import ROOT_DIR
+
+EXAMPLE_FILES = [os.path.join(ROOT_DIR, "examples", name) for name in ("spotify.json", "rip.json")]
+
+needs_rasterizer = pytest.mark.skipif(not vector_render.rasterizer_available(),
+                                      reason="resvg_py veya cairosvg kurulu değil")
+
+@pytest.fixture(scope="module")
+def album():
+    return vector_render._load_album(EXAMPLE_FILES[0])
+
+@pytest.fixture(scope="module")
+def artwork():
+    return benchmark.synthetic_artwork((640, 640), seed=3)
+
+def test_artwork_is_embedded_once(album, artwork):
+    svg = vector_render.create_album_svg(album, artwork, paper="A4")
+    assert svg.count("data:image/jpeg;base64,") == 1
+    image = ET.fromstring(svg).find(f"{{{vector_render.SVG_NS}}}image")
+    assert image.get(f"{{{vector_render.XLINK_NS}}}href").startswith("data:image/jpeg;base64,")
+    assert image.get("href") is None
+
+def test_text_names_font_family_and_weight(album):
+    root = ET.fromstring(vector_render.create_album_svg(album, None, paper="A4"))
+    texts = list(root.iter(f"{{{vector_render.SVG_NS}}}text"))
+    assert texts
+    for element in texts:
+        families = element.get("font-family")
+        assert "'BR Cobane'" in families and families.endswith("sans-serif")
+        assert 100 <= int(element.get("font-weight")) <= 900
+
+def test_missing_album_is_logged(caplog):
+    with caplog.at_level(logging.ERROR, logger="vector_render"):
+        assert vector_render.create_album_svg(None, None) is None
+    assert any(getattr(record, "event", None) == "no_album_data" or "albüm verisi" in record.getMessage()
+               for record in caplog.records)
+
+@needs_rasterizer
+@pytest.mark.parametrize("json_path", EXAMPLE_FILES)
+@pytest.mark.parametrize("paper", ["A4", "A2"])
+def test_svg_matches_raster_poster(json_path, paper, artwork):
+    album = vector_render._load_album(json_path)
+    result = vector_render.compare_with_raster(album, artwork, paper=paper)
+    assert vector_render.check_passed(result), result
+
+@needs_rasterizer
+def test_check_detects_wrong_font(album, artwork, monkeypatch):
+    render_layout_svg = vector_render.render_layout_svg
+
+    def without_fonts(*args, **kwargs):
+        # Gömülü font ve yedek aile kaldırılır; motor genel bir yüz seçmek zorunda kalır
+        svg = render_layout_svg(*args, **kwargs)
+        return svg.replace("'BR Cobane', ", "").replace("@font-face", "@font-face-disabled")
+
+    monkeypatch.setattr(vector_render, "render_layout_svg", without_fonts)
+    result = vector_render.compare_with_raster(album, artwork, paper="A4")
+    assert not vector_render.check_passed(result), result
@@ -0,0 +1,391 @@
+# vector_render.py
+# Baskı işleri için vektörel (SVG) çıktı. create_album_poster ile aynı yerleşim planı (poster_layout)
+# kullanılır; metinler fonts/ klasöründeki fontlar belgeye gömülerek yazılır, kapak ise bir kez
+# JPEG olarak gömülür. Yerleşim kâğıt boyutunda 72 DPI'da (1 birim = 1 punto) hesaplanır ve belge
+# milimetre cinsinden boyutlandırılır; A4, A3 ve A2 aynı en-boy oranına sahip olduğundan tek dosya
+# her kâğıt boyutunda ölçeklenerek basılabilir. Dosya boyutu ve üretim süresi baskı çözünürlüğüyle büyümez.
+#
+# Raster ile karşılaştırma (SVG gerçek bir SVG motoruyla, resvg_py veya cairosvg, rasterleştirilip
+# create_album_poster çıktısıyla kıyaslanır):
+#   python vector_render.py examples/spotify.json --artwork cover.jpg --paper A2 --check
+
+import sys
+import base64
+import struct
+import logging
+import argparse
+from io import BytesIO
+from xml.sax.saxutils import escape, quoteattr
+from PIL import Image, ImageChops, ImageStat, ImageFilter
+
+import poster_core
+import poster_layout
+import font_manager
+import artwork_loader
+import json_stream
+import render_report
+
+try:
+    import resvg_py # İsteğe bağlı: yalnızca --check ve testlerde SVG'yi rasterleştirmek için
+except ImportError:
+    resvg_py = None
+
+try:
+    import cairosvg # İsteğe bağlı: resvg_py yoksa kullanılır; fontların sistemde kurulu olması gerekir
+except (ImportError, OSError): # cairo kütüphanesi bulunamazsa OSError
+    cairosvg = None
+
+logger = logging.getLogger(__name__)
+
+# Yerleşimin hesaplandığı çözünürlük; 72 DPI'da bir piksel bir puntoya eşittir
+POINTS_PER_INCH = 72
+
+# Gömülü kapağın varsayılan baskı çözünürlüğü
+DEFAULT_ARTWORK_DPI = 300
+
+# Gömülü kapağın JPEG kalitesi
+ARTWORK_JPEG_QUALITY = 90
+
+# Font yoksa (poster_layout.DEFAULT_FONT) kullanılacak genel aile
+FALLBACK_FONT_FAMILY = "sans-serif"
+
+# --check: iki çıktı hafifçe bulanıklaştırılarak kıyaslanır; böylece yalnızca FreeType ile SVG motorunun
+# kenar yumuşatma ve hinting farkları elenir, yanlış font, ağırlık veya konum elenmez
+CHECK_BLUR_RADIUS = 1.5
+
+# Bulanıklaştırılmış farkı bu değerden (0-255) büyük olan pikseller uyuşmaz sayılır
+CHECK_PIXEL_THRESHOLD = 48
+
+# Kapak dışında izin verilen en büyük uyuşmaz piksel oranı
+CHECK_MAX_MISMATCH = 0.01
+
+# Kapakta izin verilen en büyük ortalama fark (0-255); gürültülü kapaklarda JPEG kaybı birkaç birime ulaşır,
+# yanlış konum veya ölçek ise onlarca birim fark üretir
+CHECK_MAX_ARTWORK_DIFF = 8.0
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+# Pillow yatay anchor harfi -> SVG text-anchor
+_TEXT_ANCHORS = {"l": "start", "m": "middle", "r": "end"}
+
+def _color(rgb):
+    """(r, g, b) -> '#rrggbb'."""
+    return "#%02x%02x%02x" % tuple(rgb)
+
+def _baseline_origin(font, run):
+    """
+    Metin parçasının SVG'de yazılacağı (x, taban çizgisi y'si, text-anchor) değerlerini döndürür.
+    Pillow'un dikey anchor'ı (ör. 'a' üst, 's' taban) aynı yatay anchor'ın taban çizgisi karşılığına çevrilir.
+    """
+    anchor = run.anchor or "la"
+    baseline_anchor = anchor[0] + "s"
+    if anchor == baseline_anchor or not run.text:
+        return run.x, run.y, _TEXT_ANCHORS[anchor[0]]
+    top_at_anchor = font.getbbox(run.text, anchor=anchor)[1]
+    top_at_baseline = font.getbbox(run.text, anchor=baseline_anchor)[1]
+    return run.x, run.y + top_at_anchor - top_at_baseline, _TEXT_ANCHORS[anchor[0]]
+
+def _font_family(spec):
+    """FontSpec için SVG font ailesi adını döndürür."""
+    return font_manager.face_name(spec.path) if spec.path else FALLBACK_FONT_FAMILY
+
+def _font_weight(data):
+    """Font dosyasının OS/2 tablosundaki ağırlığı (100-900) döndürür; tablo yoksa None."""
+    try:
+        num_tables = struct.unpack_from(">H", data, 4)[0]
+        for index in range(num_tables):
+            tag, _, offset, _ = struct.unpack_from(">4sIII", data, 12 + 16 * index)
+            if tag == b"OS/2":
+                return struct.unpack_from(">H", data, offset + 4)[0]
+    except struct.error:
+        pass
+    return None
+
+def _font_fallbacks(fonts_cache, spec, data):
+    """
+    @font-face desteklemeyen okuyucular (resvg, cairosvg, bazı baskı RIP'leri) için yedek font özniteliklerini döndürür:
+    (gömülü aile + fontun kendi aile adı + genel aile, ağırlık). Font kuruluysa aynı yüz seçilir.
+    """
+    families = [_font_family(spec)]
+    weight = None
+    if spec.path is not None:
+        try:
+            family_name = fonts_cache.truetype(spec.path, spec.size).getname()[0]
+            if family_name and family_name not in families:
+                families.append(family_name)
+        except Exception:
+            pass
+        if data is not None:
+            weight = _font_weight(data)
+    if FALLBACK_FONT_FAMILY not in families:
+        families.append(FALLBACK_FONT_FAMILY)
+    return ", ".join(f"'{family}'" if family != FALLBACK_FONT_FAMILY else family for family in families), weight
+
+def _encode_artwork(albumart_image, quality=ARTWORK_JPEG_QUALITY):
+    """Kapağı gömülmek üzere JPEG baytlarına çevirir."""
+    buffer = BytesIO()
+    albumart_image.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+def render_layout_svg(plan, albumart_image=None, colors=None, physical_size_mm=None, fonts_cache=None):
+    """
+    Yerleşim planını SVG belgesine çevirir.
+
+    Args:
+        plan (poster_layout.LayoutPlan): get_layout ile elde edilen plan.
+        albumart_image (PIL.Image.Image or None): Kapak; plan.artwork_box'a ölçeklenerek bir kez gömülür.
+        colors (list or None): Renk kutularına çizilecek (r, g, b) renkleri.
+        physical_size_mm (tuple or None): Belgenin basılı boyutu; None ise birimsiz (piksel) boyut yazılır.
+        fonts_cache (font_manager.FontManager or None): Font yöneticisi (varsayılan poster_core'unki).
+
+    Returns:
+        str: SVG belgesi.
+    """
+    fonts_cache = fonts_cache or poster_core.get_font_manager()
+    width, height = plan.size
+    if physical_size_mm:
+        size_attrs = f'width="{physical_size_mm[0]:g}mm" height="{physical_size_mm[1]:g}mm"'
+    else:
+        size_attrs = f'width="{width}" height="{height}"'
+
+    runs = [plan.album_name, plan.artist] + list(plan.tracks)
+    if plan.copyright is not None:
+        runs.append(plan.copyright)
+
+    # Her yüz bir kez gömülür
+    font_faces = []
+    embedded = set()
+    fallbacks = {}
+    for run in runs:
+        family = _font_family(run.font)
+        if family in fallbacks:
+            continue
+        data = fonts_cache.face_bytes(run.font.path) if run.font.path is not None else None
+        fallbacks[family] = _font_fallbacks(fonts_cache, run.font, data)
+        if data is None:
+            continue
+        embedded.add(family)
+        font_faces.append(f"@font-face{{font-family:'{family}';"
+                          f"src:url(data:font/otf;base64,{base64.b64encode(data).decode('ascii')}) format('opentype');}}")
+
+    parts = [f'<svg xmlns="{SVG_NS}" xmlns:xlink="{XLINK_NS}" {size_attrs} viewBox="0 0 {width} {height}">']
+    if font_faces:
+        parts.append("<style>" + "".join(font_faces) + "</style>")
+    parts.append(f'<rect x="0" y="0" width="{width}" height="{height}" fill="#ffffff"/>')
+
+    # Çizim sırası poster_core ile aynıdır: kapak, ayırıcı, albüm adı, renkler, sanatçı, tracklist, telif hakkı
+    if albumart_image is not None:
+        box = plan.artwork_box
+        jpeg = base64.b64encode(_encode_artwork(albumart_image)).decode("ascii")
+        # Kapak yalnızca bir kez gömülür; xlink:href'i hem SVG 1.1 (eski Inkscape, baskı RIP'leri) hem SVG 2 okuyucuları okur
+        parts.append(f'<image x="{box.x0}" y="{box.y0}" width="{box.x1 - box.x0}" height="{box.y1 - box.y0}" '
+                     f'preserveAspectRatio="none" xlink:href="data:image/jpeg;base64,{jpeg}"/>')
+
+    def rect(r, fill):
+        # Pillow dikdörtgenleri iki köşeyi de kapsar
+        return f'<rect x="{r.x0}" y="{r.y0}" width="{r.x1 - r.x0 + 1}" height="{r.y1 - r.y0 + 1}" fill="{_color(fill)}"/>'
+
+    def text(run):
+        font = poster_layout.load_font(fonts_cache, run.font)
+        x, y, text_anchor = _baseline_origin(font, run)
+        anchor_attr = f' text-anchor="{text_anchor}"' if text_anchor != "start" else ""
+        families, weight = fallbacks[_font_family(run.font)]
+        weight_attr = f' font-weight="{weight}"' if weight else ""
+        return (f'<text x="{x:g}" y="{y:g}" font-family={quoteattr(families)}{weight_attr} '
+                f'font-size="{run.font.size}"{anchor_attr} xml:space="preserve">{escape(run.text)}</text>')
+
+    parts.append(rect(plan.divider, (0, 0, 0)))
+    parts.append('<g fill="#000000">')
+    parts.append(text(plan.album_name))
+    parts.append('</g>')
+    if albumart_image is not None and colors:
+        for color, swatch in zip(colors, plan.swatches):
+            if isinstance(color, tuple) and len(color) == 3:
+                parts.append(rect(swatch, color))
+    parts.append('<g fill="#000000">')
+    parts.append(text(plan.artist))
+    parts.extend(text(run) for run in plan.tracks)
+    if plan.copyright is not None:
+        parts.append(text(plan.copyright))
+    parts.append('</g>')
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+def vector_options(options, paper):
+    """Seçenekleri kâğıdın 72 DPI (punto) yerleşimine çevirir; paper None ise değiştirmez."""
+    options = dict(options or {})
+    if paper:
+        options['poster_size'] = poster_layout.print_size_key(paper, POINTS_PER_INCH)
+    return options
+
+def create_album_svg(album_data, artwork_source, options=None, paper="A2", artwork_dpi=DEFAULT_ARTWORK_DPI):
+    """
+    Albüm posterini SVG olarak oluşturur.
+
+    Args:
+        album_data (album_model.Album or dict): Albüm.
+        artwork_source: Kapak (dosya yolu, bayt dizisi, dosya benzeri nesne veya PIL resmi) ya da None.
+        options (dict or None): create_album_poster seçenekleri.
+        paper (str or None): "A4", "A3" veya "A2"; yerleşim bu kâğıdın punto ölçüsünde yapılır ve belge
+            milimetre cinsinden boyutlandırılır. None ise options['poster_size'] piksel boyutu kullanılır.
+        artwork_dpi (float): Gömülü kapağın bu kâğıtta basıldığında sahip olacağı çözünürlük.
+            Kaynak daha küçükse büyütülmez.
+
+    Returns:
+        str or None: SVG belgesi; albüm verisi yoksa None.
+    """
+    if not album_data:
+        render_report.log_event(logger, logging.ERROR, "no_album_data", "Poster oluşturmak için albüm verisi sağlanmadı.")
+        return None
+    options = vector_options(options, paper)
+    plan = poster_core.get_layout(album_data, options)
+
+    albumart_image = None
+    colors = None
+    if artwork_source is not None:
+        box = plan.artwork_box
+        scale = artwork_dpi / POINTS_PER_INCH if paper else 1
+        target = (max(1, round((box.x1 - box.x0) * scale)), max(1, round((box.y1 - box.y0) * scale)))
+        try:
+            albumart_image = artwork_loader.decode_artwork(artwork_source, target)
+            if albumart_image.size[0] > target[0] or albumart_image.size[1] > target[1]:
+                albumart_image = artwork_loader.prepare_artwork(albumart_image, target)
+        except Exception as e:
+            render_report.log_event(logger, logging.WARNING, "artwork_decode_error", f"Albüm kapağı açılamadı: {e}", error=str(e))
+            albumart_image = None
+        if albumart_image is not None:
+            colors = poster_core.get_colors(albumart_image, count=len(plan.swatches),
+                                            method=options.get('palette_method', 'adaptive'))
+
+    physical_size_mm = poster_layout.PAPER_SIZES_MM[paper] if paper else None
+    return render_layout_svg(plan, albumart_image, colors, physical_size_mm)
+
+def rasterizer_available():
+    """SVG'yi rasterleştirebilecek bir motor (resvg_py veya cairosvg) kurulu mu?"""
+    return resvg_py is not None or cairosvg is not None
+
+def rasterize_svg(svg_text, size=None):
+    """
+    SVG'yi gerçek bir SVG motoruyla rasterleştirir: resvg_py (fonts/ klasöründeki fontlar yüklenir) veya cairosvg.
+    Bu modülün çizim kodu kullanılmaz; böylece karşılaştırma belgenin kendisini doğrular.
+
+    Args:
+        svg_text (str): SVG belgesi.
+        size (tuple or None): Çıktı boyutu; None ise viewBox boyutu.
+
+    Returns:
+        PIL.Image.Image: Beyaz zemin üzerinde RGB resim.
+
+    Raises:
+        RuntimeError: Kurulu bir SVG motoru yoksa.
+    """
+    width, height = size or _viewbox_size(svg_text)
+    if resvg_py is not None:
+        png = resvg_py.svg_to_bytes(svg_string=svg_text, width=width, height=height, background="#ffffff",
+                                    skip_system_fonts=True, font_dirs=[poster_core.resource_path('fonts')])
+        png = bytes(png)
+    elif cairosvg is not None:
+        png = cairosvg.svg2png(bytestring=svg_text.encode("utf-8"), output_width=width, output_height=height,
+                               background_color="#ffffff")
+    else:
+        raise RuntimeError("SVG rasterleştirmek için resvg_py veya cairosvg kurulmalı.")
+    with Image.open(BytesIO(png)) as image:
+        return image.convert("RGB")
+
+def _viewbox_size(svg_text):
+    """Kök <svg> öğesinin viewBox genişlik ve yüksekliğini döndürür."""
+    head = svg_text[:svg_text.index(">")]
+    viewbox = head.split('viewBox="', 1)[1].split('"', 1)[0]
+    _, _, width, height = (float(v) for v in viewbox.split())
+    return round(width), round(height)
+
+def compare_with_raster(album_data, artwork_source, options=None, paper="A2"):
+    """
+    Aynı yerleşimi raster (create_album_poster) ve vektör (rasterize_svg ile rasterleştirilmiş SVG) olarak üretip farkı ölçer.
+
+    Returns:
+        dict: 'size', 'mismatch' (kapak dışı uyuşmaz piksel oranı, 0-1), 'mean_diff' (kapak dışı ortalama fark, 0-255),
+        'artwork_mean_diff' (JPEG kaybı dahil) ve 'max_diff' anahtarları.
+    """
+    options = vector_options(options, paper)
+    plan = poster_core.get_layout(album_data, options)
+    artwork = None
+    if artwork_source is not None:
+        box = plan.artwork_box
+        artwork = artwork_loader.prepare_artwork(artwork_source, (box.x1 - box.x0, box.y1 - box.y0))
+    raster = poster_core.create_album_poster(album_data, artwork, options)
+    # Kapak poster boyutunda gömülür; böylece iki çıktı aynı kapak piksellerinden üretilir
+    vector = rasterize_svg(create_album_svg(album_data, artwork, options, paper=None), raster.size)
+
+    difference = ImageChops.difference(raster, vector).convert("L")
+    blur = ImageFilter.GaussianBlur(CHECK_BLUR_RADIUS)
+    blurred = ImageChops.difference(raster.filter(blur), vector.filter(blur)).convert("L")
+    box = plan.artwork_box
+    artwork_mean = 0.0
+    if artwork is not None:
+        artwork_mean = ImageStat.Stat(difference.crop(tuple(box))).mean[0]
+        difference = difference.copy()
+        difference.paste(0, tuple(box))
+        blurred.paste(0, tuple(box))
+    histogram = blurred.histogram()
+    return {
+        "size": plan.size,
+        "mismatch": sum(histogram[CHECK_PIXEL_THRESHOLD + 1:]) / sum(histogram),
+        "mean_diff": ImageStat.Stat(difference).mean[0],
+        "artwork_mean_diff": artwork_mean,
+        "max_diff": difference.getextrema()[1],
+    }
+
+def check_passed(result):
+    """compare_with_raster sonucunun --check sınırları içinde olup olmadığını döndürür."""
+    return result["mismatch"] <= CHECK_MAX_MISMATCH and result["artwork_mean_diff"] <= CHECK_MAX_ARTWORK_DIFF
+
+def _load_album(json_path):
+    """JSON dosyasını akış halinde okuyup Album döndürür."""
+    with open(json_path, 'rb') as f:
+        album_data_raw, track_items = json_stream.read_album_json(f)
+    album, _ = poster_core.normalize_album_data(album_data_raw, track_items=track_items)
+    return album
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="python vector_render.py",
+        description="Render a poster as SVG with embedded fonts and artwork (one file for every ISO paper size).")
+    parser.add_argument("json", help="Album JSON file (Spotify API response or rip.json).")
+    parser.add_argument("-o", "--output", default="poster.svg", help="Output SVG path.")
+    parser.add_argument("--paper", choices=sorted(poster_layout.PAPER_SIZES_MM), default="A2", help="Paper size (default: A2).")
+    parser.add_argument("--artwork", help="Cover image file.")
+    parser.add_argument("--artwork-dpi", type=float, default=DEFAULT_ARTWORK_DPI,
+                        help=f"Print resolution of the embedded cover (default: {DEFAULT_ARTWORK_DPI}).")
+    parser.add_argument("--check", action="store_true",
+                        help="Rasterize the SVG with resvg_py or cairosvg and compare it with the raster poster; exit 1 if they differ.")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    album = _load_album(args.json)
+    if album is None:
+        print(f"'{args.json}' JSON biçimi tanınmadı.")
+        return 1
+
+    svg = create_album_svg(album, args.artwork, paper=args.paper, artwork_dpi=args.artwork_dpi)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(svg)
+    print(f"{args.output}: {args.paper}, {len(svg.encode('utf-8')) / 1024:.0f} KB")
+
+    if args.check:
+        if not rasterizer_available():
+            print("--check için resvg_py veya cairosvg kurulmalı (pip install resvg_py).")
+            return 1
+        result = compare_with_raster(album, args.artwork, paper=args.paper)
+        print(f"Raster/vektör farkı ({result['size'][0]}x{result['size'][1]}): uyuşmaz pikseller %{result['mismatch'] * 100:.2f}, "
+              f"ortalama {result['mean_diff']:.3f}, kapakta {result['artwork_mean_diff']:.3f}, en fazla {result['max_diff']}")
+        if not check_passed(result):
+            print(f"Fark sınırı aşıldı: uyuşmaz pikseller en fazla %{CHECK_MAX_MISMATCH * 100:g}, "
+                  f"kapakta ortalama fark en fazla {CHECK_MAX_ARTWORK_DIFF:g} olmalı.")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
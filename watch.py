@@ -0,0 +1,340 @@
+# watch.py
+# Albüm JSON ve kapak dosyalarının bulunduğu klasörü izleyip yalnızca değişen posterleri yeniden çizen izleme modu.
+# Klasör belirli aralıklarla taranır (ek bağımlılık gerektirmeyen yoklama); art arda gelen değişiklikler
+# dosyalar debounce süresi boyunca değişmeden kalana kadar biriktirilir ve tek seferde işlenir.
+# Girdilerin boyutu, mtime'ı ve içerik özeti ile seçeneklerin özeti çıktı klasöründeki kalıcı bir indekste
+# tutulur; yalnızca dokunulmuş (touch) dosyalar veya yeniden başlatma bir posteri yeniden çizdirmez.
+# Çizimler batch.render_job ile sınırlı bir işçi havuzunda yapılır.
+#
+# Kullanım:
+#   python -m poster_core albums/ --output posters/ --watch
+#   python watch.py albums/ --output posters/ --size A3 --debounce 5
+
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import poster_core
+import render_cache
+import batch
+
+# Çıktı klasöründeki indeks dosyası
+INDEX_FILE_NAME = ".poster_watch.json"
+INDEX_VERSION = 1
+
+# Klasörün taranma aralığı (saniye)
+DEFAULT_INTERVAL = 2.0
+
+# Son değişiklikten sonra işlemeye başlamadan önce beklenen sessiz süre (saniye)
+DEFAULT_DEBOUNCE = 3.0
+
+# İndeksin çizimler sürerken en fazla bu sıklıkta diske yazılması (saniye)
+INDEX_SAVE_INTERVAL = 10.0
+
+def file_digest(path):
+    """Dosyanın içerik özetini döndürür."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _signature(path):
+    """(boyut, mtime_ns) çifti; dosya yoksa None."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def options_digest(options, exports, dpi):
+    """Posteri etkileyen seçeneklerin ve çizim sürümünün özeti; değişirse tüm posterler yeniden çizilir."""
+    payload = render_cache.canonical_options({
+        "renderer": poster_core.RENDERER_VERSION,
+        "options": options,
+        "exports": [list(settings) for settings in exports or []],
+        "dpi": dpi,
+    })
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+class WatchIndex:
+    """
+    JSON dosyası -> son çizimin girdileri ve çıktıları; çıktı klasöründe atomik olarak saklanır.
+
+    Kayıt alanları: 'json' [boyut, mtime_ns, özet], 'artwork' [yol, boyut, mtime_ns, özet] veya None,
+    'options' seçenek özeti, 'target' (batch.render_job'a verilen çıktı yolu), 'outputs', 'ok' ve 'message'.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("albums", {})
+        except (OSError, ValueError):
+            pass
+        self.dirty = False
+
+    def save(self):
+        """İndeksi geçici dosyaya yazıp atomik olarak yerine taşır."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".poster_watch-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "albums": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"İzleme indeksi yazılamadı: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+class Watcher:
+    """
+    Girdi klasörlerini izler ve girdileri veya seçenekleri değişen albümlerin posterlerini yeniden çizer.
+
+    Args:
+        inputs (list): batch.collect_inputs'a verilen klasör veya glob desenleri.
+        output_dir (str): Posterlerin ve indeksin yazıldığı klasör.
+        options (dict): create_album_poster seçenekleri.
+        exports (list or None): poster_export.EncodeSettings listesi.
+        dpi (float or None): Baskı çözünürlüğü (bkz. batch.render_job).
+        artwork_dir (str or None): Kapakların arandığı ek klasör.
+        recursive (bool): Klasörler alt klasörleriyle taransın mı.
+        cache (tuple or None): render_cache ayarları (klasör, bayt sınırı).
+        workers (int or None): İşçi süreç sayısı.
+        debounce (float): Son değişiklikten sonra beklenen sessiz süre (saniye).
+        interval (float): Tarama aralığı (saniye).
+        index_path (str or None): İndeks dosyası; None ise output_dir/.poster_watch.json.
+        on_result (callable or None): Her çizim bittiğinde batch.render_job sonucu ile çağrılır.
+    """
+
+    def __init__(self, inputs, output_dir, options, exports=None, dpi=None, artwork_dir=None, recursive=False,
+                 cache=None, workers=None, debounce=DEFAULT_DEBOUNCE, interval=DEFAULT_INTERVAL, index_path=None,
+                 on_result=None):
+        self.inputs = inputs
+        self.output_dir = os.path.abspath(output_dir)
+        self.options = options
+        self.exports = exports
+        self.dpi = dpi
+        self.artwork_dir = artwork_dir
+        self.recursive = recursive
+        self.cache = cache
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.debounce = debounce
+        self.interval = interval
+        self.on_result = on_result
+        self.options_digest = options_digest(options, exports, dpi)
+        self.index = WatchIndex(index_path or os.path.join(self.output_dir, INDEX_FILE_NAME))
+        self._executor = None
+        self._in_flight = {} # future -> (json_path, girdi kaydı, çıktı yolu)
+        self._queue = {} # json_path -> girdi kaydı; sıraya eklenme sırasıyla, aynı albüm tek kez bulunur
+
+    # --- Tarama ---
+
+    def snapshot(self):
+        """Her JSON dosyası için (JSON imzası, kapak yolu, kapak imzası) sözlüğünü döndürür; dosyalar okunmaz."""
+        state = {}
+        for json_path in batch.collect_inputs(self.inputs, recursive=self.recursive):
+            artwork_path = batch.find_artwork(json_path, self.artwork_dir)
+            state[json_path] = (_signature(json_path), artwork_path, _signature(artwork_path) if artwork_path else None)
+        return state
+
+    def _current_inputs(self, json_path, state, entry):
+        """
+        Girdilerin güncel kaydını döndürür. İmza indeksteki ile aynıysa özet yeniden hesaplanmaz;
+        dosya okunamazsa None döndürülür.
+        """
+        json_sig, artwork_path, artwork_sig = state
+        if json_sig is None:
+            return None
+        try:
+            previous = entry.get("json") if entry else None
+            if previous and previous[:2] == json_sig:
+                json_record = previous
+            else:
+                json_record = json_sig + [file_digest(json_path)]
+            artwork_record = None
+            if artwork_path and artwork_sig is not None:
+                previous = entry.get("artwork") if entry else None
+                if previous and previous[0] == artwork_path and previous[1:3] == artwork_sig:
+                    artwork_record = previous
+                else:
+                    artwork_record = [artwork_path] + artwork_sig + [file_digest(artwork_path)]
+        except OSError:
+            return None
+        return {"json": json_record, "artwork": artwork_record}
+
+    def stale_albums(self, state):
+        """
+        Yeniden çizilmesi gereken albümleri {json_path: girdi kaydı} olarak döndürür. Yalnızca mtime'ı değişen
+        (içeriği aynı) girdilerin imzası indekste güncellenir; bu albümler yeniden çizilmez.
+        """
+        stale = {}
+        for json_path, album_state in state.items():
+            entry = self.index.entries.get(json_path)
+            current = self._current_inputs(json_path, album_state, entry)
+            if current is None:
+                continue
+            if entry is not None and entry.get("options") == self.options_digest and \
+                    _digests(entry) == _digests(current) and all(os.path.exists(path) for path in entry["outputs"]):
+                if entry.get("json") != current["json"] or entry.get("artwork") != current["artwork"]:
+                    entry.update(current)
+                    self.index.dirty = True
+                continue
+            stale[json_path] = current
+        for json_path in set(self.index.entries) - set(state):
+            # JSON silindi; posterler yerinde bırakılır
+            del self.index.entries[json_path]
+            self.index.dirty = True
+        return stale
+
+    # --- Çizim ---
+
+    def _target(self, json_path):
+        """Albümün çıktı yolu; bir kez seçildikten sonra indeksten okunur, böylece dosya adları kararlı kalır."""
+        entry = self.index.entries.get(json_path)
+        if entry and entry.get("target"):
+            return entry["target"]
+        used_names = {os.path.basename(e["target"]) for e in self.index.entries.values() if e.get("target")}
+        used_names |= {os.path.basename(target) for _, _, target in self._in_flight.values()}
+        return batch.output_path_for(json_path, self.output_dir, used_names)
+
+    def _dispatch(self):
+        """Sıradaki işleri, havuzda en fazla işçi sayısının iki katı iş olacak şekilde gönderir."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=batch._init_worker)
+        busy = {json_path for json_path, _, _ in self._in_flight.values()}
+        for json_path in list(self._queue):
+            if len(self._in_flight) >= self.workers * 2:
+                break
+            if json_path in busy:
+                continue # Aynı albümün önceki çizimi bitince yeniden değerlendirilir
+            current = self._queue.pop(json_path)
+            target = self._target(json_path)
+            job = {
+                "json_path": json_path,
+                "artwork_path": current["artwork"][0] if current["artwork"] else None,
+                "output_path": target,
+                "options": self.options,
+                "dpi": self.dpi,
+                "exports": self.exports,
+                "render_cache": self.cache,
+            }
+            self._in_flight[self._executor.submit(batch.render_job, job)] = (json_path, current, target)
+
+    def _collect(self, timeout=0):
+        """Biten çizimlerin sonuçlarını indekse yazar; tamamlanan sonuçları döndürür."""
+        if not self._in_flight:
+            return []
+        done, _ = wait(list(self._in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        results = []
+        for future in done:
+            json_path, current, target = self._in_flight.pop(future)
+            if future.cancelled():
+                continue # Kapatılırken iptal edildi; bir sonraki çalıştırmada yeniden çizilir
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"json_path": json_path, "output_path": None, "outputs": [], "ok": False,
+                          "message": f"{type(e).__name__}: {e}", "seconds": 0.0}
+            # Başarısız albümler de kaydedilir; girdileri değişene kadar yeniden denenmez
+            self.index.entries[json_path] = dict(current, options=self.options_digest, target=target,
+                                                 outputs=result.get("outputs") or [], ok=result["ok"],
+                                                 message=result["message"])
+            self.index.dirty = True
+            results.append(result)
+            if self.on_result:
+                self.on_result(result)
+        return results
+
+    def busy(self):
+        """Çalışan veya sırada bekleyen çizim olup olmadığını döndürür."""
+        return bool(self._in_flight or self._queue)
+
+    def enqueue(self, state):
+        """Durumdaki eskimiş albümleri sıraya ekler (aynı albüm sırada tek kez bulunur); eklenen sayıyı döndürür."""
+        stale = self.stale_albums(state)
+        in_flight = {json_path: _digests(current) for json_path, current, _ in self._in_flight.values()}
+        # Aynı girdilerle zaten çizilmekte olan albümler yeniden sıraya eklenmez
+        stale = {json_path: current for json_path, current in stale.items()
+                 if in_flight.get(json_path) != _digests(current)}
+        self._queue.update(stale)
+        return len(stale)
+
+    def run_once(self):
+        """Tek bir tarama yapar, eskimiş tüm posterleri çizer ve sonuçları döndürür."""
+        self.enqueue(self.snapshot())
+        results = []
+        while self.busy():
+            self._dispatch()
+            results.extend(self._collect(timeout=None))
+        if self.index.dirty:
+            self.index.save()
+        return results
+
+    def run(self, stop=None):
+        """
+        Durdurulana kadar (Ctrl+C veya stop() True döndürene kadar) izler.
+        Bir değişiklik görüldüğünde klasör debounce süresi boyunca değişmeden kalana kadar beklenir;
+        bu sürede gelen tüm değişiklikler tek seferde işlenir.
+        """
+        last_state = None
+        changed_at = None
+        last_scan = None
+        last_saved = time.monotonic()
+        try:
+            while not (stop and stop()):
+                now = time.monotonic()
+                if last_scan is None or now - last_scan >= self.interval:
+                    state = self.snapshot()
+                    last_scan = now
+                    if state != last_state:
+                        # İlk tarama beklemeden işlenir; sonraki değişiklikler sessiz süreyi yeniden başlatır
+                        changed_at = now if last_state is not None else now - self.debounce
+                        last_state = state
+                if changed_at is not None and now - changed_at >= self.debounce:
+                    self.enqueue(last_state)
+                    changed_at = None
+                self._dispatch()
+                if self._in_flight:
+                    self._collect(timeout=self.interval)
+                else:
+                    time.sleep(self.interval)
+                if self.index.dirty and (not self.busy() or now - last_saved >= INDEX_SAVE_INTERVAL):
+                    self.index.save()
+                    last_saved = now
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """İşçi havuzunu kapatır ve indeksi kaydeder."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._collect()
+        if self.index.dirty:
+            self.index.save()
+
+def _digests(record):
+    """Girdi kaydının içerik özetleri (JSON ve kapak); imza farkları karşılaştırmaya girmez."""
+    artwork = record.get("artwork")
+    return (record.get("json") or [None] * 3)[2], (artwork[0], artwork[3]) if artwork else None
+
+def main(argv=None):
+    """İzleme modu giriş noktası (python -m poster_core ... --watch ile aynı)."""
+    return batch.main(list(sys.argv[1:] if argv is None else argv) + ["--watch"])
+
+if __name__ == "__main__":
+    sys.exit(main())